@@ -35,11 +35,14 @@ from api.blueprints.transaction.send_blueprint import transaction_send_blueprint
 from api.connect import (
     create_address_caching_server,
     create_cache,
+    create_constants,
     create_database,
+    create_responses,
     create_witnet_node,
 )
 from api.gunicorn_config import toml_config
 from mockups.config import mock_config
+from node.witnet_client_pool import NodePoolBusy
 from util.logger import configure_rotating_logger
 
 
@@ -80,15 +83,38 @@ def create_app(mock=False):
     address_caching_server = create_address_caching_server(explorer_config, mock=mock)
     address_caching_server.init_app(app, "address_caching_server")
 
-    cache = create_cache(explorer_config, mock=mock)
-    cache.init_app(app)
-
     database = create_database(explorer_config, mock=mock)
     database.init_app(app)
 
     witnet_node = create_witnet_node(explorer_config, mock=mock)
     witnet_node.init_app(app)
 
+    # Consensus constants and WIPs are loaded once per process on first use
+    constants = create_constants(explorer_config, database, witnet_node)
+    constants.init_app(app)
+
+    # The in-process cache in front of memcached expires its values at the end of every epoch
+    cache = create_cache(explorer_config, constants=constants, mock=mock)
+    cache.init_app(app)
+
+    # Reload the consensus constants and WIPs after a script updated them
+    constants.set_cache(cache)
+
+    # Encoded response bodies of the most polled endpoints are kept per worker
+    responses = create_responses(explorer_config)
+    responses.init_app(app)
+
+    # Fail fast when all node clients are busy instead of queueing requests until the worker times out
+    @app.errorhandler(NodePoolBusy)
+    def node_pool_busy(error):
+        logger = app.extensions["logger"]
+        logger.warning(f"Node pool busy: {error}")
+        return (
+            {"message": "All node connections are busy, retry later."},
+            503,
+            {"Retry-After": str(error.retry_after), "X-Version": "1.0.0"},
+        )
+
     # Create top-level blueprints
     address_blueprint = Blueprint(
         "address",
@@ -8,6 +8,7 @@ from schemas.address.details_view_schema import DetailsView
 from schemas.include.address_schema import AddressSchema
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from util.common_functions import send_address_caching_request
 
 address_details_blueprint = Blueprint(
@@ -44,6 +45,7 @@ class AddressDetails(MethodView):
     def get(self, args):
         address_caching_server = current_app.extensions["address_caching_server"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
         witnet_node = current_app.extensions["witnet_node"]
@@ -60,10 +62,11 @@ class AddressDetails(MethodView):
             database=database,
             witnet_node=witnet_node,
             logger=logger,
+            consensus_constants=constants.get_consensus_constants(),
         )
         details = address.get_details()
         try:
-            DetailsView().load(details)
+            load_response(DetailsView, details)
         except ValidationError as err_info:
             logger.error(
                 f"Incorrect message format for details data for {arg_address}: {err_info}"
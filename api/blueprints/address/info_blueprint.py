@@ -6,7 +6,7 @@ from marshmallow import ValidationError
 from schemas.address.info_schema import AddressInfoArgs, AddressInfoResponse
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
-from util.data_transformer import re_sql
+from schemas.registry import load_response
 
 address_info_blueprint = Blueprint(
     "address info",
@@ -46,30 +46,14 @@ class AddressInfo(MethodView):
         addresses = args["addresses"]
         logger.info(f"address_info({addresses})")
 
-        sql = """
-            SELECT
-                address,
-                label,
-                active,
-                block,
-                mint,
-                value_transfer,
-                data_request,
-                commit,
-                reveal,
-                tally
-            FROM
-                addresses
-            WHERE
-                address = ANY(%s)
-        """
-        addresses = database.sql_return_all(re_sql(sql), [addresses])
+        addresses = database.statement_return_all("address_info", [addresses])
         if addresses:
             logger.info(f"Found {len(addresses)} out of {len(addresses)}")
 
             try:
                 return (
-                    AddressInfoResponse(many=True).load(
+                    load_response(
+                        AddressInfoResponse,
                         [
                             {
                                 "address": address[0],
@@ -84,7 +68,8 @@ class AddressInfo(MethodView):
                                 "tally": address[9],
                             }
                             for address in addresses
-                        ]
+                        ],
+                        many=True,
                     ),
                     200,
                     {"X-Version": "1.0.0"},
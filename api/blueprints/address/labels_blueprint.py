@@ -6,6 +6,7 @@ from marshmallow import ValidationError
 from schemas.address.labels_schema import AddressLabelResponse
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from util.data_transformer import re_sql
 
 address_labels_blueprint = Blueprint(
@@ -58,14 +59,16 @@ class AddressLabels(MethodView):
             logger.info(f"Returning {len(addresses)} addresses with labels")
             try:
                 return (
-                    AddressLabelResponse(many=True).load(
+                    load_response(
+                        AddressLabelResponse,
                         [
                             {
                                 "address": address[0],
                                 "label": address[1],
                             }
                             for address in addresses
-                        ]
+                        ],
+                        many=True,
                     ),
                     200,
                     {"X-Version": "1.0.0"},
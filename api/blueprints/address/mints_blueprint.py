@@ -8,6 +8,7 @@ from schemas.address.mint_view_schema import MintView
 from schemas.include.address_schema import AddressSchema
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from util.common_functions import send_address_caching_request
 
 address_mints_blueprint = Blueprint(
@@ -46,6 +47,7 @@ class AddressMints(MethodView):
         address_caching_server = current_app.extensions["address_caching_server"]
         cache = current_app.extensions["cache"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
         witnet_node = current_app.extensions["witnet_node"]
@@ -79,10 +81,11 @@ class AddressMints(MethodView):
                 database=database,
                 witnet_node=witnet_node,
                 logger=logger,
+                consensus_constants=constants.get_consensus_constants(),
             )
             mints = address.get_mints()
             try:
-                MintView(many=True).load(mints[start:stop])
+                load_response(MintView, mints[start:stop], many=True)
             except ValidationError as err_info:
                 logger.error(
                     f"Incorrect message format for mint data for {arg_address}: {err_info}"
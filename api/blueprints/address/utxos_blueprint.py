@@ -6,6 +6,7 @@ from marshmallow import ValidationError
 from schemas.address.utxos_schema import AddressUtxosArgs, AddressUtxosResponse
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 
 address_utxos_blueprint = Blueprint(
     "address utxos",
@@ -95,7 +96,7 @@ class Reputation(MethodView):
                 )
 
         try:
-            AddressUtxosResponse(many=True).load(address_utxos)
+            load_response(AddressUtxosResponse, address_utxos, many=True)
         except ValidationError as err_info:
             logger.error(
                 f"Incorrect message format for UTXO data for {address}: {err_info}"
@@ -8,6 +8,7 @@ from schemas.address.value_transfer_view_schema import ValueTransferView
 from schemas.include.address_schema import AddressSchema
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from util.common_functions import send_address_caching_request
 
 address_value_transfers_blueprint = Blueprint(
@@ -46,6 +47,7 @@ class AddressValueTransfers(MethodView):
         address_caching_server = current_app.extensions["address_caching_server"]
         cache = current_app.extensions["cache"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
         witnet_node = current_app.extensions["witnet_node"]
@@ -79,10 +81,11 @@ class AddressValueTransfers(MethodView):
                 database=database,
                 witnet_node=witnet_node,
                 logger=logger,
+                consensus_constants=constants.get_consensus_constants(),
             )
             value_transfers = address.get_value_transfers()
             try:
-                ValueTransferView(many=True).load(value_transfers[start:stop])
+                load_response(ValueTransferView, value_transfers[start:stop], many=True)
             except ValidationError as err_info:
                 logger.error(
                     f"Incorrect message format for value transfer data for {arg_address}: {err_info}"
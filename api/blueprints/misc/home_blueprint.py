@@ -40,6 +40,7 @@ class Home(MethodView):
     def get(self, args):
         cache = current_app.extensions["cache"]
         logger = current_app.extensions["logger"]
+        responses = current_app.extensions["responses"]
 
         key = args["key"]
         logger.info(f"home({key})")
@@ -56,12 +57,10 @@ class Home(MethodView):
             logger.info("Found home in memcached cache")
 
         if key == "full":
-            return home, 200, {"X-Version": "1.0.0"}
+            data = home
         elif key in ("network_stats", "supply_info"):
-            return {key: home[key]}, 200, {"X-Version": "1.0.0"}
+            data = {key: home[key]}
         elif key in ("blocks", "data_requests", "value_transfers"):
-            return (
-                {f"latest_{key}": home[f"latest_{key}"]},
-                200,
-                {"X-Version": "1.0.0"},
-            )
+            data = {f"latest_{key}": home[f"latest_{key}"]}
+
+        return responses.respond(f"home_{key}", data, HomeResponse)
@@ -6,6 +6,7 @@ from marshmallow import ValidationError
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.ping_schema import PingResponse
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 
 ping_blueprint = Blueprint(
     "ping",
@@ -42,7 +43,7 @@ class Ping(MethodView):
         logger.info("ping()")
         try:
             return (
-                PingResponse().load({"response": "pong"}),
+                load_response(PingResponse, {"response": "pong"}),
                 200,
                 {"X-Version": "1.0.0"},
             )
@@ -5,6 +5,7 @@ from flask_smorest import Blueprint, abort
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.balances_schema import NetworkBalancesResponse
+from schemas.registry import load_response
 
 network_balances_blueprint = Blueprint(
     "balances",
@@ -79,13 +80,14 @@ class BalanceList(MethodView):
         ]
 
         return (
-            NetworkBalancesResponse().load(
+            load_response(
+                NetworkBalancesResponse,
                 {
                     "balances": paginated_balances,
                     "total_items": balance_list_part["total_items"],
                     "total_balance_sum": balance_list_part["total_balance_sum"],
                     "last_updated": balance_list_part["last_updated"],
-                }
+                },
             ),
             200,
             {"X-Version": "1.0.0"},
@@ -3,10 +3,10 @@ from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from marshmallow import ValidationError
 
-from node.consensus_constants import ConsensusConstants
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.blockchain_schema import NetworkBlockchainResponse
+from schemas.registry import load_response
 from util.common_functions import (
     calculate_block_reward,
     calculate_current_epoch,
@@ -48,76 +48,76 @@ class NetworkBlockchain(MethodView):
     def get(self, pagination_parameters):
         cache = current_app.extensions["cache"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
-        witnet_node = current_app.extensions["witnet_node"]
 
         logger.info(
             f"network_blockchain({pagination_parameters.page}, {pagination_parameters.page_size})"
         )
 
         cache_key = f"blockchain_page-{pagination_parameters.page}_page-size-{pagination_parameters.page_size}"
-        blockchain = cache.get(cache_key)
-        if blockchain:
-            logger.info(f"Found {cache_key} in memcached cache")
-            pagination_parameters.item_count = blockchain["total_epochs"]
-            return blockchain, 200, {"X-Version": "1.0.0"}
-
-        logger.info(f"Could not find {cache_key} in memcached cache")
-
-        # Get the expected epoch
-        consensus_constants = ConsensusConstants(
-            database=database,
-            witnet_node=witnet_node,
-        )
-        expected_epoch = calculate_current_epoch(
-            consensus_constants.checkpoint_zero_timestamp,
-            consensus_constants.checkpoints_period,
+        blockchain = cache.get_or_compute(
+            cache_key,
+            lambda: build_blockchain(
+                cache_key,
+                constants,
+                database,
+                logger,
+                pagination_parameters.page,
+                pagination_parameters.page_size,
+            ),
+            timeout=config["api"]["caching"]["views"]["blockchain"]["timeout"],
+            logger=logger,
         )
+        pagination_parameters.item_count = blockchain["total_epochs"]
 
-        # Get the last processed epoch
-        data = database.sql_return_one(sql_last_block)
-        if data:
-            last_epoch = data[1]
-        else:
-            last_epoch = -1
-        pagination_parameters.item_count = last_epoch
-        if expected_epoch - 2 > last_epoch:
-            logger.info(
-                f"Expected epoch is {expected_epoch}, but last seen epoch is {last_epoch}"
-            )
-        else:
-            logger.info(f"Last seen epoch is {last_epoch}")
-
-        start = (pagination_parameters.page - 1) * pagination_parameters.page_size
-        stop = pagination_parameters.page * pagination_parameters.page_size - 1
-        blockchain = get_blockchain_details(
-            database,
-            last_epoch,
-            start,
-            stop,
-            consensus_constants,
-        )
+        return blockchain, 200, {"X-Version": "1.0.0"}
 
-        # Validate data before we save it in the cache
-        try:
-            blockchain = NetworkBlockchainResponse().load(blockchain)
-            cache.set(
-                cache_key,
-                blockchain,
-                timeout=config["api"]["caching"]["views"]["blockchain"]["timeout"],
-            )
-        except ValidationError as err_info:
-            logger.error(
-                f"Incorrect message format for blockchain response: {err_info}"
-            )
-            abort(
-                404,
-                message="Incorrect message format for blockchain response.",
-                headers={"X-Version": "1.0.0"},
-            )
 
-        return blockchain, 200, {"X-Version": "1.0.0"}
+def build_blockchain(cache_key, constants, database, logger, page, page_size):
+    logger.info(f"Could not find {cache_key} in memcached cache")
+
+    # Get the expected epoch
+    consensus_constants = constants.get_consensus_constants()
+    expected_epoch = calculate_current_epoch(
+        consensus_constants.checkpoint_zero_timestamp,
+        consensus_constants.checkpoints_period,
+    )
+
+    # Get the last processed epoch
+    data = database.sql_return_one(sql_last_block)
+    if data:
+        last_epoch = data[1]
+    else:
+        last_epoch = -1
+    if expected_epoch - 2 > last_epoch:
+        logger.info(
+            f"Expected epoch is {expected_epoch}, but last seen epoch is {last_epoch}"
+        )
+    else:
+        logger.info(f"Last seen epoch is {last_epoch}")
+
+    start = (page - 1) * page_size
+    stop = page * page_size - 1
+    blockchain = get_blockchain_details(
+        database,
+        last_epoch,
+        start,
+        stop,
+        consensus_constants,
+    )
+
+    # Validate data before we save it in the cache
+    try:
+        return load_response(NetworkBlockchainResponse, blockchain)
+    except ValidationError as err_info:
+        logger.error(f"Incorrect message format for blockchain response: {err_info}")
+        abort(
+            404,
+            message="Incorrect message format for blockchain response.",
+            headers={"X-Version": "1.0.0"},
+        )
 
 
 def get_blockchain_details(database, last_epoch, start, stop, consensus_constants):
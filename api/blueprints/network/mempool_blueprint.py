@@ -1,6 +1,7 @@
+import itertools
 import time
 
-import pylibmc
+import numpy
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
@@ -10,11 +11,8 @@ from psycopg.sql import SQL, Identifier
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.mempool_schema import NetworkMempoolArgs, NetworkMempoolResponse
-from util.common_functions import (
-    calculate_priority,
-    calculate_timestamp_from_epoch,
-    get_network_times,
-)
+from schemas.registry import load_response
+from util.common_functions import calculate_priorities, calculate_timestamp_from_epoch
 from util.data_transformer import re_sql
 
 network_mempool_blueprint = Blueprint(
@@ -50,6 +48,7 @@ class NetworkMempool(MethodView):
     )
     def get(self, args):
         cache = current_app.extensions["cache"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
 
@@ -61,7 +60,7 @@ class NetworkMempool(MethodView):
             timestamp_start = timestamp_stop - 24 * 60 * 60
         # Calculate timestamps from epochs
         else:
-            start_time, epoch_period = get_network_times(database)
+            start_time, epoch_period = constants.get_network_times()
             timestamp_start = calculate_timestamp_from_epoch(
                 start_time, epoch_period, args["start_epoch"]
             )
@@ -78,41 +77,58 @@ class NetworkMempool(MethodView):
         )
 
         key = f"network_mempool_{transaction_type}_{timestamp_start}_{timestamp_stop}_{granularity}"
-        mempool = cache.get(key)
-        if not mempool:
-            logger.info(f"Could not find {key} in memcached cache")
-            mempool = get_historical_mempool(
+        # No timeout required since this data never becomes stale
+        mempool = cache.get_or_compute(
+            key,
+            lambda: build_historical_mempool(
+                key,
                 database,
+                logger,
                 transaction_type,
                 timestamp_start,
                 timestamp_stop,
                 sample_rate,
                 granularity,
-            )
-
-            try:
-                NetworkMempoolResponse(many=True).load(mempool)
-            except ValidationError as err_info:
-                logger.error(f"Incorrect format for mempool statistics: {err_info}")
-                abort(
-                    404,
-                    message="Incorrect format for mempool statistics.",
-                    headers={"X-Version": "1.0.0"},
-                )
-
-            try:
-                # no timeout required since this data never becomes stale
-                cache.set(key, mempool)
-            except pylibmc.TooBig:
-                logger.warning(
-                    f"Could not save {key} in cache because the item size exceeded 1MB"
-                )
-        else:
-            logger.info(f"Found {key} in memcached cache")
+            ),
+            logger=logger,
+        )
 
         return mempool, 200, {"X-Version": "1.0.0"}
 
 
+def build_historical_mempool(
+    key,
+    database,
+    logger,
+    transaction_type,
+    timestamp_start,
+    timestamp_stop,
+    sample_rate,
+    granularity,
+):
+    logger.info(f"Could not find {key} in memcached cache")
+    mempool = get_historical_mempool(
+        database,
+        transaction_type,
+        timestamp_start,
+        timestamp_stop,
+        sample_rate,
+        granularity,
+    )
+
+    try:
+        load_response(NetworkMempoolResponse, mempool, many=True)
+    except ValidationError as err_info:
+        logger.error(f"Incorrect format for mempool statistics: {err_info}")
+        abort(
+            404,
+            message="Incorrect format for mempool statistics.",
+            headers={"X-Version": "1.0.0"},
+        )
+
+    return mempool
+
+
 def get_historical_mempool(
     database,
     transaction_type,
@@ -127,12 +143,12 @@ def get_historical_mempool(
         "value_transfers": "value_transfer_mempool",
     }
 
-    # Get lists between the required timestamps
+    # Get the priority histograms which were built when inserting the snapshots
     sql = """
         SELECT
             timestamp,
-            fee,
-            weight
+            priority,
+            amount
         FROM
             {}
         WHERE
@@ -160,44 +176,68 @@ def get_historical_mempool(
 def interpolate_and_transform(
     start_timestamp, stop_timestamp, raw_data, sample_rate, granularity
 ):
+    timestamps = numpy.arange(start_timestamp, stop_timestamp, granularity)
     histogram_data = [
-        {"timestamp": timestamp, "fee": [], "amount": []}
-        for timestamp in range(start_timestamp, stop_timestamp, granularity)
+        {"timestamp": int(timestamp), "fee": [], "amount": []}
+        for timestamp in timestamps
     ]
+    if len(raw_data) == 0 or len(timestamps) == 0:
+        return histogram_data
+
+    # Assign every snapshot to the first bucket with a timestamp equal to or after it
+    # Snapshots after the last bucket are dropped
+    snapshot_timestamps = numpy.array([row[0] for row in raw_data], dtype=numpy.int64)
+    snapshot_buckets = numpy.searchsorted(timestamps, snapshot_timestamps, side="left")
+
+    # Flatten the histograms of all snapshots into a single set of columns
+    lengths = numpy.array([len(row[1]) for row in raw_data], dtype=numpy.int64)
+    total = int(lengths.sum())
+    if total == 0:
+        return histogram_data
+    buckets = numpy.repeat(snapshot_buckets, lengths)
+    priorities = numpy.fromiter(
+        itertools.chain.from_iterable(row[1] for row in raw_data),
+        dtype=numpy.int64,
+        count=total,
+    )
+    amounts = numpy.fromiter(
+        itertools.chain.from_iterable(row[2] for row in raw_data),
+        dtype=numpy.int64,
+        count=total,
+    )
 
-    # Loop over the available data and check if we need to interpolate
-    counter = 0
-    for hd in range(0, len(histogram_data)):
-        aggregated_histogram = {}
-        for rd in range(counter, len(raw_data)):
-            if raw_data[rd][0] <= histogram_data[hd]["timestamp"]:
-                histogram = build_priority_histogram(raw_data[rd][1], raw_data[rd][2])
-                for priority, amount in histogram.items():
-                    if priority not in aggregated_histogram:
-                        aggregated_histogram[priority] = 0
-                    aggregated_histogram[priority] += amount
-            else:
-                break
-            counter += 1
-        if len(aggregated_histogram) > 0:
-            histogram_data[hd]["fee"] = [
-                priority for priority, _ in sorted(aggregated_histogram.items())
-            ]
-            histogram_data[hd]["amount"] = [
-                calculate_priority(amount, sample_rate, round_priority=True)
-                for _, amount in sorted(aggregated_histogram.items())
-            ]
-
-    return histogram_data
+    in_range = buckets < len(timestamps)
+    buckets, priorities, amounts = (
+        buckets[in_range],
+        priorities[in_range],
+        amounts[in_range],
+    )
+    if len(buckets) == 0:
+        return histogram_data
+
+    # Sum the amounts per (bucket, priority) pair, the unique keys are sorted by bucket and then by priority
+    minimum = int(priorities.min())
+    offset = int(priorities.max()) - minimum + 1
+    keys, indices = numpy.unique(
+        buckets * offset + priorities - minimum, return_inverse=True
+    )
+    aggregated_amounts = numpy.zeros(len(keys), dtype=numpy.int64)
+    numpy.add.at(aggregated_amounts, indices, amounts)
 
+    # Average the amounts over the sample rate
+    aggregated_amounts = calculate_priorities(
+        aggregated_amounts, numpy.full(len(aggregated_amounts), sample_rate)
+    )
 
-def build_priority_histogram(absolute_fee, weights):
-    priorities = {}
+    key_buckets = keys // offset
+    key_priorities = (keys % offset + minimum).tolist()
+    aggregated_amounts = aggregated_amounts.tolist()
 
-    for abs_fee, weight in zip(absolute_fee, weights):
-        priority = calculate_priority(abs_fee, weight, round_priority=True)
-        if priority not in priorities:
-            priorities[priority] = 0
-        priorities[priority] += 1
+    filled_buckets = numpy.unique(key_buckets)
+    bounds = numpy.searchsorted(key_buckets, filled_buckets, side="left").tolist()
+    bounds.append(len(keys))
+    for i, bucket in enumerate(filled_buckets.tolist()):
+        histogram_data[bucket]["fee"] = key_priorities[bounds[i] : bounds[i + 1]]
+        histogram_data[bucket]["amount"] = aggregated_amounts[bounds[i] : bounds[i + 1]]
 
-    return priorities
+    return histogram_data
@@ -1,6 +1,5 @@
 import time
 
-import pylibmc
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
@@ -9,6 +8,7 @@ from marshmallow import ValidationError
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.reputation_schema import NetworkReputationResponse
+from schemas.registry import load_response
 
 network_reputation_blueprint = Blueprint(
     "Reputation",
@@ -44,64 +44,60 @@ class Reputation(MethodView):
     def get(self):
         cache = current_app.extensions["cache"]
         logger = current_app.extensions["logger"]
+        responses = current_app.extensions["responses"]
         witnet_node = current_app.extensions["witnet_node"]
 
         logger.info("reputation()")
 
-        reputation = cache.get("reputation")
-        if not reputation:
-            logger.info("Could not find reputation in our memcached instance.")
+        reputation = cache.get_or_compute(
+            "reputation",
+            lambda: fetch_reputation(logger, witnet_node),
+            logger=logger,
+        )
 
-            result = witnet_node.get_reputation_all()
-            if "result" not in result:
-                logger.error(f"Could not retrieve reputation data: {result['error']}")
-                abort(
-                    404,
-                    message="Could not retrieve reputation data.",
-                    headers={"X-Version": "1.0.0"},
-                )
+        return responses.respond("reputation", reputation, NetworkReputationResponse)
 
-            # Parse reputation statistics
-            stats = result["result"]["stats"]
-            total_reputation = result["result"]["total_reputation"]
-            # Only keep identities with a non-zero reputation
-            reputation = [
-                {
-                    "address": key,
-                    "reputation": stats[key]["reputation"],
-                    "eligibility": stats[key]["eligibility"] / total_reputation * 100,
-                }
-                for key in stats.keys()
-                if stats[key]["reputation"] > 0
-            ]
-            reputation = sorted(
-                reputation, key=lambda rep: rep["reputation"], reverse=True
-            )
 
-            try:
-                reputation = NetworkReputationResponse().load(
-                    {
-                        "reputation": reputation,
-                        "total_reputation": result["result"]["total_reputation"],
-                        "last_updated": int(time.time()),
-                    }
-                )
-            except ValidationError as err_info:
-                logger.error(f"Incorrect message format for reputation: {err_info}")
-                abort(
-                    404,
-                    message="Incorrect message format for reputation.",
-                    headers={"X-Version": "1.0.0"},
-                )
+def fetch_reputation(logger, witnet_node):
+    logger.info("Could not find reputation in our memcached instance.")
+
+    result = witnet_node.get_reputation_all()
+    if "result" not in result:
+        logger.error(f"Could not retrieve reputation data: {result['error']}")
+        abort(
+            404,
+            message="Could not retrieve reputation data.",
+            headers={"X-Version": "1.0.0"},
+        )
 
-            # Try to save the data in our memcached instance
-            try:
-                cache.set("reputation", reputation)
-            except pylibmc.TooBig:
-                logger.warning(
-                    "Could not save reputation data in our memcached instance because the item size exceeded 1MB"
-                )
-        else:
-            logger.info("Found reputation in our memcached instance.")
+    # Parse reputation statistics
+    stats = result["result"]["stats"]
+    total_reputation = result["result"]["total_reputation"]
+    # Only keep identities with a non-zero reputation
+    reputation = [
+        {
+            "address": key,
+            "reputation": stats[key]["reputation"],
+            "eligibility": stats[key]["eligibility"] / total_reputation * 100,
+        }
+        for key in stats.keys()
+        if stats[key]["reputation"] > 0
+    ]
+    reputation = sorted(reputation, key=lambda rep: rep["reputation"], reverse=True)
 
-        return reputation, 200, {"X-Version": "1.0.0"}
+    try:
+        return load_response(
+            NetworkReputationResponse,
+            {
+                "reputation": reputation,
+                "total_reputation": result["result"]["total_reputation"],
+                "last_updated": int(time.time()),
+            },
+        )
+    except ValidationError as err_info:
+        logger.error(f"Incorrect message format for reputation: {err_info}")
+        abort(
+            404,
+            message="Incorrect message format for reputation.",
+            headers={"X-Version": "1.0.0"},
+        )
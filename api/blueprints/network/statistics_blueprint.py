@@ -1,16 +1,21 @@
-import pylibmc
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from marshmallow import ValidationError
 
-from caching.network_stats_functions import aggregate_nodes, read_from_database
+from caching.network_stats_functions import (
+    aggregate_nodes,
+    read_from_database,
+    read_last_epoch,
+)
+from caching.node_index import load_node_index
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.statistics_schema import (
     NetworkStatisticsArgs,
     NetworkStatisticsResponse,
 )
+from schemas.registry import load_response
 from util.common_sql import sql_last_confirmed_block
 
 network_statistics_blueprint = Blueprint(
@@ -67,6 +72,7 @@ class NetworkStatistics(MethodView):
         config = current_app.config["explorer"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
+        responses = current_app.extensions["responses"]
 
         logger.info(
             f"network_statistics({args['key']}, {args.get('start_epoch', 0)}, {args.get('stop_epoch', 0)})"
@@ -125,65 +131,129 @@ class NetworkStatistics(MethodView):
                     )
 
         cache_key = f"{args['key']}_{period[0]}_{period[1]}"
-        response = cache.get(cache_key)
-        if response:
-            logger.info(f"Found response for {cache_key} in cache")
-            return response, 200, {"X-Version": "1.0.0"}
+        response = cache.get_or_compute(
+            cache_key,
+            lambda: build_network_statistics(
+                cache_key,
+                args,
+                period,
+                start_epoch,
+                stop_epoch,
+                caching_config,
+                database,
+                logger,
+            ),
+            timeout=caching_config["views"]["network_stats"]["timeout"],
+            logger=logger,
+        )
 
-        # Rollbacks are saved as a list in the database, so even if epochs are specified, retrieve the complete list
-        if args["key"] == "list-rollbacks":
-            rollback_period = period
-            period = [None, None]
+        return responses.respond(cache_key, response, NetworkStatisticsResponse)
+
+
+def build_network_statistics(
+    cache_key,
+    args,
+    period,
+    start_epoch,
+    stop_epoch,
+    caching_config,
+    database,
+    logger,
+):
+    logger.info(f"Could not find response for {cache_key} in cache")
+
+    network_stats_config = caching_config["scripts"]["network_stats"]
+    aggregation_epochs = network_stats_config["aggregation_epochs"]
+
+    # Aggregate miners and data request solvers over a range of periods using the prebuilt index if it is available
+    node_index = None
+    index_directory = network_stats_config.get("index_directory", None)
+    if (
+        index_directory is not None
+        and args["key"]
+        in (
+            "num-unique-miners",
+            "top-100-miners",
+            "num-unique-data-request-solvers",
+            "top-100-data-request-solvers",
+        )
+        and period != [None, None]
+    ):
+        node_index = load_node_index(index_directory, key_data_mapping[args["key"]])
 
+    # Rollbacks are saved as a list in the database, so even if epochs are specified, retrieve the complete list
+    if args["key"] == "list-rollbacks":
+        rollback_period = period
+        period = [None, None]
+
+    if node_index is not None:
+        last_epoch, stats_data = read_last_epoch(database), None
+    else:
         last_epoch, stats_data = read_from_database(
             key_data_mapping[args["key"]],
             aggregation_epochs,
             database,
             period=period,
         )
-        last_epoch = int(last_epoch)
+    last_epoch = int(last_epoch)
 
-        # Reset rollback period to the requested epochs
-        if args["key"] == "list-rollbacks":
-            period = rollback_period
+    # Reset rollback period to the requested epochs
+    if args["key"] == "list-rollbacks":
+        period = rollback_period
 
-        # ARS and TRS balances do not require a start and stop epoch
-        if args["key"] == "percentile-staking-balances":
-            response = {
-                "staking": stats_data[0][2],
-            }
-        # If below keys are requested and no epochs are defined, return the statistics for the whole network lifetime
-        elif (
-            args["key"]
-            in (
-                "num-unique-miners",
-                "num-unique-data-request-solvers",
-                "top-100-miners",
-                "top-100-data-request-solvers",
-            )
-            and start_epoch is None
-            and stop_epoch is None
-        ):
-            if args["key"].startswith("top-100"):
-                stats_data = stats_data[0][2]["top-100"]
-                stats_data = translate_address_ids(database, stats_data, logger)
-            else:
-                stats_data = stats_data[0][2]["amount"]
-            response = {
-                "start_epoch": 0,
-                "stop_epoch": last_epoch,
-                args["key"].replace("-", "_"): stats_data,
-            }
-        # If rollbacks are requested without epochs, return all
-        elif (
-            args["key"] == "list-rollbacks"
-            and start_epoch is None
-            and stop_epoch is None
-        ):
+    # ARS and TRS balances do not require a start and stop epoch
+    if args["key"] == "percentile-staking-balances":
+        response = {
+            "staking": stats_data[0][2],
+        }
+    # If below keys are requested and no epochs are defined, return the statistics for the whole network lifetime
+    elif (
+        args["key"]
+        in (
+            "num-unique-miners",
+            "num-unique-data-request-solvers",
+            "top-100-miners",
+            "top-100-data-request-solvers",
+        )
+        and start_epoch is None
+        and stop_epoch is None
+    ):
+        if args["key"].startswith("top-100"):
+            stats_data = stats_data[0][2]["top-100"]
+            stats_data = translate_address_ids(database, stats_data, logger)
+        else:
+            stats_data = stats_data[0][2]["amount"]
+        response = {
+            "start_epoch": 0,
+            "stop_epoch": last_epoch,
+            args["key"].replace("-", "_"): stats_data,
+        }
+    # If rollbacks are requested without epochs, return all
+    elif args["key"] == "list-rollbacks" and start_epoch is None and stop_epoch is None:
+        stats_data = stats_data[0][2]
+        response = {
+            "start_epoch": 0,
+            "stop_epoch": last_epoch,
+            args["key"].replace("-", "_"): [
+                {
+                    "timestamp": sd[0],
+                    "epoch_from": sd[1],
+                    "epoch_to": sd[2],
+                    "length": sd[3],
+                }
+                for sd in stats_data
+            ],
+        }
+    else:
+        # Set the returned stop epoch
+        period = (period[0], min(last_epoch, period[1] or last_epoch))
+
+        # The list-rollbacks key requires special handling since it is not saved as periodic data
+        if args["key"] == "list-rollbacks":
             stats_data = stats_data[0][2]
             response = {
-                "start_epoch": 0,
-                "stop_epoch": last_epoch,
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
                 args["key"].replace("-", "_"): [
                     {
                         "timestamp": sd[0],
@@ -192,164 +262,138 @@ class NetworkStatistics(MethodView):
                         "length": sd[3],
                     }
                     for sd in stats_data
+                    if sd[2] >= period[0] and sd[1] <= period[1]
                 ],
             }
-        else:
-            # Set the returned stop epoch
-            period = (period[0], min(last_epoch, period[1] or last_epoch))
-
-            # The list-rollbacks key requires special handling since it is not saved as periodic data
-            if args["key"] == "list-rollbacks":
-                stats_data = stats_data[0][2]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [
-                        {
-                            "timestamp": sd[0],
-                            "epoch_from": sd[1],
-                            "epoch_to": sd[2],
-                            "length": sd[3],
-                        }
-                        for sd in stats_data
-                        if sd[2] >= period[0] and sd[1] <= period[1]
-                    ],
-                }
-            # Aggregate depending on the requested key
-            elif args["key"] in (
-                "num-unique-miners",
-                "top-100-miners",
-                "num-unique-data-request-solvers",
-                "top-100-data-request-solvers",
-            ):
+        # Aggregate depending on the requested key
+        elif args["key"] in (
+            "num-unique-miners",
+            "top-100-miners",
+            "num-unique-data-request-solvers",
+            "top-100-data-request-solvers",
+        ):
+            if node_index is not None:
+                num_unique, top_100 = node_index.aggregate(
+                    int(period[0] / aggregation_epochs),
+                    int(period[1] / aggregation_epochs),
+                )
+            else:
                 num_unique, top_100 = aggregate_nodes(
                     [stats_data[i][2] for i in range(len(stats_data))]
                 )
-                if args["key"] in (
-                    "num-unique-miners",
-                    "num-unique-data-request-solvers",
-                ):
-                    response = {
-                        "start_epoch": period[0],
-                        "stop_epoch": period[1],
-                        args["key"].replace("-", "_"): num_unique,
-                    }
-                else:
-                    top_100_mapped = translate_address_ids(database, top_100, logger)
-                    response = {
-                        "start_epoch": period[0],
-                        "stop_epoch": period[1],
-                        args["key"].replace("-", "_"): top_100_mapped,
-                    }
-            elif args["key"] == "histogram-data-requests":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [
-                        {"total": sd[0], "failure": sd[0] - sd[1]} for sd in stats_data
-                    ],
-                    "histogram_period": aggregation_epochs,
-                }
-            elif args["key"] == "histogram-data-request-composition":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [
-                        {
-                            "total": sd[0],
-                            "http_get": sd[2],
-                            "http_post": sd[3],
-                            "rng": sd[4],
-                        }
-                        for sd in stats_data
-                    ],
-                    "histogram_period": aggregation_epochs,
-                }
-            elif args["key"] == "histogram-data-request-witness":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [sd[5] for sd in stats_data],
-                    "histogram_period": aggregation_epochs,
-                }
-            elif args["key"] == "histogram-data-request-reward":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [sd[6] for sd in stats_data],
-                    "histogram_period": aggregation_epochs,
-                }
-            elif args["key"] == "histogram-data-request-collateral":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [sd[7] for sd in stats_data],
-                    "histogram_period": aggregation_epochs,
-                }
-            elif args["key"] == "histogram-burn-rate":
-                stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            if args["key"] in (
+                "num-unique-miners",
+                "num-unique-data-request-solvers",
+            ):
                 response = {
                     "start_epoch": period[0],
                     "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): [
-                        {"reverted": sd[0], "lies": sd[1]} for sd in stats_data
-                    ],
-                    "histogram_period": aggregation_epochs,
+                    args["key"].replace("-", "_"): num_unique,
                 }
-            elif args["key"] == "histogram-value-transfers":
-                data = [{"value_transfers": sd[2][0]} for sd in stats_data]
+            else:
+                top_100_mapped = translate_address_ids(database, top_100, logger)
                 response = {
                     "start_epoch": period[0],
                     "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): data,
-                    "histogram_period": aggregation_epochs,
+                    args["key"].replace("-", "_"): top_100_mapped,
                 }
-            elif args["key"] == "histogram-data-request-lie-rate":
-                data = [
+        elif args["key"] == "histogram-data-requests":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [
+                    {"total": sd[0], "failure": sd[0] - sd[1]} for sd in stats_data
+                ],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-data-request-composition":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [
                     {
-                        "witnessing_acts": sd[2][0],
-                        "errors": sd[2][1],
-                        "no_reveal_lies": sd[2][2],
-                        "out_of_consensus_lies": sd[2][3],
+                        "total": sd[0],
+                        "http_get": sd[2],
+                        "http_post": sd[3],
+                        "rng": sd[4],
                     }
                     for sd in stats_data
-                ]
-                response = {
-                    "start_epoch": period[0],
-                    "stop_epoch": period[1],
-                    args["key"].replace("-", "_"): data,
-                    "histogram_period": aggregation_epochs,
+                ],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-data-request-witness":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [sd[5] for sd in stats_data],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-data-request-reward":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [sd[6] for sd in stats_data],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-data-request-collateral":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [sd[7] for sd in stats_data],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-burn-rate":
+            stats_data = [stats_data[i][2] for i in range(len(stats_data))]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): [
+                    {"reverted": sd[0], "lies": sd[1]} for sd in stats_data
+                ],
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-value-transfers":
+            data = [{"value_transfers": sd[2][0]} for sd in stats_data]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): data,
+                "histogram_period": aggregation_epochs,
+            }
+        elif args["key"] == "histogram-data-request-lie-rate":
+            data = [
+                {
+                    "witnessing_acts": sd[2][0],
+                    "errors": sd[2][1],
+                    "no_reveal_lies": sd[2][2],
+                    "out_of_consensus_lies": sd[2][3],
                 }
+                for sd in stats_data
+            ]
+            response = {
+                "start_epoch": period[0],
+                "stop_epoch": period[1],
+                args["key"].replace("-", "_"): data,
+                "histogram_period": aggregation_epochs,
+            }
 
-        # Validate the data before saving it in the cache
-        try:
-            NetworkStatisticsResponse().load(response)
-        except ValidationError as err_info:
-            logger.error(f"Incorrect format for network statistics: {err_info}")
-            abort(
-                404,
-                message="Incorrect format for network statistics.",
-                headers={"X-Version": "1.0.0"},
-            )
-
-        # Try to save the response in the cache
-        try:
-            cache.set(
-                cache_key,
-                response,
-                timeout=caching_config["views"]["network_stats"]["timeout"],
-            )
-        except pylibmc.TooBig:
-            logger.warning(
-                f"Could not save {cache_key} in the memcached instance because its size exceeded 1MB"
-            )
+    # Validate the data before saving it in the cache
+    try:
+        load_response(NetworkStatisticsResponse, response)
+    except ValidationError as err_info:
+        logger.error(f"Incorrect format for network statistics: {err_info}")
+        abort(
+            404,
+            message="Incorrect format for network statistics.",
+            headers={"X-Version": "1.0.0"},
+        )
 
-        return response, 200, {"X-Version": "1.0.0"}
+    return response
 
 
 def calculate_network_start_stop_epoch(
@@ -11,6 +11,7 @@ from PIL import Image
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
 from schemas.network.tapi_schema import NetworkTapiArgs, NetworkTapiResponse
+from schemas.registry import load_response
 
 network_tapi_blueprint = Blueprint(
     "network tapi",
@@ -49,6 +50,7 @@ class NetworkTapi(MethodView):
         config = current_app.config["explorer"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
+        responses = current_app.extensions["responses"]
 
         logger.info(f"network_tapi({args['return_all']})")
 
@@ -94,6 +96,9 @@ class NetworkTapi(MethodView):
                         )
                         continue
 
+                # The cached TAPI can be shared with other requests, do not modify it in-place
+                tapi = dict(tapi)
+
                 # Skip unactivated TAPIs unless requested otherwise
                 if not args["return_all"] and not tapi["activated"]:
                     logger.debug(f"Not sending tapi-{counter} as it was not activated")
@@ -120,7 +125,7 @@ class NetworkTapi(MethodView):
             logger.info("No TAPI's found in memcached cache")
 
         try:
-            NetworkTapiResponse(many=True).load(all_tapis)
+            load_response(NetworkTapiResponse, all_tapis, many=True)
         except ValidationError as err_info:
             logger.error(f"Incorrect message format for TAPI data: {err_info}")
             abort(
@@ -133,4 +138,6 @@ class NetworkTapi(MethodView):
             f"Returning TAPI's {', '.join(str(tapi['tapi_id']) for tapi in all_tapis)}"
         )
 
-        return all_tapis, 200, {"X-Version": "1.0.0"}
+        return responses.respond(
+            f"tapi_{args['return_all']}", all_tapis, NetworkTapiResponse, many=True
+        )
@@ -5,9 +5,10 @@ from flask_smorest import Blueprint, abort
 from marshmallow import ValidationError
 
 from blockchain.objects.block import Block
-from node.consensus_constants import ConsensusConstants
+from blockchain.objects.database_block import DatabaseBlock
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from schemas.search.epoch_schema import SearchEpochArgs, SearchEpochResponse
 
 search_epoch_blueprint = Blueprint(
@@ -45,6 +46,7 @@ class SearchEpoch(MethodView):
     def get(self, args):
         cache = current_app.extensions["cache"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
         witnet_node = current_app.extensions["witnet_node"]
@@ -63,23 +65,27 @@ class SearchEpoch(MethodView):
                 )
                 return cached_block, 200, {"X-Version": "1.0.0"}
 
-        # Create consensus constants
-        consensus_constants = ConsensusConstants(
-            database=database,
-            witnet_node=witnet_node,
-        )
+        consensus_constants = constants.get_consensus_constants()
 
-        # Fetch block from a node
-        block = Block(
-            consensus_constants,
-            block_epoch=epoch,
-            logger=logger,
-            database=database,
-            witnet_node=witnet_node,
-        )
         # Process and validate block for API
         try:
-            block_json = block.process_block("api")
+            # Build the block from the database
+            block_json = DatabaseBlock(
+                consensus_constants,
+                logger=logger,
+                database=database,
+            ).get_block(block_epoch=epoch)
+            # Fall back to fetching it from a node if it was not inserted yet
+            if block_json is None:
+                block = Block(
+                    consensus_constants,
+                    block_epoch=epoch,
+                    logger=logger,
+                    database=database,
+                    witnet_node=witnet_node,
+                    wip=constants.get_wip(),
+                )
+                block_json = block.process_block("api")
         except ValidationError as err_info:
             logger.error(f"Incorrect message format for block {epoch}: {err_info}")
             abort(
@@ -96,33 +102,32 @@ class SearchEpoch(MethodView):
                 headers={"X-Version": "1.0.0"},
             )
 
+        try:
+            response = load_response(
+                SearchEpochResponse,
+                {
+                    "response_type": "block",
+                    "block": block_json,
+                },
+            )
+        except ValidationError as err_info:
+            logger.error(f"Incorrect message format for block {epoch}: {err_info}")
+            abort(
+                404,
+                message=f"Incorrect message format for block {epoch}.",
+                headers={"X-Version": "1.0.0"},
+            )
+
         # Attempt to cache the block
         block_hash = block_json["details"]["hash"]
         if block_json["details"]["confirmed"]:
             try:
                 # First, cache the actual block with the hash as key
-                try:
-                    cache.set(
-                        block_hash,
-                        SearchEpochResponse().load(
-                            {
-                                "response_type": "block",
-                                "block": block_json,
-                            }
-                        ),
-                        timeout=config["api"]["caching"]["scripts"]["blocks"][
-                            "timeout"
-                        ],
-                    )
-                except ValidationError as err_info:
-                    logger.error(
-                        f"Incorrect message format for block {epoch}: {err_info}"
-                    )
-                    abort(
-                        404,
-                        message=f"Incorrect message format for block {epoch}.",
-                        headers={"X-Version": "1.0.0"},
-                    )
+                cache.set(
+                    block_hash,
+                    response,
+                    timeout=config["api"]["caching"]["scripts"]["blocks"]["timeout"],
+                )
                 # Second, cache the block hash with the block epoch as key
                 cache.set(
                     str(epoch),
@@ -141,21 +146,4 @@ class SearchEpoch(MethodView):
                 f"Did not add unconfirmed block {epoch} with hash {block_hash} to the memcached cache"
             )
 
-        try:
-            return (
-                SearchEpochResponse().load(
-                    {
-                        "response_type": "block",
-                        "block": block_json,
-                    }
-                ),
-                200,
-                {"X-Version": "1.0.0"},
-            )
-        except ValidationError as err_info:
-            logger.error(f"Incorrect message format for block {epoch}: {err_info}")
-            abort(
-                404,
-                message=f"Incorrect message format for block {epoch}.",
-                headers={"X-Version": "1.0.0"},
-            )
+        return response, 200, {"X-Version": "1.0.0"}
@@ -7,15 +7,16 @@ from marshmallow import ValidationError
 from blockchain.objects.block import Block
 from blockchain.objects.data_request_history import DataRequestHistory
 from blockchain.objects.data_request_report import DataRequestReport
+from blockchain.objects.database_block import DatabaseBlock
 from blockchain.transactions.commit import Commit
 from blockchain.transactions.data_request import DataRequest
 from blockchain.transactions.mint import Mint
 from blockchain.transactions.reveal import Reveal
 from blockchain.transactions.tally import Tally
 from blockchain.transactions.value_transfer import ValueTransfer
-from node.consensus_constants import ConsensusConstants
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from schemas.search.hash_schema import SearchHashArgs, SearchHashResponse
 
 search_hash_blueprint = Blueprint(
@@ -63,6 +64,7 @@ class SearchHash(MethodView):
     def get(self, args, pagination_parameters):
         cache = current_app.extensions["cache"]
         config = current_app.config["explorer"]
+        constants = current_app.extensions["constants"]
         database = current_app.extensions["database"]
         logger = current_app.extensions["logger"]
         witnet_node = current_app.extensions["witnet_node"]
@@ -99,52 +101,39 @@ class SearchHash(MethodView):
             else:
                 return hashed_item, 200, {"X-Version": "1.0.0"}
 
-        sql = """
-            SELECT
-                type
-            FROM
-                hashes
-            WHERE
-                hash=%s
-        """
-        result = database.sql_return_one(
-            sql, parameters=[bytearray.fromhex(hash_value)]
+        result = database.statement_return_one(
+            "hash_type", parameters=[bytearray.fromhex(hash_value)]
         )
         if result:
             hash_type = result[0]
         # Check if the transaction is in the mempool and pending block inclusion
         else:
-            transactions_pool = witnet_node.get_mempool()
-
-            if "error" in transactions_pool:
-                logger.error(
-                    f"Could not fetch the pending transactions: {transactions_pool['error']}"
-                )
-                abort(
-                    404,
-                    message="Could not fetch the pending transactions.",
-                    headers={"X-Version": "1.0.0"},
-                )
-
-            transactions_pool = transactions_pool["result"]
+            transactions_pool = cache.get_or_compute(
+                "pending_hashes",
+                lambda: fetch_pending_hashes(logger, witnet_node),
+                timeout=config["api"]["caching"]["views"]["mempool"]["timeout"],
+                logger=logger,
+            )
             if hash_value in transactions_pool["data_request"]:
                 return (
-                    SearchHashResponse().load(
+                    load_response(
+                        SearchHashResponse,
                         {
                             "response_type": "pending",
                             "pending": "Data request is pending.",
-                        }
+                        },
                     ),
                     200,
                     {"X-Version": "1.0.0"},
                 )
             elif hash_value in transactions_pool["value_transfer"]:
                 return (
-                    SearchHashResponse().load(
+                    load_response(
+                        SearchHashResponse,
                         {
                             "response_type": "pending",
                             "pending": "Value transfer is pending.",
-                        }
+                        },
                     ),
                     200,
                     {"X-Version": "1.0.0"},
@@ -168,23 +157,45 @@ class SearchHash(MethodView):
 
         cache_config = config["api"]["caching"]
 
-        consensus_constants = ConsensusConstants(
-            database=database,
-            witnet_node=witnet_node,
-        )
+        consensus_constants = constants.get_consensus_constants()
 
         if hash_type == "block":
-            # Fetch block from a node
-            block = Block(
-                consensus_constants,
-                block_hash=hash_value,
-                logger=logger,
-                database=database,
-                witnet_node=witnet_node,
-            )
             # Fetch JSON representation of the block which has already been validated
             try:
-                block_json = block.process_block("api")
+                # Build the block from the database
+                block_json = DatabaseBlock(
+                    consensus_constants,
+                    logger=logger,
+                    database=database,
+                ).get_block(block_hash=hash_value)
+                # Fall back to fetching it from a node if it was not inserted yet
+                if block_json is None:
+                    block = Block(
+                        consensus_constants,
+                        block_hash=hash_value,
+                        logger=logger,
+                        database=database,
+                        witnet_node=witnet_node,
+                        wip=constants.get_wip(),
+                    )
+                    block_json = block.process_block("api")
+            except ValidationError as err_info:
+                logger.error(
+                    f"Incorrect message format for block {hash_value}: {err_info}"
+                )
+                abort(
+                    404,
+                    message=f"Incorrect message format for block {hash_value}.",
+                    headers={"X-Version": "1.0.0"},
+                )
+            try:
+                response = load_response(
+                    SearchHashResponse,
+                    {
+                        "response_type": "block",
+                        "block": block_json,
+                    },
+                )
             except ValidationError as err_info:
                 logger.error(
                     f"Incorrect message format for block {hash_value}: {err_info}"
@@ -199,12 +210,7 @@ class SearchHash(MethodView):
                     # First cache the block with its hash as a key
                     cache.set(
                         hash_value,
-                        SearchHashResponse().load(
-                            {
-                                "response_type": "block",
-                                "block": block_json,
-                            }
-                        ),
+                        response,
                         timeout=cache_config["scripts"]["blocks"]["timeout"],
                     )
                     # Second cache the block hash with the block epoch as key
@@ -215,15 +221,6 @@ class SearchHash(MethodView):
                         timeout=cache_config["scripts"]["blocks"]["timeout"],
                     )
                     logger.info(f"Added block {hash_value} to our memcached instance")
-                except ValidationError as err_info:
-                    logger.error(
-                        f"Incorrect message format for block {hash_value}: {err_info}"
-                    )
-                    abort(
-                        404,
-                        message=f"Incorrect message format for block {hash_value}.",
-                        headers={"X-Version": "1.0.0"},
-                    )
                 except pylibmc.TooBig:
                     logger.warning(
                         f"Could not save block {hash_value} in our memcached instance because its size exceeded 1MB"
@@ -232,24 +229,7 @@ class SearchHash(MethodView):
                 logger.info(
                     f"Did not add unconfirmed block {hash_value} to our memcached instance"
                 )
-            try:
-                return (
-                    SearchHashResponse().load(
-                        {
-                            "response_type": "block",
-                            "block": block_json,
-                        }
-                    ),
-                    200,
-                    {"X-Version": "1.0.0"},
-                )
-            except ValidationError as err_info:
-                logger.error(f"Incorrect message format for block: {err_info}")
-                abort(
-                    404,
-                    message=f"Incorrect message format for block {hash_value}.",
-                    headers={"X-Version": "1.0.0"},
-                )
+            return response, 200, {"X-Version": "1.0.0"}
 
         # Create mint transaction and get the details from the database
         if hash_type == "mint_txn":
@@ -265,41 +245,13 @@ class SearchHash(MethodView):
                     message=f"Incorrect message format for mint transaction {hash_value}.",
                     headers={"X-Version": "1.0.0"},
                 )
-            if mint_txn["confirmed"]:
-                logger.info(
-                    f"Added mint transaction {hash_value} to our memcached instance"
-                )
-                try:
-                    cache.set(
-                        hash_value,
-                        SearchHashResponse().load(
-                            {
-                                "response_type": "mint",
-                                "mint": mint_txn,
-                            }
-                        ),
-                        timeout=cache_config["views"]["hash"]["timeout"],
-                    )
-                except ValidationError as err_info:
-                    logger.error(
-                        f"Incorrect message format for mint transaction {hash_value}: {err_info}"
-                    )
-                    abort(
-                        404,
-                        message=f"Incorrect message format for mint transaction {hash_value}.",
-                        headers={"X-Version": "1.0.0"},
-                    )
-            else:
-                logger.info(
-                    f"Did not add unconfirmed mint transaction {hash_value} to our memcached instance"
-                )
             try:
-                return (
-                    SearchHashResponse().load(
-                        {"response_type": "mint", "mint": mint_txn}
-                    ),
-                    200,
-                    {"X-Version": "1.0.0"},
+                response = load_response(
+                    SearchHashResponse,
+                    {
+                        "response_type": "mint",
+                        "mint": mint_txn,
+                    },
                 )
             except ValidationError as err_info:
                 logger.error(
@@ -310,6 +262,20 @@ class SearchHash(MethodView):
                     message=f"Incorrect message format for mint transaction {hash_value}.",
                     headers={"X-Version": "1.0.0"},
                 )
+            if mint_txn["confirmed"]:
+                logger.info(
+                    f"Added mint transaction {hash_value} to our memcached instance"
+                )
+                cache.set(
+                    hash_value,
+                    response,
+                    timeout=cache_config["views"]["hash"]["timeout"],
+                )
+            else:
+                logger.info(
+                    f"Did not add unconfirmed mint transaction {hash_value} to our memcached instance"
+                )
+            return response, 200, {"X-Version": "1.0.0"}
 
         # Create value transfer transaction and get the details from the database
         if hash_type == "value_transfer_txn":
@@ -331,44 +297,13 @@ class SearchHash(MethodView):
                     message=f"Incorrect message format for value transfer transaction {hash_value}.",
                     headers={"X-Version": "1.0.0"},
                 )
-            if value_transfer_txn["confirmed"]:
-                logger.info(
-                    f"Added value transfer transaction {hash_value} to our memcached instance"
-                )
-                try:
-                    cache.set(
-                        hash_value,
-                        SearchHashResponse().load(
-                            {
-                                "response_type": "value_transfer",
-                                "value_transfer": value_transfer_txn,
-                            }
-                        ),
-                        timeout=cache_config["views"]["hash"]["timeout"],
-                    )
-                except ValidationError as err_info:
-                    logger.error(
-                        f"Incorrect message format for value transfer transaction {hash_value}: {err_info}"
-                    )
-                    abort(
-                        404,
-                        message=f"Incorrect message format for value transfer transaction {hash_value}.",
-                        headers={"X-Version": "1.0.0"},
-                    )
-            else:
-                logger.info(
-                    f"Did not add unconfirmed value transfer transaction {hash_value} to our memcached instance"
-                )
             try:
-                return (
-                    SearchHashResponse().load(
-                        {
-                            "response_type": "value_transfer",
-                            "value_transfer": value_transfer_txn,
-                        }
-                    ),
-                    200,
-                    {"X-Version": "1.0.0"},
+                response = load_response(
+                    SearchHashResponse,
+                    {
+                        "response_type": "value_transfer",
+                        "value_transfer": value_transfer_txn,
+                    },
                 )
             except ValidationError as err_info:
                 logger.error(
@@ -379,6 +314,20 @@ class SearchHash(MethodView):
                     message=f"Incorrect message format for value transfer transaction {hash_value}.",
                     headers={"X-Version": "1.0.0"},
                 )
+            if value_transfer_txn["confirmed"]:
+                logger.info(
+                    f"Added value transfer transaction {hash_value} to our memcached instance"
+                )
+                cache.set(
+                    hash_value,
+                    response,
+                    timeout=cache_config["views"]["hash"]["timeout"],
+                )
+            else:
+                logger.info(
+                    f"Did not add unconfirmed value transfer transaction {hash_value} to our memcached instance"
+                )
+            return response, 200, {"X-Version": "1.0.0"}
 
         if hash_type in ("data_request_txn", "commit_txn", "reveal_txn", "tally_txn"):
             # Only return a single transaction, don't build a DataRequestReport
@@ -407,11 +356,12 @@ class SearchHash(MethodView):
                         # Do not cache a the result of a query for a single data request transaction
                         # This would conflict with the data request report which uses the same hash_value as key
                         return (
-                            SearchHashResponse().load(
+                            load_response(
+                                SearchHashResponse,
                                 {
                                     "response_type": "data_request",
                                     "data_request": transaction,
-                                }
+                                },
                             ),
                             200,
                             {"X-Version": "1.0.0"},
@@ -441,20 +391,12 @@ class SearchHash(MethodView):
                             headers={"X-Version": "1.0.0"},
                         )
                     try:
-                        cache.set(
-                            hash_value,
-                            SearchHashResponse().load(
-                                {
-                                    "response_type": "commit",
-                                    "commit": transaction,
-                                }
-                            ),
-                            timeout=cache_config["views"]["hash"]["timeout"],
-                        )
-                        return (
-                            {"response_type": "commit", "commit": transaction},
-                            200,
-                            {"X-Version": "1.0.0"},
+                        response = load_response(
+                            SearchHashResponse,
+                            {
+                                "response_type": "commit",
+                                "commit": transaction,
+                            },
                         )
                     except ValidationError:
                         abort(
@@ -462,6 +404,12 @@ class SearchHash(MethodView):
                             message=f"Incorrect message format for commit transaction {hash_value}.",
                             headers={"X-Version": "1.0.0"},
                         )
+                    cache.set(
+                        hash_value,
+                        response,
+                        timeout=cache_config["views"]["hash"]["timeout"],
+                    )
+                    return response, 200, {"X-Version": "1.0.0"}
                 elif hash_type == "reveal_txn":
                     reveal = Reveal(
                         consensus_constants,
@@ -481,20 +429,12 @@ class SearchHash(MethodView):
                             headers={"X-Version": "1.0.0"},
                         )
                     try:
-                        cache.set(
-                            hash_value,
-                            SearchHashResponse().load(
-                                {
-                                    "response_type": "reveal",
-                                    "reveal": transaction,
-                                }
-                            ),
-                            timeout=cache_config["views"]["hash"]["timeout"],
-                        )
-                        return (
-                            {"response_type": "reveal", "reveal": transaction},
-                            200,
-                            {"X-Version": "1.0.0"},
+                        response = load_response(
+                            SearchHashResponse,
+                            {
+                                "response_type": "reveal",
+                                "reveal": transaction,
+                            },
                         )
                     except ValidationError:
                         abort(
@@ -502,6 +442,12 @@ class SearchHash(MethodView):
                             message=f"Incorrect message format for reveal transaction {hash_value}.",
                             headers={"X-Version": "1.0.0"},
                         )
+                    cache.set(
+                        hash_value,
+                        response,
+                        timeout=cache_config["views"]["hash"]["timeout"],
+                    )
+                    return response, 200, {"X-Version": "1.0.0"}
                 elif hash_type == "tally_txn":
                     tally = Tally(
                         consensus_constants,
@@ -521,20 +467,12 @@ class SearchHash(MethodView):
                             headers={"X-Version": "1.0.0"},
                         )
                     try:
-                        cache.set(
-                            hash_value,
-                            SearchHashResponse().load(
-                                {
-                                    "response_type": "tally",
-                                    "tally": transaction,
-                                }
-                            ),
-                            timeout=cache_config["views"]["hash"]["timeout"],
-                        )
-                        return (
-                            {"response_type": "tally", "tally": transaction},
-                            200,
-                            {"X-Version": "1.0.0"},
+                        response = load_response(
+                            SearchHashResponse,
+                            {
+                                "response_type": "tally",
+                                "tally": transaction,
+                            },
                         )
                     except ValidationError:
                         abort(
@@ -542,6 +480,12 @@ class SearchHash(MethodView):
                             message=f"Incorrect message format for tally transaction {hash_value}.",
                             headers={"X-Version": "1.0.0"},
                         )
+                    cache.set(
+                        hash_value,
+                        response,
+                        timeout=cache_config["views"]["hash"]["timeout"],
+                    )
+                    return response, 200, {"X-Version": "1.0.0"}
             # Create data request report for this hash
             else:
                 data_request_report = DataRequestReport(
@@ -570,39 +514,18 @@ class SearchHash(MethodView):
                     )
                     return cached_data_request_report, 200, {"X-Version": "1.0.0"}
 
-                try:
-                    data_request_report_json = data_request_report.get_report()
-                except ValidationError as err_info:
-                    logger.error(
-                        f"Incorrect message format for data request report {data_request_hash}: {err_info}"
-                    )
-                    abort(
-                        404,
-                        message=f"Incorrect message format for data request report {data_request_hash}.",
-                        headers={"X-Version": "1.0.0"},
-                    )
-
-                # From the API: only cache data request reports with a confirmed tally transaction
-                if (
-                    data_request_report_json["tally"]
-                    and data_request_report_json["tally"]["confirmed"]
-                ):
-                    logger.info(
-                        f"Added data request report {data_request_hash} to our memcached instance"
-                    )
-                    # Cache data request report based on the data request hash
+                # Confirmed data request reports are saved in the database, only build a report if it was not saved
+                saved_data_request_report = data_request_report.get_saved_report(
+                    data_request_hash
+                )
+                if saved_data_request_report:
                     try:
-                        cache.set(
-                            data_request_hash,
-                            SearchHashResponse().load(
-                                {
-                                    "response_type": "data_request_report",
-                                    "data_request_report": data_request_report_json,
-                                }
-                            ),
-                            timeout=cache_config["scripts"]["data_request_reports"][
-                                "timeout"
-                            ],
+                        response = load_response(
+                            SearchHashResponse,
+                            {
+                                "response_type": "data_request_report",
+                                "data_request_report": saved_data_request_report,
+                            },
                         )
                     except ValidationError as err_info:
                         logger.error(
@@ -613,26 +536,43 @@ class SearchHash(MethodView):
                             message=f"Incorrect message format for data request report {data_request_hash}.",
                             headers={"X-Version": "1.0.0"},
                         )
-                else:
-                    if "tally" not in data_request_report_json:
-                        logger.info(
-                            f"Did not add unconfirmed data request report {data_request_hash} to our memcached instance"
+                    logger.info(
+                        f"Found a data request report {data_request_hash} for a {hash_type.replace('_', ' ')} in the database"
+                    )
+                    # Add the data request report to our memcached instance again
+                    try:
+                        cache.set(
+                            data_request_hash,
+                            response,
+                            timeout=cache_config["scripts"]["data_request_reports"][
+                                "timeout"
+                            ],
                         )
-                    else:
-                        logger.info(
-                            f"Did not add unconfirmed data request report {data_request_hash} to our memcached instance"
+                    except pylibmc.TooBig:
+                        logger.warning(
+                            f"Could not save data request report {data_request_hash} in our memcached instance because its size exceeded 1MB"
                         )
+                    return response, 200, {"X-Version": "1.0.0"}
 
                 try:
-                    return (
-                        SearchHashResponse().load(
-                            {
-                                "response_type": "data_request_report",
-                                "data_request_report": data_request_report_json,
-                            }
-                        ),
-                        200,
-                        {"X-Version": "1.0.0"},
+                    data_request_report_json = data_request_report.get_report()
+                except ValidationError as err_info:
+                    logger.error(
+                        f"Incorrect message format for data request report {data_request_hash}: {err_info}"
+                    )
+                    abort(
+                        404,
+                        message=f"Incorrect message format for data request report {data_request_hash}.",
+                        headers={"X-Version": "1.0.0"},
+                    )
+
+                try:
+                    response = load_response(
+                        SearchHashResponse,
+                        {
+                            "response_type": "data_request_report",
+                            "data_request_report": data_request_report_json,
+                        },
                     )
                 except ValidationError as err_info:
                     logger.error(
@@ -644,6 +584,29 @@ class SearchHash(MethodView):
                         headers={"X-Version": "1.0.0"},
                     )
 
+                # From the API: only cache data request reports with a confirmed tally transaction
+                if (
+                    data_request_report_json["tally"]
+                    and data_request_report_json["tally"]["confirmed"]
+                ):
+                    logger.info(
+                        f"Added data request report {data_request_hash} to our memcached instance"
+                    )
+                    # Cache data request report based on the data request hash
+                    cache.set(
+                        data_request_hash,
+                        response,
+                        timeout=cache_config["scripts"]["data_request_reports"][
+                            "timeout"
+                        ],
+                    )
+                else:
+                    logger.info(
+                        f"Did not add unconfirmed data request report {data_request_hash} to our memcached instance"
+                    )
+
+                return response, 200, {"X-Version": "1.0.0"}
+
         if hash_type in ("DRO_bytes_hash", "RAD_bytes_hash"):
             # Create data request history
             data_request_history = DataRequestHistory(
@@ -664,11 +627,12 @@ class SearchHash(MethodView):
                 )
                 pagination_parameters.item_count = count
                 return (
-                    SearchHashResponse().load(
+                    load_response(
+                        SearchHashResponse,
                         {
                             "response_type": "data_request_history",
                             "data_request_history": history,
-                        }
+                        },
                     ),
                     200,
                     {"X-Version": "1.0.0"},
@@ -682,3 +646,25 @@ class SearchHash(MethodView):
                     message=f"Incorrect message format for data request history: {hash_value}.",
                     headers={"X-Version": "1.0.0"},
                 )
+
+
+def fetch_pending_hashes(logger, witnet_node):
+    # The explorer saves the hashes of all pending transactions every mempool interval
+    # Only query the node when they were not saved recently, e.g., because the explorer is not running
+    logger.info("Could not find pending hashes in memcached cache")
+
+    transactions_pool = witnet_node.get_mempool()
+    if "error" in transactions_pool:
+        logger.error(
+            f"Could not fetch the pending transactions: {transactions_pool['error']}"
+        )
+        abort(
+            404,
+            message="Could not fetch the pending transactions.",
+            headers={"X-Version": "1.0.0"},
+        )
+
+    return {
+        "data_request": set(transactions_pool["result"]["data_request"]),
+        "value_transfer": set(transactions_pool["result"]["value_transfer"]),
+    }
@@ -1,4 +1,3 @@
-import pylibmc
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
@@ -6,6 +5,7 @@ from marshmallow import ValidationError
 
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from schemas.transaction.mempool_schema import (
     TransactionMempoolArgs,
     TransactionMempoolResponse,
@@ -51,50 +51,41 @@ class TransactionMempool(MethodView):
 
         logger.info(f"network_mempool({args['type']})")
 
-        mempool = cache.get("transaction_mempool")
-        if mempool:
-            logger.info("Found the live mempool in our memcached instance")
-            return (
-                build_return_value(args["type"], mempool),
-                200,
-                {"X-Version": "1.0.0"},
-            )
+        mempool = cache.get_or_compute(
+            "transaction_mempool",
+            lambda: fetch_mempool(logger, witnet_node),
+            timeout=config["api"]["caching"]["views"]["mempool"]["timeout"],
+            logger=logger,
+        )
 
-        mempool = witnet_node.get_mempool()
-        if "result" in mempool:
-            logger.info("Fetched transaction mempool from node")
-            mempool = mempool["result"]
+        return (
+            build_return_value(args["type"], mempool),
+            200,
+            {"X-Version": "1.0.0"},
+        )
 
-            try:
-                cache.set(
-                    "transaction_mempool",
-                    TransactionMempoolResponse().load(mempool),
-                    timeout=config["api"]["caching"]["views"]["mempool"]["timeout"],
-                )
-            except ValidationError as err_info:
-                logger.error(f"Incorrect message format for mempool data: {err_info}")
-                abort(
-                    404,
-                    message="Incorrect message format for mempool data.",
-                    headers={"X-Version": "1.0.0"},
-                )
-            except pylibmc.TooBig:
-                logger.warning(
-                    "Could not save the mempool in our memcached instance because the item size exceeded 1MB"
-                )
 
-            return (
-                build_return_value(args["type"], mempool),
-                200,
-                {"X-Version": "1.0.0"},
-            )
-        else:
-            logger.error(f"Could not fetch the live mempool: {mempool['error']}")
-            abort(
-                404,
-                message="Could not fetch the live mempool.",
-                headers={"X-Version": "1.0.0"},
-            )
+def fetch_mempool(logger, witnet_node):
+    logger.info("Could not find the live mempool in our memcached instance")
+    mempool = witnet_node.get_mempool()
+    if "result" not in mempool:
+        logger.error(f"Could not fetch the live mempool: {mempool['error']}")
+        abort(
+            404,
+            message="Could not fetch the live mempool.",
+            headers={"X-Version": "1.0.0"},
+        )
+
+    logger.info("Fetched transaction mempool from node")
+    try:
+        return load_response(TransactionMempoolResponse, mempool["result"])
+    except ValidationError as err_info:
+        logger.error(f"Incorrect message format for mempool data: {err_info}")
+        abort(
+            404,
+            message="Incorrect message format for mempool data.",
+            headers={"X-Version": "1.0.0"},
+        )
 
 
 def build_return_value(txn_type, mempool):
@@ -5,6 +5,7 @@ from marshmallow import ValidationError
 
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import load_response
 from schemas.transaction.priority_schema import (
     TransactionPriorityArgs,
     TransactionPriorityResponse,
@@ -52,38 +53,12 @@ class TransactionPriority(MethodView):
 
         logger.info(f"get_priority({priority_key})")
 
-        priority = cache.get("priority")
-        if not priority:
-            logger.info("Could not find 'priority' in memcached cache")
-            priority = witnet_node.get_priority()
-            if "result" in priority:
-                priority = priority["result"]
-                try:
-                    cache.set(
-                        "priority",
-                        TransactionPriorityResponse().load(priority),
-                        timeout=config["api"]["caching"]["views"]["priority"][
-                            "timeout"
-                        ],
-                    )
-                except ValidationError as err_info:
-                    logger.error(f"Incorrect message format for priority: {err_info}")
-                    abort(
-                        404,
-                        message="Incorrect message format for priority.",
-                        headers={"X-Version": "1.0.0"},
-                    )
-            else:
-                logger.error(
-                    f"Could not fetch transaction priority fees: {priority['error']}"
-                )
-                abort(
-                    404,
-                    message="Could not fetch transaction priority fees.",
-                    headers={"X-Version": "1.0.0"},
-                )
-        else:
-            logger.info("Found 'priority' in memcached cache")
+        priority = cache.get_or_compute(
+            "priority",
+            lambda: fetch_priority(logger, witnet_node),
+            timeout=config["api"]["caching"]["views"]["priority"]["timeout"],
+            logger=logger,
+        )
 
         if priority_key == "all":
             return priority, 200, {"X-Version": "1.0.0"}
@@ -94,3 +69,25 @@ class TransactionPriority(MethodView):
                 if key.startswith(priority_key)
             }
             return filtered_priority, 200, {"X-Version": "1.0.0"}
+
+
+def fetch_priority(logger, witnet_node):
+    logger.info("Could not find 'priority' in memcached cache")
+    priority = witnet_node.get_priority()
+    if "result" not in priority:
+        logger.error(f"Could not fetch transaction priority fees: {priority['error']}")
+        abort(
+            404,
+            message="Could not fetch transaction priority fees.",
+            headers={"X-Version": "1.0.0"},
+        )
+
+    try:
+        return load_response(TransactionPriorityResponse, priority["result"])
+    except ValidationError as err_info:
+        logger.error(f"Incorrect message format for priority: {err_info}")
+        abort(
+            404,
+            message="Incorrect message format for priority.",
+            headers={"X-Version": "1.0.0"},
+        )
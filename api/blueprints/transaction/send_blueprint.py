@@ -6,6 +6,7 @@ from marshmallow import INCLUDE, ValidationError
 from schemas.include.post_transaction_schema import PostTransaction
 from schemas.misc.abort_schema import AbortSchema
 from schemas.misc.version_schema import VersionSchema
+from schemas.registry import get_schema, load_response
 from schemas.transaction.send_schema import ValueTransferArgs, ValueTransferResponse
 
 transaction_send_blueprint = Blueprint(
@@ -106,7 +107,7 @@ class TransactionSend(MethodView):
         logger.info(f"{prefix} transaction: {args['transaction']}")
 
         try:
-            transaction = PostTransaction().load(args["transaction"])
+            transaction = get_schema(PostTransaction).load(args["transaction"])
         except ValidationError as err_info:
             logger.error(f"Failed to validate value transfer: {err_info}")
             abort(
@@ -117,7 +118,9 @@ class TransactionSend(MethodView):
 
         if args["test"]:
             return (
-                ValueTransferResponse().load({"result": "Value transfer is valid."}),
+                load_response(
+                    ValueTransferResponse, {"result": "Value transfer is valid."}
+                ),
                 201,
                 {"X-Version": "1.0.0"},
             )
@@ -135,8 +138,9 @@ class TransactionSend(MethodView):
             else:
                 if "result" in response and response["result"]:
                     return (
-                        ValueTransferResponse().load(
-                            {"result": "Succesfully sent value transfer."}
+                        load_response(
+                            ValueTransferResponse,
+                            {"result": "Succesfully sent value transfer."},
                         ),
                         201,
                         {"X-Version": "1.0.0"},
@@ -1,9 +1,12 @@
+from api.response_cache import ResponseCache
 from mockups.cache import MockCache
 from mockups.database import MockDatabase
 from mockups.socket_manager import MockSocketManager
 from mockups.witnet_node import MockWitnetNode
+from node.constants_registry import ConstantsRegistry
 from node.witnet_client_pool import WitnetClientPool
 from util.database_pool import DatabasePool
+from util.local_cache import LocalCache
 from util.memcached import MemcachedPool
 from util.socket_manager import SocketManager
 
@@ -21,7 +24,7 @@ def create_address_caching_server(config, mock=False):
     return address_caching_server
 
 
-def create_cache(config, mock=False):
+def create_cache(config, constants=None, mock=False):
     if mock:
         cache = MockCache()
     else:
@@ -32,10 +35,25 @@ def create_cache(config, mock=False):
             caching_config["password"],
             caching_config["threads"],
             caching_config["blocking"],
+            stale_timeout=caching_config.get("stale_timeout", 60),
+            lease_timeout=caching_config.get("lease_timeout", 10),
+            local_cache=LocalCache(
+                max_items=caching_config.get("local_max_items", 256),
+                constants=constants,
+            ),
         )
     return cache
 
 
+def create_constants(config, database, witnet_node):
+    return ConstantsRegistry(
+        database=database,
+        witnet_node=witnet_node,
+        error_retry=config["api"]["error_retry"],
+        check_interval=config["api"].get("constants_check_interval", 60),
+    )
+
+
 def create_database(config, mock=False):
     if mock:
         database = MockDatabase()
@@ -44,9 +62,21 @@ def create_database(config, mock=False):
     return database
 
 
+def create_responses(config):
+    caching_config = config["api"]["caching"]
+    return ResponseCache(
+        enabled=caching_config.get("encoded_responses", True),
+        max_items=caching_config.get("encoded_responses_max_items", 256),
+    )
+
+
 def create_witnet_node(config, mock=False):
     if mock:
         witnet_node = MockWitnetNode()
     else:
         witnet_node = WitnetClientPool(config["node-pool"])
+        # Metrics of the node client pool are optionally exported for Prometheus
+        metrics_port = config["api"].get("metrics_port", None)
+        if metrics_port:
+            witnet_node.start_metrics_server(metrics_port)
     return witnet_node
@@ -0,0 +1,8 @@
+# Cooperative sockets, locks and queues have to be in place before any connection is created
+from gevent import monkey
+
+monkey.patch_all()
+
+from api import create_app  # noqa: E402
+
+app = create_app()
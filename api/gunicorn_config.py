@@ -91,7 +91,15 @@ def child_exit(server, worker):
 
 # Called just after a worker has been exited, in the worker process.
 def worker_exit(server, worker):
-    pass
+    # Log the hit and miss counters of the in-process cache of this worker
+    app = getattr(worker, "wsgi", None)
+    if app is not None and "cache" in app.extensions:
+        counters = app.extensions["cache"].get_local_cache_counters()
+        if counters is not None:
+            worker.log.info(
+                "Local cache: %d hits, %d misses, %d items"
+                % (counters["hits"], counters["misses"], counters["items"])
+            )
 
 
 # Called just after num_workers has been changed.
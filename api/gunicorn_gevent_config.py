@@ -0,0 +1,17 @@
+# Gunicorn configuration serving the API from greenlets instead of a fixed number of threads
+# A request waiting on a slow node call or a database connection no longer occupies one of the threads
+# Start it with: gunicorn --config file:api/gunicorn_gevent_config.py api.gevent_wsgi:app
+
+import os
+import runpy
+
+# Reuse all settings and server hooks of the default configuration
+# The file is executed directly since importing the api package would load the app before gevent patches it
+globals().update(
+    runpy.run_path(os.path.join(os.path.dirname(__file__), "gunicorn_config.py"))
+)
+
+# Worker Processes
+worker_class = "gevent"
+# Maximum number of requests a single worker handles concurrently
+worker_connections = 1000
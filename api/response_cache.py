@@ -0,0 +1,80 @@
+import collections
+import gzip
+import hashlib
+import threading
+
+from flask import Response, current_app, request
+
+from schemas.registry import get_schema
+
+
+class ResponseCache(object):
+    # Per-worker cache of the encoded JSON body, its gzip-compressed version and a strong ETag per representation
+    # An entry is reused as long as the view returns the same data, so polled endpoints skip the schema
+    # dumping and JSON encoding and clients which already have the data receive a 304 Not Modified
+    def __init__(self, enabled=True, max_items=256, compress_threshold=1024):
+        self.enabled = enabled
+        self.max_items = max_items
+        self.compress_threshold = compress_threshold
+
+        self.lock = threading.Lock()
+        self.responses = collections.OrderedDict()
+
+    def init_app(self, app):
+        app.extensions = getattr(app, "extensions", {})
+        if "responses" not in app.extensions:
+            app.extensions["responses"] = self
+
+    def respond(self, key, data, schema_class, many=False, version="1.0.0"):
+        if not self.enabled:
+            return data, 200, {"X-Version": version}
+
+        with self.lock:
+            entry = self.responses.get(key)
+            if entry is not None:
+                self.responses.move_to_end(key)
+
+        # Values served from the in-process cache are the same object, others are compared
+        if entry is None or (entry["data"] is not data and entry["data"] != data):
+            entry = self.encode(data, schema_class, many)
+            with self.lock:
+                self.responses[key] = entry
+                self.responses.move_to_end(key)
+                while len(self.responses) > self.max_items:
+                    self.responses.popitem(last=False)
+
+        # The compressed body is a different representation, so it has its own strong ETag
+        if entry["compressed"] is not None and "gzip" in request.accept_encodings:
+            body, etag = entry["compressed"], entry["etag_gzip"]
+        else:
+            body, etag = entry["body"], entry["etag"]
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype="application/json")
+            if body is entry["compressed"]:
+                response.headers["Content-Encoding"] = "gzip"
+
+        response.set_etag(etag)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["X-Version"] = version
+        return response
+
+    def encode(self, data, schema_class, many):
+        # Same serialization as a view returning the data to its response schema
+        body = current_app.json.dumps(get_schema(schema_class, many=many).dump(data))
+        body = body.encode("utf-8")
+
+        compressed = None
+        if len(body) >= self.compress_threshold:
+            compressed = gzip.compress(body)
+
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return {
+            "data": data,
+            "etag": etag,
+            "etag_gzip": f"{etag}-gzip",
+            "body": body,
+            "compressed": compressed,
+        }
@@ -13,16 +13,17 @@ import time
 from multiprocessing import Process, Queue
 from queue import Empty
 
+import pylibmc
 import toml
 
 from blockchain.objects.block import Block
-from blockchain.transactions.data_request import DataRequest
-from blockchain.transactions.value_transfer import ValueTransfer
+from blockchain.objects.mempool import MempoolFees, MempoolTracker
 from blockchain.witnet_database import WitnetDatabase
 from node.consensus_constants import ConsensusConstants
+from node.witnet_client_pool import WitnetClientPool
 from node.witnet_node import WitnetNode
-from util.common_functions import calculate_current_epoch
 from util.common_sql import sql_last_confirmed_block
+from util.memcached_codec import CodecClient
 from util.socket_manager import SocketManager
 
 
@@ -84,6 +85,9 @@ class BlockExplorer(object):
         # Get configuration to connect to the address caching server
         self.addresses_config = config["api"]["caching"]["scripts"]["addresses"]
 
+        # Get configuration to connect to memcached
+        self.cache_config = config["api"]["caching"]
+
     def configure_logging_process(self, queue, label):
         handler = logging.handlers.QueueHandler(queue)
         root = logging.getLogger(label)
@@ -218,24 +222,34 @@ class BlockExplorer(object):
         database.insert_mint_txn(block_json["transactions"]["mint"], epoch)
 
         # Insert value transfer transactions
-        for txn_details in block_json["transactions"]["value_transfer"]:
-            database.insert_value_transfer_txn(txn_details, epoch)
+        for block_position, txn_details in enumerate(
+            block_json["transactions"]["value_transfer"]
+        ):
+            database.insert_value_transfer_txn(txn_details, epoch, block_position)
 
         # Insert data request transactions
-        for txn_details in block_json["transactions"]["data_request"]:
-            database.insert_data_request_txn(txn_details, epoch)
+        for block_position, txn_details in enumerate(
+            block_json["transactions"]["data_request"]
+        ):
+            database.insert_data_request_txn(txn_details, epoch, block_position)
 
         # Insert commit transactions
-        for txn_details in block_json["transactions"]["commit"]:
-            database.insert_commit_txn(txn_details, epoch)
+        for block_position, txn_details in enumerate(
+            block_json["transactions"]["commit"]
+        ):
+            database.insert_commit_txn(txn_details, epoch, block_position)
 
         # Insert reveal transactions
-        for txn_details in block_json["transactions"]["reveal"]:
-            database.insert_reveal_txn(txn_details, epoch)
+        for block_position, txn_details in enumerate(
+            block_json["transactions"]["reveal"]
+        ):
+            database.insert_reveal_txn(txn_details, epoch, block_position)
 
         # Insert tally transactions
-        for txn_details in block_json["transactions"]["tally"]:
-            database.insert_tally_txn(txn_details, epoch)
+        for block_position, txn_details in enumerate(
+            block_json["transactions"]["tally"]
+        ):
+            database.insert_tally_txn(txn_details, epoch, block_position)
 
     def insert_blocks_and_transactions(self, log_queue, unconfirmed_blocks_queue):
         # Set up logger
@@ -521,8 +535,26 @@ class BlockExplorer(object):
         sleep_for = max(0, next_poll_interval - time.time())
         time.sleep(sleep_for)
 
-        mapped_data_requests = {}
-        mapped_value_transfers = {}
+        # Share the hashes of all pending transactions with the API
+        memcached_client = CodecClient(
+            self.cache_config["server"].split(","),
+            binary=True,
+            username=self.cache_config["user"],
+            password=self.cache_config["password"],
+            behaviors={"tcp_nodelay": True, "ketama": True},
+        )
+
+        # Fetch pending transactions concurrently and only extract their fee and weight
+        mempool_fees = MempoolFees(
+            WitnetClientPool(self.node_config),
+            self.mempool_database,
+            logger=logger,
+            fetch_threads=self.node_config["nodes"]["number"],
+        )
+
+        # Track the fee and weight of all pending transactions in contiguous columns
+        mempool_data_requests = MempoolTracker()
+        mempool_value_transfers = MempoolTracker()
 
         while True:
             current_time = time.time()
@@ -533,13 +565,6 @@ class BlockExplorer(object):
                 int(current_time / self.mempool_interval) + 1
             ) * self.mempool_interval
 
-            current_epoch = self.insert_pending_node.get_current_epoch()
-            if current_epoch == 0:
-                current_epoch = calculate_current_epoch(
-                    self.consensus_constants.checkpoint_zero_timestamp,
-                    self.consensus_constants.checkpoints_period,
-                )
-
             transactions_pool = self.insert_pending_node.get_mempool()
             # If all nodes are busy retry in short bursts to get the request through
             while "error" in transactions_pool:
@@ -568,128 +593,71 @@ class BlockExplorer(object):
                 f"Mempool: {len(transactions_pool['data_request'])} data requests, {len(transactions_pool['value_transfer'])} value transfers"
             )
 
-            mapped_transactions, queried_transactions = 0, 0
-            data_request = DataRequest(
-                self.consensus_constants,
-                logger=logger,
-                database_config=self.database_config,
-                node_config=self.node_config,
-            )
-            for transaction in transactions_pool["data_request"]:
-                if transaction in mapped_data_requests:
-                    data_request_fee, data_request_size = mapped_data_requests[
-                        transaction
-                    ]
-                    mapped_transactions += 1
-                else:
-                    try:
-                        data_request.set_transaction(transaction, current_epoch)
-                        txn_details = data_request.process_transaction("explorer")
-                    except ValueError:
-                        continue
-
-                    queried_transactions += 1
+            self.save_pending_hashes(logger, memcached_client, transactions_pool)
 
-                    mapped_data_requests[transaction] = (
-                        txn_details["miner_fee"],
-                        txn_details["weight"],
-                    )
-
-                # If less than 3 seconds are left until the next interval, break out of the loop and leave the remaining transactions for the next iteration
-                if time.time() + 3 > next_poll_interval:
-                    logger.warning(
-                        "Too many data requests to process, leaving some to process in the next iteration"
-                    )
-                    break
-
-            unprocessed_data_requests = (
-                len(transactions_pool["data_request"])
-                - mapped_transactions
-                - queried_transactions
+            # Drop transactions which left the mempool and only fetch transactions which we did not process before
+            new_data_requests, cleaned_data_requests = mempool_data_requests.update(
+                transactions_pool["data_request"]
             )
-            logger.info(
-                f"Processed data requests: {mapped_transactions} mapped, {queried_transactions} fetched, {unprocessed_data_requests} left"
+            data_request_fees = mempool_fees.process_transactions(
+                new_data_requests, next_poll_interval - 3
             )
+            mempool_data_requests.add_many(data_request_fees)
 
-            mapped_transactions, queried_transactions = 0, 0
-            value_transfer = ValueTransfer(
-                self.consensus_constants,
-                logger=logger,
-                database_config=self.database_config,
-                node_config=self.node_config,
+            logger.info(
+                f"Processed data requests: {len(transactions_pool['data_request']) - len(new_data_requests)} mapped, {len(data_request_fees)} fetched, {len(new_data_requests) - len(data_request_fees)} left, {cleaned_data_requests} removed"
             )
-            for transaction in transactions_pool["value_transfer"]:
-                if transaction in mapped_value_transfers:
-                    value_transfer_fee, value_transfer_size = mapped_value_transfers[
-                        transaction
-                    ]
-                    mapped_transactions += 1
-                else:
-                    try:
-                        value_transfer.set_transaction(transaction, current_epoch)
-                        txn_details = value_transfer.process_transaction("explorer")
-                    except ValueError:
-                        continue
 
-                    queried_transactions += 1
-
-                    mapped_value_transfers[transaction] = (
-                        txn_details["fee"],
-                        txn_details["weight"],
-                    )
-
-                # If less than 3 seconds are left until the next interval, break out of the loop and leave the remaining transactions for the next iteration
-                if time.time() + 3 > next_poll_interval:
-                    logger.warning(
-                        "Too many value transfers to process, leaving some for the next iteration"
-                    )
-                    break
-
-            unprocessed_value_transfers = (
-                len(transactions_pool["value_transfer"])
-                - mapped_transactions
-                - queried_transactions
+            (
+                new_value_transfers,
+                cleaned_value_transfers,
+            ) = mempool_value_transfers.update(transactions_pool["value_transfer"])
+            value_transfer_fees = mempool_fees.process_transactions(
+                new_value_transfers, next_poll_interval - 3
             )
+            mempool_value_transfers.add_many(value_transfer_fees)
+
             logger.info(
-                f"Processed value transfers: {mapped_transactions} mapped, {queried_transactions} fetched, {unprocessed_value_transfers} left"
+                f"Processed value transfers: {len(transactions_pool['value_transfer']) - len(new_value_transfers)} mapped, {len(value_transfer_fees)} fetched, {len(new_value_transfers) - len(value_transfer_fees)} left, {cleaned_value_transfers} removed"
             )
 
-            if len(mapped_data_requests) > 0:
-                data_requests_fee = [dr[0] for dr in mapped_data_requests.values()]
-                data_requests_weight = [dr[1] for dr in mapped_data_requests.values()]
+            if len(mempool_data_requests) > 0:
+                data_requests_fee, data_requests_weight = (
+                    mempool_data_requests.get_columns()
+                )
                 self.mempool_database.insert_mempool_data_requests(
-                    timestamp, data_requests_fee, data_requests_weight
+                    timestamp, data_requests_fee.tolist(), data_requests_weight.tolist()
                 )
 
-            if len(mapped_value_transfers) > 0:
-                value_transfers_fee = [vt[0] for vt in mapped_value_transfers.values()]
-                value_transfers_weight = [
-                    vt[1] for vt in mapped_value_transfers.values()
-                ]
+            if len(mempool_value_transfers) > 0:
+                value_transfers_fee, value_transfers_weight = (
+                    mempool_value_transfers.get_columns()
+                )
                 self.mempool_database.insert_mempool_value_transfers(
-                    timestamp, value_transfers_fee, value_transfers_weight
+                    timestamp,
+                    value_transfers_fee.tolist(),
+                    value_transfers_weight.tolist(),
                 )
 
-            # Clean the map with already processed transactions
-            cleaned_data_requests = 0
-            for transaction in list(mapped_data_requests.keys()):
-                if transaction not in transactions_pool["data_request"]:
-                    cleaned_data_requests += 1
-                    del mapped_data_requests[transaction]
-
-            cleaned_value_transfers = 0
-            for transaction in list(mapped_value_transfers.keys()):
-                if transaction not in transactions_pool["value_transfer"]:
-                    cleaned_value_transfers += 1
-                    del mapped_value_transfers[transaction]
-
-            logger.info(
-                f"Cleanup of maps: removed {cleaned_data_requests} data requests ({len(mapped_data_requests)} left) and {cleaned_value_transfers} value transfers ({len(mapped_value_transfers)} left)"
-            )
-
             sleep_for = max(0, next_poll_interval - time.time())
             time.sleep(sleep_for)
 
+    def save_pending_hashes(self, logger, memcached_client, transactions_pool):
+        # Searching for an unknown hash only requires a set lookup instead of a mempool request to a node
+        # The hashes expire if they are not refreshed so the API falls back to querying a node
+        pending_hashes = {
+            "data_request": set(transactions_pool["data_request"]),
+            "value_transfer": set(transactions_pool["value_transfer"]),
+        }
+        try:
+            memcached_client.set(
+                "pending_hashes", pending_hashes, time=2 * self.mempool_interval
+            )
+            # The API marks a value it refreshed itself as stale after the saved expiry time, this one is fresh
+            memcached_client.delete("pending_hashes_expiry")
+        except pylibmc.Error as e:
+            logger.warning(f"Could not save pending hashes in memcached: {e}")
+
     def try_send_request(self, logger, caching_server, request):
         try:
             caching_server.send_request(request)
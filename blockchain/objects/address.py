@@ -16,6 +16,7 @@ class Address(object):
         database=None,
         witnet_node=None,
         logger=None,
+        consensus_constants=None,
         connect=True,
     ):
         # Set address
@@ -40,6 +41,9 @@ class Address(object):
         else:
             self.logger = None
 
+        # Consensus constants shared by the caller, only loaded from the database if none were passed
+        self.consensus_constants = consensus_constants
+
         # Finish connecting to database, witnet_node and get the consensus constants
         # Do not automatically initialize when the address object is used from the caching server
         if connect:
@@ -57,15 +61,16 @@ class Address(object):
             self.witnet_node = WitnetNode(self.config["node-pool"], logger=self.logger)
 
         # Save consensus constants
-        consensus_constants = ConsensusConstants(
-            database=self.db_mngr,
-            witnet_node=self.witnet_node,
-            error_retry=self.config["api"]["error_retry"],
-        )
-        self.start_time = consensus_constants.checkpoint_zero_timestamp
-        self.epoch_period = consensus_constants.checkpoints_period
-        self.halving_period = consensus_constants.halving_period
-        self.initial_block_reward = consensus_constants.initial_block_reward
+        if self.consensus_constants is None:
+            self.consensus_constants = ConsensusConstants(
+                database=self.db_mngr,
+                witnet_node=self.witnet_node,
+                error_retry=self.config["api"]["error_retry"],
+            )
+        self.start_time = self.consensus_constants.checkpoint_zero_timestamp
+        self.epoch_period = self.consensus_constants.checkpoints_period
+        self.halving_period = self.consensus_constants.halving_period
+        self.initial_block_reward = self.consensus_constants.initial_block_reward
 
     def close_connections(self):
         self.db_mngr.terminate()
@@ -94,18 +99,9 @@ class Address(object):
 
         # Get label
         label = ""
-        sql = (
-            """
-            SELECT
-                label
-            FROM
-                addresses
-            WHERE
-                address='%s'
-        """
-            % self.address
+        result = self.db_mngr.statement_return_one(
+            "address_label", parameters=[self.address]
         )
-        result = self.db_mngr.sql_return_one(sql)
         if result:
             label = result[0]
 
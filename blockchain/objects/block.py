@@ -10,6 +10,7 @@ from blockchain.transactions.tally import Tally
 from blockchain.transactions.value_transfer import ValueTransfer
 from node.witnet_node import WitnetNode
 from schemas.component.block_schema import BlockForApi, BlockForExplorer
+from schemas.registry import get_schema
 from util.database_manager import DatabaseManager
 
 
@@ -27,6 +28,7 @@ class Block(object):
         tapi_periods=None,
         witnet_node=None,
         node_config=None,
+        wip=None,
     ):
         self.block_hash = block_hash
         self.block_epoch = block_epoch
@@ -37,6 +39,9 @@ class Block(object):
         self.epoch_period = consensus_constants.checkpoints_period
         self.superblock_period = consensus_constants.superblock_period
 
+        # WIPs shared by the caller, passed to the transactions to encode them
+        self.wip = wip
+
         # Set up logger
         if logger:
             self.logger = logger
@@ -95,19 +100,9 @@ class Block(object):
                 return self.return_block_error("No database found to fetch block hash")
 
             # Fetch block hash from the database
-            sql = (
-                """
-                SELECT
-                    block_hash,
-                    epoch
-                FROM
-                    blocks
-                WHERE
-                    epoch=%s
-            """
-                % self.block_epoch
+            block_hash = self.database.statement_return_one(
+                "block_hash_for_epoch", parameters=[self.block_epoch]
             )
-            block_hash = self.database.sql_return_one(sql)
 
             if block_hash:
                 self.block_hash = block_hash[0].hex()
@@ -163,11 +158,11 @@ class Block(object):
 
         if call_from == "explorer":
             self.block_json["tapi"] = self.process_tapi_signals()
-            return BlockForExplorer().load(self.block_json)
+            return get_schema(BlockForExplorer).load(self.block_json)
 
         if call_from == "api":
             self.process_block_for_api()
-            return BlockForApi().load(self.block_json)
+            return get_schema(BlockForApi).load(self.block_json)
 
     def process_block_for_api(self):
         transactions = self.block_json["transactions"]
@@ -233,6 +228,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     witnet_node=self.witnet_node,
+                    wip=self.wip,
                 )
             else:
                 value_transfer = ValueTransfer(
@@ -240,6 +236,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     node_config=self.node_config,
+                    wip=self.wip,
                 )
             for i, (txn_hash, txn_weight) in enumerate(
                 zip(
@@ -265,6 +262,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     witnet_node=self.witnet_node,
+                    wip=self.wip,
                 )
             else:
                 data_request = DataRequest(
@@ -272,6 +270,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     node_config=self.node_config,
+                    wip=self.wip,
                 )
             for i, (txn_hash, txn_weight) in enumerate(
                 zip(
@@ -297,6 +296,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     witnet_node=self.witnet_node,
+                    wip=self.wip,
                 )
             else:
                 commit = Commit(
@@ -304,6 +304,7 @@ class Block(object):
                     logger=self.logger,
                     database=self.database,
                     node_config=self.node_config,
+                    wip=self.wip,
                 )
             for i, txn_hash in enumerate(self.block["txns_hashes"]["commit"]):
                 json_txn = self.block["txns"]["commit_txns"][i]
@@ -6,6 +6,7 @@ from blockchain.transactions.data_request import (
     translate_reducer,
 )
 from blockchain.transactions.tally import translate_tally
+from schemas.registry import get_schema
 from schemas.search.data_request_history_schema import (
     DataRequestHistory as DataRequestHistorySchema,
 )
@@ -249,4 +250,4 @@ class DataRequestHistory(object):
                 "tally": data_request["tally"],
             }
 
-        return count, DataRequestHistorySchema().load(return_value)
+        return count, get_schema(DataRequestHistorySchema).load(return_value)
@@ -1,10 +1,13 @@
 import logging
 import logging.handlers
 
+from marshmallow import ValidationError
+
 from blockchain.transactions.commit import Commit
 from blockchain.transactions.data_request import DataRequest
 from blockchain.transactions.reveal import Reveal
 from blockchain.transactions.tally import Tally
+from schemas.registry import get_schema
 from schemas.search.data_request_report_schema import (
     DataRequestReport as DataRequestReportSchema,
 )
@@ -84,6 +87,20 @@ class DataRequestReport(object):
             self.logger.info(f"data_request, get_report({data_request_hash})")
         return data_request_hash
 
+    def get_saved_report(self, data_request_hash):
+        # Confirmed data request reports are saved by the caching job and do not change anymore
+        result = self.database.statement_return_one(
+            "saved_data_request_report",
+            parameters=[bytearray.fromhex(data_request_hash)],
+        )
+
+        if result:
+            report = result[0]
+            report["transaction_type"] = self.transaction_type
+            return report
+        else:
+            return None
+
     def get_report(self):
         self.data_request_hash = self.get_data_request_hash()
 
@@ -102,6 +119,9 @@ class DataRequestReport(object):
         self.get_reveal_details()
         self.get_tally_details()
 
+        return self.build_report()
+
+    def build_report(self):
         # Add empty reveals for all commits that did not have a matching reveal
         self.add_missing_reveals()
         # Sort commit, reveals and tally by address
@@ -110,7 +130,7 @@ class DataRequestReport(object):
         self.mark_errors()
         self.mark_liars()
 
-        return DataRequestReportSchema().load(
+        return get_schema(DataRequestReportSchema).load(
             {
                 "transaction_type": self.transaction_type,
                 "data_request": self.data_request,
@@ -204,3 +224,68 @@ class DataRequestReport(object):
             for reveal in self.reveals:
                 if self.tally and reveal["address"] in self.tally["liar_addresses"]:
                     reveal["liar"] = True
+
+
+def get_data_request_reports(
+    data_request_hashes,
+    consensus_constants,
+    logger=None,
+    database=None,
+):
+    # Fetch the data requests, commits, reveals and tallies of all reports at once
+    # instead of running four queries per data request
+    data_requests = DataRequest(
+        consensus_constants, logger=logger, database=database
+    ).get_transactions_from_database(data_request_hashes)
+    commits = Commit(
+        consensus_constants, logger=logger, database=database
+    ).get_commits_for_data_requests(data_request_hashes)
+    reveals = Reveal(
+        consensus_constants, logger=logger, database=database
+    ).get_reveals_for_data_requests(data_request_hashes)
+    tallies = Tally(
+        consensus_constants, logger=logger, database=database
+    ).get_tallies_for_data_requests(data_request_hashes)
+
+    reports = {}
+    for data_request_hash in data_request_hashes:
+        if "error" in data_requests[data_request_hash]:
+            reports[data_request_hash] = data_requests[data_request_hash]
+            continue
+
+        # Skip data requests of which a commit, reveal or tally could not be validated
+        invalid = [
+            transactions[data_request_hash]
+            for transactions in (commits, reveals, tallies)
+            if isinstance(transactions[data_request_hash], dict)
+            and "error" in transactions[data_request_hash]
+        ]
+        if len(invalid) > 0:
+            reports[data_request_hash] = invalid[0]
+            continue
+
+        report = DataRequestReport(
+            "data_request",
+            data_request_hash,
+            consensus_constants,
+            logger=logger,
+            database=database,
+        )
+        report.data_request_hash = data_request_hash
+        report.data_request = data_requests[data_request_hash]
+        report.commits = commits[data_request_hash]
+        report.reveals = reveals[data_request_hash]
+        report.tally = tallies[data_request_hash]
+
+        try:
+            reports[data_request_hash] = report.build_report()
+        except ValidationError as err_info:
+            if logger:
+                logger.error(
+                    f"Could not validate data request report {data_request_hash}: {err_info}"
+                )
+            reports[data_request_hash] = {
+                "error": "could not validate data request report"
+            }
+
+    return reports
@@ -0,0 +1,349 @@
+from blockchain.transactions.data_request import (
+    build_retrieval,
+    translate_filters,
+    translate_reducer,
+)
+from blockchain.transactions.reveal import translate_reveal
+from blockchain.transactions.tally import translate_tally
+from schemas.component.block_schema import BlockForApi
+from schemas.registry import get_schema
+
+
+class DatabaseBlock(object):
+    """
+    Build the API representation of a block from the blocks and *_txns tables.
+
+    Every transaction table has an index on its epoch column, so a block can be
+    assembled with one query per transaction type without contacting a node. Rows
+    are ordered on the position of the transaction in the block, which the
+    explorer stores when inserting it. Blocks inserted before the position was
+    stored are not built from the database.
+    """
+
+    def __init__(self, consensus_constants, logger=None, database=None):
+        # Copy relevant consensus constants
+        self.start_time = consensus_constants.checkpoint_zero_timestamp
+        self.epoch_period = consensus_constants.checkpoints_period
+        self.collateral_minimum = consensus_constants.collateral_minimum
+
+        self.logger = logger
+        self.database = database
+
+    def get_block(self, block_hash="", block_epoch=-1):
+        """
+        Return the validated API block or None if it was not (fully) inserted yet,
+        in which case the caller should fall back to fetching it from a node.
+        """
+        details = self.get_details(block_hash, block_epoch)
+        if details is None:
+            return None
+        details, counts = details
+
+        epoch = details["epoch"]
+        mint = self.get_mint(epoch)
+        value_transfers = self.get_value_transfers(epoch)
+        data_requests = self.get_data_requests(epoch)
+        commits = self.get_commits(epoch)
+        reveals = self.get_reveals(epoch)
+        tallies = self.get_tallies(epoch)
+
+        transactions = [value_transfers, data_requests, commits, reveals, tallies]
+        if mint is None or any(txns is None for txns in transactions):
+            return None
+
+        # The transactions of a block are inserted together with the block, but
+        # check their counts to never return a partial block
+        found = [len(txns) for txns in transactions]
+        if found != counts:
+            if self.logger:
+                self.logger.warning(
+                    f"Found {found} instead of {counts} transactions for block {details['hash']} in the database"
+                )
+            return None
+
+        return get_schema(BlockForApi).load(
+            {
+                "details": details,
+                "transactions": {
+                    "mint": mint,
+                    "value_transfer": value_transfers,
+                    "data_request": data_requests,
+                    "commit": group_by_data_request(commits),
+                    "reveal": group_by_data_request(reveals),
+                    "tally": tallies,
+                    "number_of_commits": len(commits),
+                    "number_of_reveals": len(reveals),
+                },
+            }
+        )
+
+    def get_details(self, block_hash, block_epoch):
+        if block_hash == "" and block_epoch == -1:
+            return None
+
+        if block_hash != "":
+            statement = "block_details_for_hash"
+            parameters = [bytearray.fromhex(block_hash)]
+        else:
+            statement = "block_details_for_epoch"
+            parameters = [block_epoch]
+        result = self.database.statement_return_one(statement, parameters=parameters)
+
+        if not result:
+            return None
+
+        (
+            block_hash,
+            value_transfer,
+            data_request,
+            commit,
+            reveal,
+            tally,
+            dr_weight,
+            vt_weight,
+            block_weight,
+            epoch,
+            confirmed,
+            reverted,
+        ) = result
+
+        details = {
+            "hash": block_hash.hex(),
+            "epoch": epoch,
+            "timestamp": self.start_time + (epoch + 1) * self.epoch_period,
+            "data_request_weight": dr_weight,
+            "value_transfer_weight": vt_weight,
+            "weight": block_weight,
+            "confirmed": confirmed,
+            "reverted": bool(reverted),
+        }
+        counts = [value_transfer, data_request, commit, reveal, tally]
+
+        return details, counts
+
+    def get_mint(self, epoch):
+        result = self.database.statement_return_one("block_mint", parameters=[epoch])
+
+        if not result:
+            return None
+
+        txn_hash, miner, output_addresses, output_values = result
+        return {
+            "hash": txn_hash.hex(),
+            "epoch": epoch,
+            "miner": miner,
+            "output_addresses": output_addresses,
+            "output_values": output_values,
+        }
+
+    def get_value_transfers(self, epoch):
+        result = ordered_rows(
+            self.database.statement_return_all(
+                "block_value_transfers", parameters=[epoch]
+            )
+        )
+
+        if result is None:
+            return None
+
+        value_transfers = []
+        for (
+            txn_hash,
+            input_addresses,
+            input_values,
+            output_addresses,
+            output_values,
+            weight,
+        ) in result:
+            fee = sum(input_values) - sum(output_values) if sum(input_values) > 0 else 0
+
+            # Output values which are not sent back to one of the input addresses
+            true_value = sum(
+                value
+                for address, value in zip(output_addresses, output_values)
+                if address not in input_addresses
+            )
+
+            value_transfers.append(
+                {
+                    "hash": txn_hash.hex(),
+                    "epoch": epoch,
+                    "timestamp": self.start_time + (epoch + 1) * self.epoch_period,
+                    "unique_input_addresses": list(set(input_addresses)),
+                    "true_output_addresses": list(
+                        set(output_addresses) - set(input_addresses)
+                    ),
+                    "true_value": true_value,
+                    "fee": fee,
+                    "weight": weight,
+                    "priority": max(1, int(fee / weight)),
+                }
+            )
+
+        return value_transfers
+
+    def get_data_requests(self, epoch):
+        result = ordered_rows(
+            self.database.statement_return_all(
+                "block_data_requests",
+                parameters=[epoch],
+                custom_types=["filter"],
+            )
+        )
+
+        if result is None:
+            return None
+
+        data_requests = []
+        for (
+            txn_hash,
+            input_addresses,
+            input_values,
+            output_value,
+            witnesses,
+            witness_reward,
+            collateral,
+            consensus_percentage,
+            commit_and_reveal_fee,
+            weight,
+            kinds,
+            urls,
+            all_headers,
+            bodies,
+            scripts,
+            aggregate_filters,
+            aggregate_reducer,
+            tally_filters,
+            tally_reducer,
+            RAD_bytes_hash,
+            DRO_bytes_hash,
+        ) in result:
+            # Same fee calculation as DataRequest.calculate_fees
+            dro_fee = witnesses * (witness_reward + 2 * commit_and_reveal_fee) + 1
+            miner_fee = sum(input_values) - (output_value or 0) - dro_fee
+
+            retrieval = build_retrieval(kinds, urls, all_headers, bodies, scripts)
+
+            data_requests.append(
+                {
+                    "hash": txn_hash.hex(),
+                    "epoch": epoch,
+                    "input_addresses": list(set(input_addresses)),
+                    "witnesses": witnesses,
+                    "witness_reward": witness_reward,
+                    "commit_and_reveal_fee": commit_and_reveal_fee,
+                    "consensus_percentage": consensus_percentage,
+                    "dro_fee": dro_fee,
+                    "miner_fee": miner_fee,
+                    "collateral": max(self.collateral_minimum, collateral),
+                    "RAD_bytes_hash": RAD_bytes_hash.hex(),
+                    "DRO_bytes_hash": DRO_bytes_hash.hex(),
+                    "weight": weight,
+                    "kinds": [retrieve["kind"] for retrieve in retrieval],
+                    "urls": [retrieve["url"] for retrieve in retrieval],
+                    "headers": [retrieve["headers"] for retrieve in retrieval],
+                    "bodies": [retrieve["body"] for retrieve in retrieval],
+                    "scripts": [retrieve["script"] for retrieve in retrieval],
+                    "aggregate_filters": translate_filters(aggregate_filters),
+                    "aggregate_reducer": translate_reducer(aggregate_reducer),
+                    "tally_filters": translate_filters(tally_filters),
+                    "tally_reducer": translate_reducer(tally_reducer),
+                }
+            )
+
+        return data_requests
+
+    def get_commits(self, epoch):
+        result = ordered_rows(
+            self.database.statement_return_all("block_commits", parameters=[epoch])
+        )
+
+        if result is None:
+            return None
+
+        return [
+            {
+                "hash": txn_hash.hex(),
+                "epoch": epoch,
+                "address": address,
+                "collateral": sum(input_values) - (output_value or 0),
+                "data_request": data_request.hex(),
+            }
+            for txn_hash, address, input_values, output_value, data_request in result
+        ]
+
+    def get_reveals(self, epoch):
+        result = ordered_rows(
+            self.database.statement_return_all("block_reveals", parameters=[epoch])
+        )
+
+        if result is None:
+            return None
+
+        reveals = []
+        for txn_hash, address, data_request, reveal, success in result:
+            _, translation = translate_reveal(txn_hash.hex(), reveal)
+            reveals.append(
+                {
+                    "hash": txn_hash.hex(),
+                    "epoch": epoch,
+                    "address": address,
+                    "data_request": data_request.hex(),
+                    "reveal": translation,
+                    "success": success,
+                }
+            )
+
+        return reveals
+
+    def get_tallies(self, epoch):
+        result = ordered_rows(
+            self.database.statement_return_all("block_tallies", parameters=[epoch])
+        )
+
+        if result is None:
+            return None
+
+        tallies = []
+        for (
+            txn_hash,
+            output_addresses,
+            output_values,
+            data_request,
+            error_addresses,
+            liar_addresses,
+            tally,
+            success,
+        ) in result:
+            _, translation = translate_tally(txn_hash.hex(), tally)
+            tallies.append(
+                {
+                    "hash": txn_hash.hex(),
+                    "epoch": epoch,
+                    "output_addresses": output_addresses,
+                    "output_values": output_values,
+                    "data_request": data_request.hex(),
+                    "num_error_addresses": len(error_addresses),
+                    "num_liar_addresses": len(liar_addresses),
+                    "tally": translation,
+                    "success": success,
+                }
+            )
+
+        return tallies
+
+
+def group_by_data_request(transactions):
+    grouped = {}
+    for transaction in transactions:
+        if transaction["data_request"] not in grouped:
+            grouped[transaction["data_request"]] = []
+        grouped[transaction["data_request"]].append(transaction)
+    return grouped
+
+
+def ordered_rows(rows):
+    # Transactions inserted without their position cannot be ordered as in the block
+    if rows is None or any(row[-1] is None for row in rows):
+        return None
+    return [row[:-1] for row in rows]
@@ -0,0 +1,308 @@
+import concurrent.futures
+import time
+from collections import OrderedDict
+
+import numpy
+from psycopg.sql import SQL, Identifier
+
+from util.data_transformer import re_sql
+
+
+class MempoolFees(object):
+    def __init__(
+        self,
+        witnet_node,
+        database,
+        logger=None,
+        fetch_threads=1,
+        batch_size=64,
+        output_cache_size=100000,
+    ):
+        # The witnet node should be a WitnetClientPool so transactions can be fetched concurrently
+        self.witnet_node = witnet_node
+        self.database = database
+
+        self.logger = logger
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=fetch_threads)
+        self.batch_size = batch_size
+
+        # Recently seen transaction outputs: transaction hash -> list of output values
+        self.output_cache = OrderedDict()
+        self.output_cache_size = output_cache_size
+
+    def terminate(self):
+        self.executor.shutdown(wait=False)
+
+    # Return a dictionary mapping transaction hashes to a (fee, weight) tuple
+    # Transactions which could not be fetched or resolved before the deadline are skipped
+    def process_transactions(self, txn_hashes, deadline):
+        json_txns = self.fetch_transactions(txn_hashes, deadline)
+
+        # Cache the outputs of the pending transactions since they can be spent by other pending transactions
+        for txn_hash, json_txn in json_txns.items():
+            transaction_type, transaction = get_transaction_body(json_txn)
+            self.cache_outputs(
+                txn_hash, [output["value"] for output in transaction["outputs"]]
+            )
+
+        self.resolve_outputs(
+            set(
+                output_pointer.split(":")[0]
+                for json_txn in json_txns.values()
+                for output_pointer in get_output_pointers(json_txn)
+            ),
+            deadline,
+        )
+
+        fees = {}
+        for txn_hash, json_txn in json_txns.items():
+            # Weights should never be zero, but calculating a priority would fail
+            if json_txn["weight"] == 0:
+                continue
+
+            input_values = self.get_input_values(json_txn)
+            if input_values is None:
+                if self.logger:
+                    self.logger.info(
+                        f"Could not resolve all inputs for transaction {txn_hash}"
+                    )
+                continue
+
+            fees[txn_hash] = (calculate_fee(json_txn, input_values), json_txn["weight"])
+
+        return fees
+
+    def fetch_transactions(self, txn_hashes, deadline):
+        json_txns = {}
+        for i in range(0, len(txn_hashes), self.batch_size):
+            if time.time() > deadline:
+                if self.logger:
+                    self.logger.warning(
+                        f"Fetched {len(json_txns)} out of {len(txn_hashes)} transactions, leaving the remainder for the next iteration"
+                    )
+                break
+
+            batch = txn_hashes[i : i + self.batch_size]
+            results = self.executor.map(self.witnet_node.get_transaction, batch)
+            for txn_hash, result in zip(batch, results):
+                if type(result) is dict and "error" in result:
+                    if self.logger:
+                        self.logger.warning(
+                            f"Could not fetch transaction {txn_hash}: {result['error']}"
+                        )
+                    continue
+                json_txns[txn_hash] = result["result"]
+
+        return json_txns
+
+    def cache_outputs(self, txn_hash, output_values):
+        self.output_cache[txn_hash] = output_values
+        self.output_cache.move_to_end(txn_hash)
+        while len(self.output_cache) > self.output_cache_size:
+            self.output_cache.popitem(last=False)
+
+    def resolve_outputs(self, txn_hashes, deadline):
+        missing = [
+            txn_hash for txn_hash in txn_hashes if txn_hash not in self.output_cache
+        ]
+        if len(missing) == 0:
+            return
+
+        # First try to find all missing outputs with a handful of queries
+        self.fetch_outputs_from_database(missing)
+
+        # Fall back to querying the node for outputs which were not inserted in the database (yet)
+        missing = [
+            txn_hash for txn_hash in missing if txn_hash not in self.output_cache
+        ]
+        if len(missing) > 0:
+            if self.logger:
+                self.logger.info(
+                    f"Could not find outputs of {len(missing)} transactions in the database"
+                )
+            self.fetch_outputs_from_node(missing, deadline)
+
+    def fetch_outputs_from_database(self, txn_hashes):
+        sql = """
+            SELECT
+                hash,
+                type
+            FROM
+                hashes
+            WHERE
+                hash = ANY(%s)
+        """
+        hash_types = self.database.sql_return_all(
+            re_sql(sql), parameters=[[bytearray.fromhex(h) for h in txn_hashes]]
+        )
+        if not hash_types:
+            return
+
+        hashes_per_type = {}
+        for hash_bytes, hash_type in hash_types:
+            if hash_type not in hashes_per_type:
+                hashes_per_type[hash_type] = []
+            hashes_per_type[hash_type].append(hash_bytes)
+
+        sql = """
+            SELECT
+                txn_hash,
+                {column_name}
+            FROM
+                {table_name}
+            WHERE
+                txn_hash = ANY(%s)
+        """
+        for hash_type, hashes in hashes_per_type.items():
+            if hash_type in ("data_request_txn", "commit_txn"):
+                column_name = "output_value"
+            elif hash_type in ("mint_txn", "value_transfer_txn", "tally_txn"):
+                column_name = "output_values"
+            else:
+                continue
+
+            outputs = self.database.sql_return_all(
+                SQL(re_sql(sql)).format(
+                    column_name=Identifier(column_name),
+                    table_name=Identifier(f"{hash_type}s"),
+                ),
+                parameters=[hashes],
+            )
+            if not outputs:
+                continue
+
+            for txn_hash, output_values in outputs:
+                if column_name == "output_value":
+                    output_values = [output_values]
+                self.cache_outputs(txn_hash.hex(), output_values)
+
+    def fetch_outputs_from_node(self, txn_hashes, deadline):
+        json_txns = self.fetch_transactions(txn_hashes, deadline)
+        for txn_hash, json_txn in json_txns.items():
+            transaction_type, transaction = get_transaction_body(json_txn)
+            if transaction_type not in (
+                "Mint",
+                "ValueTransfer",
+                "DataRequest",
+                "Commit",
+                "Tally",
+            ):
+                if self.logger:
+                    self.logger.error(
+                        f"Unexpected transaction type {transaction_type} when resolving inputs"
+                    )
+                continue
+            self.cache_outputs(
+                txn_hash, [output["value"] for output in transaction["outputs"]]
+            )
+
+    def get_input_values(self, json_txn):
+        input_values = []
+        for output_pointer in get_output_pointers(json_txn):
+            input_hash, input_index = output_pointer.split(":")
+            if input_hash not in self.output_cache:
+                return None
+            output_values = self.output_cache[input_hash]
+            if int(input_index) >= len(output_values):
+                return None
+            input_values.append(output_values[int(input_index)])
+        return input_values
+
+
+class MempoolTracker(object):
+    def __init__(self, initial_size=1024):
+        # Transaction hash -> index in the fee and weight columns
+        self.slots = {}
+        # Index in the fee and weight columns -> transaction hash
+        self.hashes = []
+
+        self.fees = numpy.zeros(initial_size, dtype=numpy.int64)
+        self.weights = numpy.zeros(initial_size, dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, txn_hash):
+        return txn_hash in self.slots
+
+    # Diff the tracked transactions against the current transaction pool
+    # Transactions which left the pool are removed, the hashes which are not tracked yet are returned
+    def update(self, txn_hashes):
+        pool = set(txn_hashes)
+
+        removed = self.slots.keys() - pool
+        for txn_hash in removed:
+            self.remove(txn_hash)
+
+        new = [txn_hash for txn_hash in txn_hashes if txn_hash not in self.slots]
+
+        return new, len(removed)
+
+    def add(self, txn_hash, fee, weight):
+        if txn_hash in self.slots:
+            index = self.slots[txn_hash]
+        else:
+            index = len(self.hashes)
+            if index == len(self.fees):
+                self.fees = numpy.resize(self.fees, 2 * len(self.fees))
+                self.weights = numpy.resize(self.weights, 2 * len(self.weights))
+            self.slots[txn_hash] = index
+            self.hashes.append(txn_hash)
+
+        self.fees[index] = fee
+        self.weights[index] = weight
+
+    def add_many(self, fees):
+        for txn_hash, (fee, weight) in fees.items():
+            self.add(txn_hash, fee, weight)
+
+    # Move the last transaction into the slot of the removed one to keep the columns contiguous
+    def remove(self, txn_hash):
+        index = self.slots.pop(txn_hash)
+        last_hash = self.hashes.pop()
+        last_index = len(self.hashes)
+
+        if index != last_index:
+            self.hashes[index] = last_hash
+            self.slots[last_hash] = index
+            self.fees[index] = self.fees[last_index]
+            self.weights[index] = self.weights[last_index]
+
+    # Return views on the fee and weight columns of the tracked transactions
+    def get_columns(self):
+        return self.fees[: len(self.hashes)], self.weights[: len(self.hashes)]
+
+
+# Mint and tally transactions do not have a body, the other transaction types do
+def get_transaction_body(json_txn):
+    transaction_type = list(json_txn["transaction"].keys())[0]
+    transaction = json_txn["transaction"][transaction_type]
+    if "body" in transaction:
+        transaction = transaction["body"]
+    return transaction_type, transaction
+
+
+def get_output_pointers(json_txn):
+    _, transaction = get_transaction_body(json_txn)
+    return [txn_input["output_pointer"] for txn_input in transaction["inputs"]]
+
+
+# Calculate the fee of a value transfer or the miner fee of a data request
+# This mirrors the fee calculations in ValueTransfer and DataRequest without processing the full transaction
+def calculate_fee(json_txn, input_values):
+    transaction_type, transaction = get_transaction_body(json_txn)
+    output_value = sum(output["value"] for output in transaction["outputs"])
+
+    if transaction_type == "DataRequest":
+        dr_output = transaction["dr_output"]
+        dro_fee = (
+            dr_output["witnesses"]
+            * (dr_output["witness_reward"] + 2 * dr_output["commit_and_reveal_fee"])
+            + 1
+        )
+        return sum(input_values) - output_value - dro_fee
+
+    if sum(input_values) > 0:
+        return sum(input_values) - output_value
+    return 0
@@ -1,9 +1,12 @@
-from blockchain.transactions.transaction import Transaction
+from marshmallow import ValidationError
+
+from blockchain.transactions.transaction import Transaction, group_rows_by_hash
 from schemas.component.commit_schema import (
     CommitTransactionForApi,
     CommitTransactionForBlock,
     CommitTransactionForExplorer,
 )
+from schemas.registry import get_schema
 
 
 class Commit(Transaction):
@@ -35,9 +38,9 @@ class Commit(Transaction):
                 self.txn_details["output_value"] = output_values[0]
             else:
                 self.txn_details["output_value"] = None
-            return CommitTransactionForExplorer().load(self.txn_details)
+            return get_schema(CommitTransactionForExplorer).load(self.txn_details)
         else:
-            return CommitTransactionForBlock().load(self.txn_details)
+            return get_schema(CommitTransactionForBlock).load(self.txn_details)
 
     def get_data_request_hash(self, txn_hash):
         sql = """
@@ -88,6 +91,51 @@ class Commit(Transaction):
         if results is None:
             return []
 
+        return self.process_commits(results)
+
+    def get_commits_for_data_requests(self, data_request_hashes):
+        sql = """
+            SELECT
+                commit_txns.data_request,
+                blocks.block_hash,
+                blocks.confirmed,
+                blocks.reverted,
+                commit_txns.txn_hash,
+                commit_txns.txn_address,
+                commit_txns.epoch
+            FROM
+                commit_txns
+            LEFT JOIN
+                blocks
+            ON
+                commit_txns.epoch=blocks.epoch
+            WHERE
+                commit_txns.data_request = ANY(%s)
+            ORDER BY
+                commit_txns.epoch
+            DESC
+        """
+        results = self.database.sql_return_all(
+            sql,
+            parameters=[[bytearray.fromhex(h) for h in data_request_hashes]],
+        )
+
+        commits = {}
+        for data_request_hash, rows in group_rows_by_hash(
+            data_request_hashes, results
+        ).items():
+            # An invalid transaction only fails the data request it belongs to
+            try:
+                commits[data_request_hash] = self.process_commits(rows)
+            except ValidationError as err_info:
+                if self.logger:
+                    self.logger.error(
+                        f"Could not validate commits for data request {data_request_hash}: {err_info}"
+                    )
+                commits[data_request_hash] = {"error": "could not validate transaction"}
+        return commits
+
+    def process_commits(self, results):
         commits = []
         confirmed_epoch = 0
         found_confirmed, found_mined = False, False
@@ -189,7 +237,7 @@ class Commit(Transaction):
 
             txn_time = self.start_time + (epoch + 1) * self.epoch_period
 
-            return CommitTransactionForApi().load(
+            return get_schema(CommitTransactionForApi).load(
                 {
                     "hash": txn_hash,
                     "block": block_hash.hex(),
@@ -1,13 +1,15 @@
 import re
 
 import cbor2
+from marshmallow import ValidationError
 
-from blockchain.transactions.transaction import Transaction
+from blockchain.transactions.transaction import Transaction, group_rows_by_hash
 from schemas.component.data_request_schema import (
     DataRequestTransactionForApi,
     DataRequestTransactionForBlock,
     DataRequestTransactionForExplorer,
 )
+from schemas.registry import get_schema
 from util.common_functions import calculate_priority
 from util.radon_translator import RadonTranslator
 
@@ -142,7 +144,7 @@ class DataRequest(Transaction):
             else:
                 self.txn_details["tally_filters"] = []
 
-            return DataRequestTransactionForExplorer().load(self.txn_details)
+            return get_schema(DataRequestTransactionForExplorer).load(self.txn_details)
 
         if call_from == "api":
             # Only keep a list of unique input addresses
@@ -207,7 +209,7 @@ class DataRequest(Transaction):
                 self.txn_details["tally_reducer"]
             )
 
-            return DataRequestTransactionForBlock().load(self.txn_details)
+            return get_schema(DataRequestTransactionForBlock).load(self.txn_details)
 
     def get_bytecode_hashes(self):
         RAD_bytes_hash, _ = self.protobuf_encoder.get_RAD_bytecode(
@@ -262,6 +264,72 @@ class DataRequest(Transaction):
             custom_types=["utxo", "filter"],
         )
 
+        return self.process_database_transaction(data_request_hash, result)
+
+    def get_transactions_from_database(self, data_request_hashes):
+        sql = """
+            SELECT
+                data_request_txns.txn_hash,
+                blocks.block_hash,
+                blocks.epoch,
+                blocks.confirmed,
+                blocks.reverted,
+                data_request_txns.DRO_bytes_hash,
+                data_request_txns.RAD_bytes_hash,
+                data_request_txns.input_addresses,
+                data_request_txns.input_values,
+                data_request_txns.input_utxos,
+                data_request_txns.output_value,
+                data_request_txns.witnesses,
+                data_request_txns.witness_reward,
+                data_request_txns.collateral,
+                data_request_txns.consensus_percentage,
+                data_request_txns.commit_and_reveal_fee,
+                data_request_txns.weight,
+                data_request_txns.kinds,
+                data_request_txns.urls,
+                data_request_txns.headers,
+                data_request_txns.bodies,
+                data_request_txns.scripts,
+                data_request_txns.aggregate_filters,
+                data_request_txns.aggregate_reducer,
+                data_request_txns.tally_filters,
+                data_request_txns.tally_reducer
+            FROM
+                data_request_txns
+            LEFT JOIN
+                blocks
+            ON
+                data_request_txns.epoch=blocks.epoch
+            WHERE
+                data_request_txns.txn_hash = ANY(%s)
+        """
+        results = self.database.sql_return_all(
+            sql,
+            parameters=[[bytearray.fromhex(h) for h in data_request_hashes]],
+            custom_types=["utxo", "filter"],
+        )
+
+        data_requests = {}
+        for data_request_hash, rows in group_rows_by_hash(
+            data_request_hashes, results
+        ).items():
+            # Only process the first row, like the LIMIT 1 for a single data request
+            try:
+                data_requests[data_request_hash] = self.process_database_transaction(
+                    data_request_hash, rows[0] if len(rows) > 0 else None
+                )
+            except ValidationError as err_info:
+                if self.logger:
+                    self.logger.error(
+                        f"Could not validate data request {data_request_hash}: {err_info}"
+                    )
+                data_requests[data_request_hash] = {
+                    "error": "could not validate transaction"
+                }
+        return data_requests
+
+    def process_database_transaction(self, data_request_hash, result):
         if result:
             (
                 block_hash,
@@ -330,7 +398,7 @@ class DataRequest(Transaction):
 
             txn_time = self.start_time + (block_epoch + 1) * self.epoch_period
 
-            return DataRequestTransactionForApi().load(
+            return get_schema(DataRequestTransactionForApi).load(
                 {
                     "hash": data_request_hash,
                     "RAD_bytes_hash": RAD_bytes_hash.hex(),
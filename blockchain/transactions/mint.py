@@ -3,6 +3,7 @@ from schemas.component.mint_schema import (
     MintTransactionForApi,
     MintTransactionForExplorer,
 )
+from schemas.registry import get_schema
 
 
 class Mint(Transaction):
@@ -16,7 +17,7 @@ class Mint(Transaction):
         self.txn_details["output_addresses"] = output_addresses
         self.txn_details["output_values"] = output_values
 
-        return MintTransactionForExplorer().load(self.txn_details)
+        return get_schema(MintTransactionForExplorer).load(self.txn_details)
 
     def get_transaction_from_database(self, txn_hash):
         sql = """
@@ -59,7 +60,7 @@ class Mint(Transaction):
             txn_epoch = epoch
             txn_time = self.start_time + (epoch + 1) * self.epoch_period
 
-            return MintTransactionForApi().load(
+            return get_schema(MintTransactionForApi).load(
                 {
                     "hash": txn_hash,
                     "block": block_hash,
@@ -1,13 +1,15 @@
 import json
 
 import cbor2
+from marshmallow import ValidationError
 
-from blockchain.transactions.transaction import Transaction
+from blockchain.transactions.transaction import Transaction, group_rows_by_hash
 from schemas.component.reveal_schema import (
     RevealTransactionForApi,
     RevealTransactionForBlock,
     RevealTransactionForExplorer,
 )
+from schemas.registry import get_schema
 from util.radon_translator import RadonTranslator
 
 
@@ -31,12 +33,12 @@ class Reveal(Transaction):
         if call_from == "explorer":
             self.txn_details["reveal"] = bytearray(self.json_txn["body"]["reveal"])
 
-            return RevealTransactionForExplorer().load(self.txn_details)
+            return get_schema(RevealTransactionForExplorer).load(self.txn_details)
 
         if call_from == "api":
             self.txn_details["reveal"] = reveal_translation
 
-            return RevealTransactionForBlock().load(self.txn_details)
+            return get_schema(RevealTransactionForBlock).load(self.txn_details)
 
     def get_data_request_hash(self, txn_hash):
         sql = """
@@ -88,6 +90,52 @@ class Reveal(Transaction):
         if results is None:
             return []
 
+        return self.process_reveals(results)
+
+    def get_reveals_for_data_requests(self, data_request_hashes):
+        sql = """
+            SELECT
+                reveal_txns.data_request,
+                blocks.block_hash,
+                blocks.confirmed,
+                blocks.reverted,
+                reveal_txns.txn_hash,
+                reveal_txns.txn_address,
+                reveal_txns.result,
+                reveal_txns.epoch
+            FROM
+                reveal_txns
+            LEFT JOIN
+                blocks
+            ON
+                reveal_txns.epoch=blocks.epoch
+            WHERE
+                reveal_txns.data_request = ANY(%s)
+            ORDER BY
+                reveal_txns.epoch
+            DESC
+        """
+        results = self.database.sql_return_all(
+            sql,
+            parameters=[[bytearray.fromhex(h) for h in data_request_hashes]],
+        )
+
+        reveals = {}
+        for data_request_hash, rows in group_rows_by_hash(
+            data_request_hashes, results
+        ).items():
+            # An invalid transaction only fails the data request it belongs to
+            try:
+                reveals[data_request_hash] = self.process_reveals(rows)
+            except ValidationError as err_info:
+                if self.logger:
+                    self.logger.error(
+                        f"Could not validate reveals for data request {data_request_hash}: {err_info}"
+                    )
+                reveals[data_request_hash] = {"error": "could not validate transaction"}
+        return reveals
+
+    def process_reveals(self, results):
         reveals = []
         found_confirmed, found_mined = False, False
         for reveal in results:
@@ -172,7 +220,7 @@ class Reveal(Transaction):
 
             success, reveal_result = translate_reveal(txn_hash, reveal_result)
 
-            return RevealTransactionForApi().load(
+            return get_schema(RevealTransactionForApi).load(
                 {
                     "hash": txn_hash,
                     "block": block_hash.hex(),
@@ -1,13 +1,15 @@
 import json
 
 import cbor2
+from marshmallow import ValidationError
 
-from blockchain.transactions.transaction import Transaction
+from blockchain.transactions.transaction import Transaction, group_rows_by_hash
 from schemas.component.tally_schema import (
     TallyTransactionForApi,
     TallyTransactionForBlock,
     TallyTransactionForExplorer,
 )
+from schemas.registry import get_schema
 from util.radon_translator import RadonTranslator
 
 
@@ -35,7 +37,7 @@ class Tally(Transaction):
             )
             self.txn_details["tally"] = bytearray(self.json_txn["tally"])
 
-            return TallyTransactionForExplorer().load(self.txn_details)
+            return get_schema(TallyTransactionForExplorer).load(self.txn_details)
 
         if call_from == "api":
             self.txn_details["num_error_addresses"] = len(
@@ -49,7 +51,7 @@ class Tally(Transaction):
             )
             self.txn_details["tally"] = tally_translation
 
-            return TallyTransactionForBlock().load(self.txn_details)
+            return get_schema(TallyTransactionForBlock).load(self.txn_details)
 
     def get_data_request_hash(self, txn_hash):
         sql = """
@@ -99,6 +101,53 @@ class Tally(Transaction):
             parameters=[bytearray.fromhex(data_request_hash)],
         )
 
+        return self.process_tally(results)
+
+    def get_tallies_for_data_requests(self, data_request_hashes):
+        sql = """
+            SELECT
+                tally_txns.data_request,
+                blocks.block_hash,
+                blocks.confirmed,
+                blocks.reverted,
+                tally_txns.txn_hash,
+                tally_txns.error_addresses,
+                tally_txns.liar_addresses,
+                tally_txns.result,
+                tally_txns.epoch
+            FROM
+                tally_txns
+            LEFT JOIN
+                blocks
+            ON
+                tally_txns.epoch=blocks.epoch
+            WHERE
+                tally_txns.data_request = ANY(%s)
+            ORDER BY
+                tally_txns.epoch
+            DESC
+        """
+        results = self.database.sql_return_all(
+            sql,
+            parameters=[[bytearray.fromhex(h) for h in data_request_hashes]],
+        )
+
+        tallies = {}
+        for data_request_hash, rows in group_rows_by_hash(
+            data_request_hashes, results
+        ).items():
+            # An invalid transaction only fails the data request it belongs to
+            try:
+                tallies[data_request_hash] = self.process_tally(rows)
+            except ValidationError as err_info:
+                if self.logger:
+                    self.logger.error(
+                        f"Could not validate tally for data request {data_request_hash}: {err_info}"
+                    )
+                tallies[data_request_hash] = {"error": "could not validate transaction"}
+        return tallies
+
+    def process_tally(self, results):
         tally = None
         found_confirmed, found_mined = False, False
         if results:
@@ -195,7 +244,7 @@ class Tally(Transaction):
             txn_epoch = epoch
             txn_time = self.start_time + (epoch + 1) * self.epoch_period
 
-            return TallyTransactionForApi().load(
+            return get_schema(TallyTransactionForApi).load(
                 {
                     "hash": txn_hash,
                     "block": block_hash.hex(),
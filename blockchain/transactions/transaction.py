@@ -21,6 +21,7 @@ class Transaction(object):
         database_config=None,
         witnet_node=None,
         node_config=None,
+        wip=None,
     ):
         self.start_time = consensus_constants.checkpoint_zero_timestamp
         self.epoch_period = consensus_constants.checkpoints_period
@@ -52,14 +53,10 @@ class Transaction(object):
         # Create address generator
         self.address_generator = AddressGenerator("wit")
 
-        # Create Protobuf encoder
+        # The Protobuf encoder is only needed for transactions fetched from a node, so the
+        # WIPs are not loaded until a transaction is set unless they were passed
+        self.wip = wip
         self.protobuf_encoder = None
-        if database is not None:
-            self.protobuf_encoder = ProtobufEncoder(WIP(database=database))
-        elif database_config is not None:
-            self.protobuf_encoder = ProtobufEncoder(
-                WIP(database_config=database_config)
-            )
 
     def configure_logging_process(self, queue, label):
         handler = logging.handlers.QueueHandler(queue)
@@ -85,9 +82,19 @@ class Transaction(object):
             if self.json_txn["weight"] != 0:
                 self.txn_details["weight"] = self.json_txn["weight"]
 
+        if self.protobuf_encoder is None:
+            self.protobuf_encoder = self.create_protobuf_encoder()
         if self.protobuf_encoder:
             self.protobuf_encoder.set_transaction(self.json_txn)
 
+    def create_protobuf_encoder(self):
+        if self.wip is not None:
+            return ProtobufEncoder(self.wip)
+        elif self.database is not None:
+            self.wip = WIP(database=self.database)
+            return ProtobufEncoder(self.wip)
+        return None
+
     def calculate_addresses(self, signatures):
         addresses = []
         for signature in signatures:
@@ -233,3 +240,12 @@ class Transaction(object):
                 return transaction
 
         return transaction["result"]
+
+
+def group_rows_by_hash(hashes, rows):
+    # Group the rows of a query for multiple hashes on their first column
+    # Every requested hash is present in the result, the row order is preserved
+    grouped = {txn_hash: [] for txn_hash in hashes}
+    for row in rows or []:
+        grouped[row[0].hex()].append(row[1:])
+    return grouped
@@ -6,6 +6,7 @@ from schemas.component.value_transfer_schema import (
     ValueTransferTransactionForBlock,
     ValueTransferTransactionForExplorer,
 )
+from schemas.registry import get_schema
 
 
 class ValueTransfer(Transaction):
@@ -39,7 +40,9 @@ class ValueTransfer(Transaction):
         if call_from == "explorer":
             self.txn_details["input_utxos"] = input_utxos
 
-            return ValueTransferTransactionForExplorer().load(self.txn_details)
+            return get_schema(ValueTransferTransactionForExplorer).load(
+                self.txn_details
+            )
 
         if call_from == "api":
             self.txn_details["unique_input_addresses"] = list(
@@ -72,7 +75,7 @@ class ValueTransfer(Transaction):
             del self.txn_details["output_values"]
             del self.txn_details["timelocks"]
 
-            return ValueTransferTransactionForBlock().load(self.txn_details)
+            return get_schema(ValueTransferTransactionForBlock).load(self.txn_details)
 
     def get_transaction_from_database(self, txn_hash):
         sql = """
@@ -162,7 +165,7 @@ class ValueTransfer(Transaction):
             txn_epoch = block_epoch
             txn_time = self.start_time + (block_epoch + 1) * self.epoch_period
 
-            return ValueTransferTransactionForApi().load(
+            return get_schema(ValueTransferTransactionForApi).load(
                 {
                     "block": block_hash.hex(),
                     "hash": txn_hash,
@@ -1,6 +1,13 @@
 import logging
 import logging.handlers
 
+from util.blockchain_events import (
+    BLOCK_CONFIRMED,
+    BLOCK_INSERTED,
+    BLOCK_REVERTED,
+    publish_event,
+)
+from util.common_functions import build_priority_histogram
 from util.database_manager import DatabaseManager
 
 
@@ -98,7 +105,7 @@ class WitnetDatabase(object):
             )
         )
 
-    def insert_value_transfer_txn(self, txn_details, epoch):
+    def insert_value_transfer_txn(self, txn_details, epoch, block_position):
         # Insert hash type
         self.hashes.append(
             (
@@ -120,10 +127,11 @@ class WitnetDatabase(object):
                 txn_details["timelocks"],
                 txn_details["weight"],
                 epoch,
+                block_position,
             )
         )
 
-    def insert_data_request_txn(self, txn_details, epoch):
+    def insert_data_request_txn(self, txn_details, epoch, block_position):
         # Insert hash types
         self.hashes.append(
             (
@@ -181,10 +189,11 @@ class WitnetDatabase(object):
                 RAD_bytes_hash,
                 DRO_bytes_hash,
                 epoch,
+                block_position,
             )
         )
 
-    def insert_commit_txn(self, txn_details, epoch):
+    def insert_commit_txn(self, txn_details, epoch, block_position):
         # Insert hash type
         self.hashes.append(
             (
@@ -204,10 +213,11 @@ class WitnetDatabase(object):
                 txn_details["output_value"],
                 bytearray.fromhex(txn_details["data_request"]),
                 epoch,
+                block_position,
             )
         )
 
-    def insert_reveal_txn(self, txn_details, epoch):
+    def insert_reveal_txn(self, txn_details, epoch, block_position):
         # Insert hash type
         self.hashes.append(
             (
@@ -226,10 +236,11 @@ class WitnetDatabase(object):
                 txn_details["reveal"],
                 txn_details["success"],
                 epoch,
+                block_position,
             )
         )
 
-    def insert_tally_txn(self, txn_details, epoch):
+    def insert_tally_txn(self, txn_details, epoch, block_position):
         # Insert hash type
         self.hashes.append(
             (
@@ -251,6 +262,7 @@ class WitnetDatabase(object):
                 txn_details["tally"],
                 txn_details["success"],
                 epoch,
+                block_position,
             )
         )
 
@@ -291,6 +303,8 @@ class WitnetDatabase(object):
         self.finalize_insert(epoch)
 
     def finalize_insert(self, epoch):
+        inserted_block = len(self.blocks) > 0
+
         # insert all hashes
         if len(self.hashes) > 0:
             sql = """
@@ -371,12 +385,14 @@ class WitnetDatabase(object):
                     output_values,
                     timelocks,
                     weight,
-                    epoch
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    epoch,
+                    block_position
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT ON CONSTRAINT
                     value_transfer_txns_pkey
                 DO UPDATE SET
-                    epoch=EXCLUDED.epoch
+                    epoch=EXCLUDED.epoch,
+                    block_position=EXCLUDED.block_position
             """
             self.db_mngr.sql_execute_many(
                 sql,
@@ -415,12 +431,14 @@ class WitnetDatabase(object):
                     tally_reducer,
                     RAD_bytes_hash,
                     DRO_bytes_hash,
-                    epoch
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    epoch,
+                    block_position
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT ON CONSTRAINT
                     data_request_txns_pkey
                 DO UPDATE SET
-                    epoch=EXCLUDED.epoch
+                    epoch=EXCLUDED.epoch,
+                    block_position=EXCLUDED.block_position
             """
             self.db_mngr.sql_execute_many(
                 sql,
@@ -442,8 +460,9 @@ class WitnetDatabase(object):
                     input_utxos,
                     output_value,
                     data_request,
-                    epoch
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    epoch,
+                    block_position
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT ON CONSTRAINT
                     commit_txns_pkey
                 DO NOTHING
@@ -464,14 +483,16 @@ class WitnetDatabase(object):
                     data_request,
                     result,
                     success,
-                    epoch
-                ) VALUES (%s, %s, %s, %s, %s, %s)
+                    epoch,
+                    block_position
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT ON CONSTRAINT
                     reveal_txns_pkey
                 DO UPDATE SET
                     result=EXCLUDED.result,
                     success=EXCLUDED.success,
-                    epoch=EXCLUDED.epoch
+                    epoch=EXCLUDED.epoch,
+                    block_position=EXCLUDED.block_position
             """
             self.db_mngr.sql_execute_many(sql, self.reveals)
             if self.logger:
@@ -492,8 +513,9 @@ class WitnetDatabase(object):
                     liar_addresses,
                     result,
                     success,
-                    epoch
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    epoch,
+                    block_position
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON CONFLICT ON CONSTRAINT
                     tally_txns_pkey
                 DO UPDATE SET
@@ -503,7 +525,8 @@ class WitnetDatabase(object):
                     liar_addresses=EXCLUDED.liar_addresses,
                     result=EXCLUDED.result,
                     success=EXCLUDED.success,
-                    epoch=EXCLUDED.epoch
+                    epoch=EXCLUDED.epoch,
+                    block_position=EXCLUDED.block_position
             """
             self.db_mngr.sql_execute_many(sql, self.tallies)
             if self.logger:
@@ -512,6 +535,10 @@ class WitnetDatabase(object):
                 )
         self.tallies = []
 
+        # Only notify subscribers once the block and all its transactions are inserted
+        if inserted_block:
+            publish_event(self.db_mngr, BLOCK_INSERTED, epoch)
+
     def confirm_block(self, block_hash, epoch):
         sql = """
             UPDATE
@@ -522,6 +549,7 @@ class WitnetDatabase(object):
                 block_hash=%s
         """
         self.db_mngr.sql_update_table(sql, parameters=[bytearray.fromhex(block_hash)])
+        publish_event(self.db_mngr, BLOCK_CONFIRMED, epoch)
         if self.logger:
             self.logger.info(f"Confirmed block {block_hash} for epoch {epoch}")
 
@@ -535,6 +563,7 @@ class WitnetDatabase(object):
             WHERE block_hash=%s
         """
         self.db_mngr.sql_update_table(sql, parameters=[bytearray.fromhex(block_hash)])
+        publish_event(self.db_mngr, BLOCK_REVERTED, epoch)
         if self.logger:
             self.logger.info(f"Reverted block {block_hash} for epoch {epoch}")
 
@@ -546,6 +575,7 @@ class WitnetDatabase(object):
                 block_hash=%s
         """
         self.db_mngr.sql_update_table(sql, parameters=[bytearray.fromhex(block_hash)])
+        publish_event(self.db_mngr, BLOCK_REVERTED, epoch)
         if self.logger:
             self.logger.info(f"Deleted block {block_hash} for epoch {epoch}")
 
@@ -556,26 +586,52 @@ class WitnetDatabase(object):
     def insert_mempool_data_requests(self, timestamp, fees, weights):
         if self.logger:
             self.logger.info(f"Inserting mempool data requests at {timestamp}")
+        # Store the priority histogram next to the raw values so it does not have to be recomputed on every API request
+        priorities, amounts = build_priority_histogram(fees, weights)
         sql = """
             INSERT INTO data_request_mempool (
                 timestamp,
                 fee,
-                weight
-            ) VALUES (%s, %s, %s)
+                weight,
+                priority,
+                amount
+            ) VALUES (%s, %s, %s, %s, %s)
         """
-        self.db_mngr.sql_insert_one(sql, parameters=[timestamp, fees, weights])
+        self.db_mngr.sql_insert_one(
+            sql,
+            parameters=[
+                timestamp,
+                fees,
+                weights,
+                priorities.tolist(),
+                amounts.tolist(),
+            ],
+        )
 
     def insert_mempool_value_transfers(self, timestamp, fees, weights):
         if self.logger:
             self.logger.info(f"Inserting mempool value transfers at {timestamp}")
+        # Store the priority histogram next to the raw values so it does not have to be recomputed on every API request
+        priorities, amounts = build_priority_histogram(fees, weights)
         sql = """
             INSERT INTO value_transfer_mempool (
                 timestamp,
                 fee,
-                weight
-            ) VALUES (%s, %s, %s)
+                weight,
+                priority,
+                amount
+            ) VALUES (%s, %s, %s, %s, %s)
         """
-        self.db_mngr.sql_insert_one(sql, parameters=[timestamp, fees, weights])
+        self.db_mngr.sql_insert_one(
+            sql,
+            parameters=[
+                timestamp,
+                fees,
+                weights,
+                priorities.tolist(),
+                amounts.tolist(),
+            ],
+        )
 
     #####################################################
     #                  Helper functions                 #
@@ -595,8 +651,8 @@ class WitnetDatabase(object):
         result = self.db_mngr.sql_return_one(sql)
         return result
 
-    def sql_return_all(self, sql):
-        result = self.db_mngr.sql_return_all(sql)
+    def sql_return_all(self, sql, parameters=None):
+        result = self.db_mngr.sql_return_all(sql, parameters=parameters)
         return result
 
     def sql_execute_many(self, sql, data):
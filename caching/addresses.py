@@ -24,13 +24,17 @@ from multiprocessing import Manager
 
 from blockchain.objects.address import Address
 
+from node.consensus_constants import ConsensusConstants
+
 from schemas.address.block_view_schema import BlockView
 from schemas.address.data_request_view_schema import DataRequestCreatedView, DataRequestSolvedView
 from schemas.address.mint_view_schema import MintView
 from schemas.address.value_transfer_view_schema import ValueTransferView
+from schemas.registry import get_schema
 
 from util.logger import create_logging_listener
 from util.logger import select_logging_level
+from util.memcached_codec import CodecClient
 from util.pickle_process import PickleProcess
 from util.socket_manager import SocketManager
 
@@ -118,6 +122,9 @@ class Addresses(object):
 
         func_pool = Manager().Pool(address_config["processes"])
 
+        # Load the consensus constants once instead of for every address object
+        consensus_constants = ConsensusConstants(config=config, error_retry=config["api"]["error_retry"])
+
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         # Set socket options: allows close and immediate reuse of an address, ignoring TIME_WAIT
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -130,10 +137,10 @@ class Addresses(object):
 
             # Get request from the socket
             logger.info("Starting client process")
-            p = PickleProcess(target=self.client, args=(logging_queue, config, connection, address_stack, epoch_addresses, func_pool))
+            p = PickleProcess(target=self.client, args=(logging_queue, config, connection, address_stack, epoch_addresses, func_pool, consensus_constants))
             p.start()
 
-    def client(self, logging_queue, config, connection, address_stack, epoch_addresses, func_pool):
+    def client(self, logging_queue, config, connection, address_stack, epoch_addresses, func_pool, consensus_constants):
         # Set up logger
         self.configure_logging_process(logging_queue, "client")
         logger = logging.getLogger("client")
@@ -202,7 +209,7 @@ class Addresses(object):
                     # Create cache client
                     cache_config = self.config["api"]["caching"]
                     servers = cache_config["server"].split(",")
-                    memcached_client = pylibmc.Client(servers, binary=True, username=cache_config["user"], password=cache_config["password"], behaviors={"tcp_nodelay": True, "ketama": True})
+                    memcached_client = CodecClient(servers, binary=True, username=cache_config["user"], password=cache_config["password"], behaviors={"tcp_nodelay": True, "ketama": True})
 
                     # Check if we recently received a request for this address
                     if memcached_client.get(f"{address}"):
@@ -304,7 +311,7 @@ class Addresses(object):
 
                 for function, m_address in zip(functions, monitor_addresses):
                     # Create address object
-                    address = Address(m_address, config, logger=logger, connect=False)
+                    address = Address(m_address, config, logger=logger, consensus_constants=consensus_constants, connect=False)
 
                     # Complete the request
                     # This block of code is surrounded with a try-except to catch a known Python bug with the Manager multi-processing Pool
@@ -397,15 +404,15 @@ class Addresses(object):
 
             try:
                 if label == "blocks":
-                    BlockView(many=True).load(address_data)
+                    get_schema(BlockView, many=True).load(address_data)
                 elif label == "mints":
-                    MintView(many=True).load(address_data)
+                    get_schema(MintView, many=True).load(address_data)
                 elif label == "value transfers":
-                    ValueTransferView(many=True).load(address_data)
+                    get_schema(ValueTransferView, many=True).load(address_data)
                 elif label == "data requests solved":
-                    DataRequestSolvedView(many=True).load(address_data)
+                    get_schema(DataRequestSolvedView, many=True).load(address_data)
                 elif label == "data requests created":
-                    DataRequestCreatedView(many=True).load(address_data)
+                    get_schema(DataRequestCreatedView, many=True).load(address_data)
             except ValidationError:
                 logger.error(f"Could not save {label} data for {identity} because it did not conform with the Marshmallow format")
 
@@ -414,7 +421,7 @@ class Addresses(object):
         # Create memcached client
         cache_config = self.config["api"]["caching"]
         servers = cache_config["server"].split(",")
-        memcached_client = pylibmc.Client(servers, binary=True, username=cache_config["user"], password=cache_config["password"], behaviors={"tcp_nodelay": True, "ketama": True})
+        memcached_client = CodecClient(servers, binary=True, username=cache_config["user"], password=cache_config["password"], behaviors={"tcp_nodelay": True, "ketama": True})
 
         # Attempt to cache the address data
         try:
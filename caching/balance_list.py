@@ -6,11 +6,12 @@ import toml
 
 from caching.client import Client
 from schemas.network.balances_schema import NetworkBalancesResponse
+from schemas.registry import get_schema
 from util.data_transformer import re_sql
 from util.logger import configure_logger
 
 class BalanceList(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["balance_list"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["balance_list"]["level_file"]
@@ -21,7 +22,7 @@ class BalanceList(Client):
         self.timeout = config["api"]["caching"]["scripts"]["balance_list"]["timeout"]
         self.node_timeout = config["api"]["caching"]["scripts"]["balance_list"]["node_timeout"]
 
-        super().__init__(config, node_timeout=self.node_timeout)
+        super().__init__(config, node_timeout=self.node_timeout, connections=connections)
 
     def build(self):
         start = time.perf_counter()
@@ -96,7 +97,7 @@ class BalanceList(Client):
             try:
                 self.memcached_client.set(
                     f"balance-list_{i}-{i + items_per_key}",
-                    NetworkBalancesResponse().load(
+                    get_schema(NetworkBalancesResponse).load(
                         {
                             "balances": self.balances[i : i + items_per_key],
                             "total_items": len(self.balances),
@@ -147,6 +148,14 @@ class BalanceList(Client):
 
         self.logger.info(f"Inserted {len(addresses_to_insert)} addresses into database in {time.perf_counter() - start:.2f}s")
 
+def run(config, connections=None):
+    # Create BalanceList cache
+    balance_list = BalanceList(config, connections=connections)
+    # Save BalanceList in memcached instance on success
+    if balance_list.build():
+        balance_list.save()
+        balance_list.insert_addresses()
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
@@ -159,12 +168,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create BalanceList cache
-    balance_list = BalanceList(config)
-    # Save BalanceList in memcached instance on success
-    if balance_list.build():
-        balance_list.save()
-        balance_list.insert_addresses()
+    run(config)
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
+import concurrent.futures
 import optparse
 import pylibmc
 import sys
+import threading
 import time
 import toml
 
@@ -8,19 +10,40 @@ from marshmallow import ValidationError
 
 from caching.client import Client
 from blockchain.objects.block import Block
+from blockchain.objects.database_block import DatabaseBlock
+from node.witnet_node import WitnetNode
+from util.blockchain_events import BLOCK_REVERTED
 from util.data_transformer import re_sql
+from util.database_manager import DatabaseManager
 from util.logger import configure_logger
 from util.memcached import calculate_timeout
 from util.common_sql import sql_last_block
 
+class RateLimiter(object):
+    def __init__(self, rate):
+        # Maximum number of calls per second, zero disables the limit
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_call = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.interval == 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
 class Blocks(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["blocks"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["blocks"]["level_file"]
         self.logger = configure_logger("block", log_filename, log_level)
 
-        super().__init__(config)
+        super().__init__(config, connections=connections)
 
         self.node_config = config["node-pool"]
 
@@ -31,6 +54,15 @@ class Blocks(Client):
 
         self.superblock_period = self.consensus_constants.superblock_period
 
+        # Number of blocks looked up in, built for and written to the cache at once
+        self.batch_size = config["api"]["caching"]["scripts"]["blocks"].get("batch_size", 100)
+        # Build missing blocks concurrently, limiting the amount of blocks requested from the node pool per second
+        self.warmup_threads = config["api"]["caching"]["scripts"]["blocks"].get("warmup_threads", 1)
+        self.rate_limiter = RateLimiter(config["api"]["caching"]["scripts"]["blocks"].get("warmup_rate", 0))
+        self.executor = None
+        self.thread_data = threading.local()
+        self.thread_connections = []
+
     def process(self, force_update):
         start = time.perf_counter()
 
@@ -63,74 +95,202 @@ class Blocks(Client):
             ASC
         """ % (blocks_epoch, last_epoch)
         blocks = self.database.sql_return_all(re_sql(sql))
+        blocks = [(block_hash.hex(), epoch) for block_hash, epoch in blocks]
 
         self.logger.info(f"Collected {len(blocks)} blocks in {time.perf_counter() - start:.2f}s")
-        self.logger.info(f"Building blocks starting at epoch {blocks_epoch}")
 
         new_blocks, updated_blocks = 0, 0
-        for block_hash, epoch in blocks:
-            inner_start = time.perf_counter()
+        # Always shut down the worker threads and their connections, also when building a batch fails
+        try:
+            for i in range(0, len(blocks), self.batch_size):
+                inner_start = time.perf_counter()
+
+                # Look up a batch of blocks in the cache with a single request
+                batch = blocks[i : i + self.batch_size]
+                cached_blocks = self.memcached_client.get_multi([block_hash for block_hash, _ in batch])
+
+                # Build all blocks which are missing, or are cached as unconfirmed while they should be confirmed by now
+                build_blocks, update_blocks = [], set()
+                for block_hash, epoch in batch:
+                    if block_hash not in cached_blocks or force_update:
+                        build_blocks.append((block_hash, epoch))
+                        continue
 
-            # Try to fetch this block
-            block_hash = block_hash.hex()
-            json_block = self.memcached_client.get(block_hash)
-
-            # Check if the block is already present in the cache or if a forced update is required
-            if not json_block or force_update:
-                try:
-                    json_block = self.build_block(block_hash, epoch)
-                except ValidationError:
-                    self.logger.error(f"Block {block_hash} does not pass the Marshmallow validation")
-                    continue
+                    json_block = cached_blocks[block_hash]["block"]
+                    superblock_epoch = int(json_block["details"]["epoch"] / self.superblock_period) * self.superblock_period
+                    if not json_block["details"]["confirmed"] and last_epoch >= superblock_epoch + self.superblock_period * 2:
+                        build_blocks.append((block_hash, epoch))
+                        update_blocks.add(block_hash)
+                    else:
+                        self.logger.debug(f"Found block {block_hash} for epoch {epoch} in memcached cache")
 
-                if json_block is None:
+                if len(build_blocks) == 0:
                     continue
 
-                # Try to insert the block in the cache
-                try:
-                    self.cache_block(last_epoch, epoch, block_hash, json_block)
-
-                    new_blocks += 1
-
-                    confirmed = json_block["details"]["confirmed"]
-                    # track the last epoch for which we successfully added a confirmed block to the cache
-                    # on the next execution of this script, it will start processing blocks from that epoch
-                    if confirmed:
-                        blocks_epoch = epoch
-
-                    self.logger.info(f"Built {'confirmed' if confirmed else 'unconfirmed'} block {block_hash} for epoch {epoch} and added it to the memcached cache in {time.perf_counter() - inner_start:.2f}s")
-                except pylibmc.TooBig as e:
-                    self.logger.warning(f"Built block {block_hash} for epoch {epoch} in {time.perf_counter() - inner_start:.2f}s, but could not save it in the memcached instance because its size exceeded 1MB")
-            else:
-                json_block = json_block["block"]
-                superblock_epoch = int(json_block["details"]["epoch"] / self.superblock_period) * self.superblock_period
-                if not json_block["details"]["confirmed"] and last_epoch >= superblock_epoch + self.superblock_period * 2:
-                    json_block = self.build_block(block_hash, epoch)
+                json_blocks = self.build_blocks(build_blocks)
 
+                batch_blocks = {}
+                for (block_hash, epoch), json_block in zip(build_blocks, json_blocks):
                     if json_block is None:
                         continue
+                    # Unconfirmed cached blocks are only replaced once they are confirmed
+                    if block_hash in update_blocks and not json_block["details"]["confirmed"]:
+                        continue
+                    batch_blocks[block_hash] = (epoch, json_block)
 
-                    if json_block["details"]["confirmed"]:
-                        self.cache_block(last_epoch, epoch, block_hash, json_block)
+                cached = self.cache_blocks(last_epoch, batch_blocks)
 
-                        # track the last epoch for which we successfully added a confirmed block to the cache
-                        # on the next execution of this script, it will start processing blocks from that epoch
-                        blocks_epoch = epoch
+                for block_hash in cached:
+                    epoch, json_block = batch_blocks[block_hash]
+                    # track the last epoch for which we successfully added a confirmed block to the cache
+                    # on the next execution of this script, it will start processing blocks from that epoch
+                    if json_block["details"]["confirmed"]:
+                        blocks_epoch = max(blocks_epoch, epoch)
 
+                    if block_hash in update_blocks:
                         updated_blocks += 1
+                    else:
+                        new_blocks += 1
 
-                        self.logger.info(f"Updated block {block_hash} for epoch {epoch} in the memcached cache in {time.perf_counter() - inner_start:.2f}s")
-                else:
-                    self.logger.debug(f"Found block {block_hash} for epoch {epoch} in memcached cache in {time.perf_counter() - inner_start:.2f}s")
+                self.logger.info(f"Built {len(build_blocks)} blocks for epochs {build_blocks[0][1]} to {build_blocks[-1][1]} and added {len(cached)} of them to the memcached cache in {time.perf_counter() - inner_start:.2f}s")
+        finally:
+            self.stop_workers()
 
         # Save the most recent epoch for which we sucessfully cached a block
         self.set_start_epoch("blocks_epoch", blocks_epoch)
 
         self.logger.info(f"Cached {new_blocks} and updated {updated_blocks} recent blocks in {time.perf_counter() - start:.2f}s")
 
-    def build_block(self, block_hash, epoch):
-        # Build block
-        block = Block(self.consensus_constants, block_hash=block_hash, logger=self.logger, database=self.database, database_config=self.config["database"], node_config=self.node_config)
+    # Build a list of blocks concurrently, the result is None for blocks which could not be built
+    # Every worker thread uses its own node and database connection and the node requests are rate-limited
+    def build_blocks(self, blocks):
+        if self.warmup_threads == 1:
+            return [self.build_block_safe(block_hash, epoch) for block_hash, epoch in blocks]
+
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.warmup_threads)
+
+        return list(self.executor.map(lambda block: self.build_block_safe(block[0], block[1], thread_connections=True), blocks))
+
+    def stop_workers(self):
+        if self.executor is None:
+            return
+        self.executor.shutdown()
+        self.executor = None
+
+        for database, witnet_node in self.thread_connections:
+            database.terminate()
+            witnet_node.close_connection()
+        self.thread_connections = []
+
+    def build_block_safe(self, block_hash, epoch, thread_connections=False):
+        database, witnet_node = None, None
+        if thread_connections:
+            if not hasattr(self.thread_data, "database"):
+                self.thread_data.database = DatabaseManager(self.config["database"], logger=self.logger, custom_types=["utxo", "filter"])
+                self.thread_data.witnet_node = WitnetNode(self.node_config, logger=self.logger)
+                self.thread_connections.append((self.thread_data.database, self.thread_data.witnet_node))
+            database, witnet_node = self.thread_data.database, self.thread_data.witnet_node
+
+        try:
+            return self.build_block(block_hash, epoch, database=database, witnet_node=witnet_node)
+        except ValidationError:
+            self.logger.error(f"Block {block_hash} does not pass the Marshmallow validation")
+            return None
+
+    def cache_blocks(self, last_epoch, blocks):
+        if len(blocks) == 0:
+            return []
+
+        # All blocks of a batch expire together, at the expiry time of the oldest block
+        oldest_epoch = min(epoch for epoch, _ in blocks.values())
+        timeout = calculate_timeout(int(self.memcached_timeout * (self.lookback_epochs - last_epoch + oldest_epoch) / self.lookback_epochs))
+
+        # Cache the full blocks based on the hash and the block epoch to block hash mappings
+        items = {}
+        for block_hash, (epoch, json_block) in blocks.items():
+            items[block_hash] = {
+                "response_type": "block",
+                "block": json_block,
+            }
+            items[str(epoch)] = block_hash
+        failed = set(self.memcached_client.set_multi(items, time=timeout))
+
+        for block_hash in failed:
+            if block_hash in blocks:
+                self.logger.warning(f"Built block {block_hash} for epoch {blocks[block_hash][0]}, but could not save it in the memcached instance, its size probably exceeded 1MB")
+
+        return [block_hash for block_hash in blocks if block_hash not in failed]
+
+    # Only update the cached blocks for the epochs of the blockchain events passed by the caching scheduler
+    def process_events(self, events):
+        start = time.perf_counter()
+
+        last = self.database.sql_return_one(sql_last_block)
+        if not last:
+            return
+        last_epoch = last[1]
+
+        # Remove reverted blocks, if the epoch was replaced by a block from another fork, it is rebuilt below
+        reverted_blocks = 0
+        for epoch in sorted(events.get(BLOCK_REVERTED, [])):
+            block_hash = self.memcached_client.get(str(epoch))
+            if block_hash:
+                self.memcached_client.delete(block_hash)
+                self.memcached_client.delete(str(epoch))
+                reverted_blocks += 1
+                self.logger.info(f"Removed reverted block {block_hash} for epoch {epoch} from the memcached cache")
+
+        # Rebuild the blocks for all epochs since either the block itself or its confirmation status changed
+        epochs = sorted(epoch for epochs in events.values() for epoch in epochs if epoch > last_epoch - self.lookback_epochs)
+        sql = """
+            SELECT
+                block_hash,
+                epoch
+            FROM
+                blocks
+            WHERE
+                epoch = ANY(%s)
+            AND
+                reverted = false
+            ORDER BY
+                epoch
+            ASC
+        """
+        blocks = self.database.sql_return_all(re_sql(sql), parameters=[epochs])
+
+        cached_blocks = 0
+        for block_hash, epoch in blocks:
+            inner_start = time.perf_counter()
+
+            block_hash = block_hash.hex()
+            try:
+                json_block = self.build_block(block_hash, epoch)
+            except ValidationError:
+                self.logger.error(f"Block {block_hash} does not pass the Marshmallow validation")
+                continue
+
+            if json_block is None:
+                continue
+
+            try:
+                self.cache_block(last_epoch, epoch, block_hash, json_block)
+                cached_blocks += 1
+                self.logger.info(f"Built {'confirmed' if json_block['details']['confirmed'] else 'unconfirmed'} block {block_hash} for epoch {epoch} and added it to the memcached cache in {time.perf_counter() - inner_start:.2f}s")
+            except pylibmc.TooBig as e:
+                self.logger.warning(f"Built block {block_hash} for epoch {epoch} in {time.perf_counter() - inner_start:.2f}s, but could not save it in the memcached instance because its size exceeded 1MB")
+
+        self.logger.info(f"Cached {cached_blocks} and removed {reverted_blocks} blocks for {len(epochs)} epochs with blockchain events in {time.perf_counter() - start:.2f}s")
+
+    def build_block(self, block_hash, epoch, database=None, witnet_node=None):
+        # Build the block from the database, this does not require any node requests
+        json_block = DatabaseBlock(self.consensus_constants, logger=self.logger, database=database or self.database).get_block(block_hash=block_hash)
+        if json_block is not None:
+            return json_block
+
+        # The block or some of its transactions were not inserted yet, fall back to building it from a node
+        self.rate_limiter.acquire()
+        block = Block(self.consensus_constants, block_hash=block_hash, logger=self.logger, database=database or self.database, database_config=self.config["database"], witnet_node=witnet_node or self.witnet_node, node_config=self.node_config)
         json_block = block.process_block("api")
         if "error" in json_block:
             self.logger.warning(f"Could not fetch block {block_hash} for epoch {epoch}")
@@ -155,6 +315,14 @@ class Blocks(Client):
         except pylibmc.TooBig as e:
             raise
 
+def run(config, connections=None, force_update=False, events=None):
+    # Create block cache
+    blocks = Blocks(config, connections=connections)
+    if events:
+        blocks.process_events(events)
+    else:
+        blocks.process(force_update)
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
@@ -168,9 +336,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create block cache
-    blocks = Blocks(config)
-    blocks.process(options.force_update)
+    run(config, force_update=options.force_update)
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,74 @@
 import psycopg
-import pylibmc
 import sys
 
+from blockchain.objects.wip import WIP
 from node.consensus_constants import ConsensusConstants
 from node.witnet_node import WitnetNode
+from util.memcached_codec import CodecClient
 from util.socket_manager import SocketManager
 from util.database_manager import DatabaseManager
 
 
+class ClientConnections(object):
+    # Connections of a caching job which are kept open across runs when the job is hosted by the caching scheduler
+    def __init__(self):
+        self.witnet_node = None
+        self.database = None
+        self.database_client = None
+        self.memcached_client = None
+        self.consensus_constants = None
+        self.wip = None
+
+    def connected(self):
+        if self.witnet_node is None or self.database is None or self.memcached_client is None:
+            return False
+        for database in (self.database, self.database_client):
+            if database is not None and (database.connection.closed or database.connection.broken):
+                return False
+        return True
+
+    # End the transaction opened by the last queries of a run so an idle connection does not keep it open
+    def release(self):
+        for database in (self.database, self.database_client):
+            if database is not None and not database.connection.closed:
+                database.connection.rollback()
+
+    def close(self):
+        if self.witnet_node is not None:
+            self.witnet_node.close_connection()
+        for database in (self.database, self.database_client):
+            if database is not None and not database.connection.closed:
+                database.connection.close()
+        if self.memcached_client is not None:
+            self.memcached_client.disconnect_all()
+        # Consensus constants and WIPs never change, so they are kept when reconnecting
+        self.witnet_node = None
+        self.database = None
+        self.database_client = None
+        self.memcached_client = None
+
+
 class Client(object):
-    def __init__(self, config, node_timeout=0, named_cursor=False):
+    def __init__(self, config, node_timeout=0, named_cursor=False, connections=None):
         self.config = config
+        self.connections = connections
+
+        # Reuse the connections of a previous run of this job
+        if connections is not None and connections.connected():
+            self.witnet_node = connections.witnet_node
+            self.witnet_node.logger = self.logger
+            self.database = connections.database
+            self.database.logger = self.logger
+            if named_cursor:
+                self.database_client = connections.database_client
+                self.database_client.logger = self.logger
+            self.memcached_client = connections.memcached_client
+            self.consensus_constants = connections.consensus_constants
+            return
+
+        # Close whatever is left of the previous connections before reconnecting
+        if connections is not None:
+            connections.close()
 
         # Connect to node pool
         try:
@@ -45,7 +103,7 @@ class Client(object):
         # Memcached client
         cache_config = config["api"]["caching"]
         servers = cache_config["server"].split(",")
-        self.memcached_client = pylibmc.Client(
+        self.memcached_client = CodecClient(
             servers,
             binary=True,
             username=cache_config["user"],
@@ -64,15 +122,36 @@ class Client(object):
             sys.exit(1)
 
         # Get consensus constants
-        try:
-            self.consensus_constants = ConsensusConstants(
-                database=self.database,
-                witnet_node=self.witnet_node,
-                error_retry=config["api"]["error_retry"],
-            )
-        except ConnectionRefusedError:
-            self.logger.error("Could not connect to the node pool!")
-            sys.exit(1)
+        if connections is not None and connections.consensus_constants is not None:
+            self.consensus_constants = connections.consensus_constants
+        else:
+            try:
+                self.consensus_constants = ConsensusConstants(
+                    database=self.database,
+                    witnet_node=self.witnet_node,
+                    error_retry=config["api"]["error_retry"],
+                )
+            except ConnectionRefusedError:
+                self.logger.error("Could not connect to the node pool!")
+                sys.exit(1)
+
+        # Save the connections so the next run of this job can reuse them
+        if connections is not None:
+            connections.witnet_node = self.witnet_node
+            connections.database = self.database
+            if named_cursor:
+                connections.database_client = self.database_client
+            connections.memcached_client = self.memcached_client
+            connections.consensus_constants = self.consensus_constants
+
+    # Load the WIPs only once when the job is hosted by the caching scheduler
+    def get_wip(self, database):
+        if self.connections is not None and self.connections.wip is not None:
+            return self.connections.wip
+        wip = WIP(database=database)
+        if self.connections is not None:
+            self.connections.wip = wip
+        return wip
 
     def get_start_epoch(self, key):
         sql = """
@@ -1,27 +1,25 @@
 import json
 import optparse
-import pylibmc
 import sys
 import time
 import toml
 
-from marshmallow import ValidationError
-
-from blockchain.objects.data_request_report import DataRequestReport
+from blockchain.objects.data_request_report import get_data_request_reports
 from caching.client import Client
+from util.blockchain_events import BLOCK_REVERTED
 from util.data_transformer import re_sql
 from util.logger import configure_logger
 from util.memcached import calculate_timeout
 from util.common_sql import sql_last_block
 
 class DataRequestReports(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["data_request_reports"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["data_request_reports"]["level_file"]
         self.logger = configure_logger("report", log_filename, log_level)
 
-        super().__init__(config)
+        super().__init__(config, connections=connections)
 
         # Fetch configured timeout for data request report cache expiry
         self.memcached_timeout = config["api"]["caching"]["scripts"]["data_request_reports"]["timeout"]
@@ -30,6 +28,9 @@ class DataRequestReports(Client):
 
         self.cache_time_warning = config["api"]["caching"]["scripts"]["data_request_reports"]["cache_time_warning"]
 
+        # Number of data request reports which are looked up in, built for and written to the cache at once
+        self.batch_size = config["api"]["caching"]["scripts"]["data_request_reports"].get("batch_size", 100)
+
     def process_data_requests(self, force_update):
         start = time.perf_counter()
 
@@ -68,99 +69,159 @@ class DataRequestReports(Client):
         """ % (data_request_reports_epoch, self.last_epoch)
         data_requests = self.database.sql_return_all(re_sql(sql))
 
+        data_requests = [(txn_hash.hex(), epoch) for txn_hash, epoch in data_requests]
+
         self.logger.info(f"Collected {len(data_requests)} data requests in {time.perf_counter() - start:.2f}s")
         self.logger.info(f"Building data request reports starting at epoch {data_request_reports_epoch}")
 
-        new_data_request_reports, updated_data_request_reports = 0, 0
-        for txn_hash, epoch in data_requests:
-            inner_start = time.perf_counter()
-
-            # Try to fetch this data request report
-            txn_hash = txn_hash.hex()
-            data_request_report = self.memcached_client.get(txn_hash)
-
-            # Was the data request report already present in the cache?
-            if not data_request_report or force_update:
-                data_request_report = self.cache_data_request_report(txn_hash, epoch, inner_start)
-                if data_request_report == None:
+        # Look up the data request reports in the cache in batches
+        # Build all reports which are missing, or are cached without a confirmed tally since they could've been updated
+        build_data_requests, update_data_requests = [], set()
+        for i in range(0, len(data_requests), self.batch_size):
+            batch = data_requests[i : i + self.batch_size]
+            cached_reports = self.memcached_client.get_multi([txn_hash for txn_hash, _ in batch])
+            for txn_hash, epoch in batch:
+                if txn_hash not in cached_reports or force_update:
+                    build_data_requests.append((txn_hash, epoch))
                     continue
 
-                confirmed = False
-                if data_request_report["tally"] != None and data_request_report["tally"]["confirmed"] == True:
-                    # track the last epoch for which we successfully added a confirmed data request report to the cache
-                    # on the next execution of this script, it will start processing data request reports from that epoch
-                    data_request_reports_epoch = epoch
-                    confirmed = True
-
-                    # Save this data request report in the database table
-                    self.save_data_request_report(txn_hash, data_request_report)
+                tally = cached_reports[txn_hash]["data_request_report"]["tally"]
+                if tally is None or tally["confirmed"] == False:
+                    build_data_requests.append((txn_hash, epoch))
+                    update_data_requests.add(txn_hash)
+                else:
+                    self.logger.debug(f"Found data request report {txn_hash} for epoch {epoch} in memcached cache")
 
+        new_data_request_reports, updated_data_request_reports = 0, 0
+        for txn_hash, epoch, confirmed in self.cache_data_request_reports(build_data_requests):
+            # track the last epoch for which we successfully added a confirmed data request report to the cache
+            # on the next execution of this script, it will start processing data request reports from that epoch
+            if confirmed:
+                data_request_reports_epoch = max(data_request_reports_epoch, epoch)
+
+            if txn_hash in update_data_requests:
+                updated_data_request_reports += 1
+            else:
                 new_data_request_reports += 1
 
-                self.logger.info(f"Built {'confirmed' if confirmed else 'unconfirmed'} data request report {txn_hash} for epoch {epoch} and added it to the memcached cache in {time.perf_counter() - inner_start:.2f}s")
-            else:
-                tally = data_request_report["data_request_report"]["tally"]
-                if tally is None or tally["confirmed"] == False:
-                    # Replace the current cached data request report with a new one since it could've been updated
-                    data_request_report = self.cache_data_request_report(txn_hash, epoch, inner_start)
-                    if data_request_report == None:
-                        continue
+        # Save the most recently processed epoch in the database to know where to start the next job
+        self.set_start_epoch("data_request_reports_epoch", data_request_reports_epoch)
 
-                    confirmed = False
-                    if data_request_report["tally"] != None and data_request_report["tally"]["confirmed"] == True:
-                        # track the last epoch for which we successfully added a confirmed data request report to the cache
-                        # on the next execution of this script, it will start processing data request reports from that epoch
-                        data_request_reports_epoch = epoch
-                        confirmed = True
+        time_elapsed = time.perf_counter() - start
+        self.logger.info(f"Cached {new_data_request_reports} and updated {updated_data_request_reports} recent data request reports in {time_elapsed:.2f}s")
+        if time_elapsed > self.cache_time_warning:
+            self.logger.warning(f"Caching recent data request reports took too much time: {time_elapsed:.2f}s > {self.cache_time_warning:.2f}s")
 
-                        # Save this data request report in the database table
-                        self.save_data_request_report(txn_hash, data_request_report)
+    # Only update the data request reports tallied in the epochs of the blockchain events passed by the caching scheduler
+    def process_data_request_events(self, events):
+        start = time.perf_counter()
 
-                    updated_data_request_reports += 1
+        last = self.database.sql_return_one(sql_last_block)
+        if last:
+            self.last_epoch = last[1]
+        else:
+            return
 
-                    self.logger.info(f"Updated data request report {txn_hash} for epoch {epoch} in memcached cache with a new {'confirmed' if confirmed else 'unconfirmed'} one in {time.perf_counter() - inner_start:.2f}s")
-                else:
-                    self.logger.debug(f"Found data request report {txn_hash} for epoch {epoch} in memcached cache in {time.perf_counter() - inner_start:.2f}s")
+        # Data request reports which were tallied in a reverted block are outdated
+        removed_data_request_reports = 0
+        if BLOCK_REVERTED in events:
+            sql = """
+                SELECT
+                    data_request
+                FROM
+                    tally_txns
+                WHERE
+                    epoch = ANY(%s)
+            """
+            data_requests = self.database.sql_return_all(re_sql(sql), parameters=[sorted(events[BLOCK_REVERTED])])
+            for (txn_hash,) in data_requests:
+                if self.memcached_client.delete(txn_hash.hex()):
+                    removed_data_request_reports += 1
+
+        epochs = sorted(epoch for epochs in events.values() for epoch in epochs if epoch > self.last_epoch - self.lookback_epochs)
+        sql = """
+            SELECT
+                data_request_txns.txn_hash,
+                blocks.epoch
+            FROM
+                data_request_txns
+            LEFT JOIN
+                tally_txns
+            ON
+                data_request_txns.txn_hash=tally_txns.data_request
+            LEFT JOIN
+                blocks
+            ON
+                tally_txns.epoch=blocks.epoch
+            WHERE
+                blocks.epoch = ANY(%s)
+            AND
+                blocks.reverted = false
+            ORDER BY
+                blocks.epoch
+        """
+        data_requests = self.database.sql_return_all(re_sql(sql), parameters=[epochs])
 
-        # Save the most recently processed epoch in the database to know where to start the next job
-        self.set_start_epoch("data_request_reports_epoch", data_request_reports_epoch)
+        data_requests = [(txn_hash.hex(), epoch) for txn_hash, epoch in data_requests]
+        cached_data_request_reports = len(self.cache_data_request_reports(data_requests))
 
         time_elapsed = time.perf_counter() - start
-        self.logger.info(f"Cached {new_data_request_reports} and updated {updated_data_request_reports} recent data request reports in {time_elapsed:.2f}s")
+        self.logger.info(f"Cached {cached_data_request_reports} and removed {removed_data_request_reports} data request reports for {len(epochs)} epochs with blockchain events in {time_elapsed:.2f}s")
         if time_elapsed > self.cache_time_warning:
-            self.logger.warning(f"Caching recent data request reports took too much time: {time_elapsed:.2f}s > {self.cache_time_warning:.2f}s")
+            self.logger.warning(f"Caching data request reports took too much time: {time_elapsed:.2f}s > {self.cache_time_warning:.2f}s")
+
+    # Build, cache and save the data request reports for a list of (data request hash, epoch) tuples in batches
+    # Every batch requires four queries to build all reports, a single memcached request and a single insert statement
+    # Returns a (data request hash, epoch, confirmed) tuple for every data request report which was cached
+    def cache_data_request_reports(self, data_requests):
+        cached = []
+        for i in range(0, len(data_requests), self.batch_size):
+            inner_start = time.perf_counter()
 
-    def cache_data_request_report(self, txn_hash, epoch, inner_start):
-        # Build data request report
-        data_request = DataRequestReport("data_request", txn_hash, self.consensus_constants, logger=self.logger, database=self.database)
-        try:
-            data_request_report = data_request.get_report()
-            if "error" in data_request_report:
-                self.logger.warning(f"Could not create data request report {txn_hash} for epoch {epoch}")
-                return None
-        except ValidationError as err_info:
-            self.logger.error(f"Could not validate data request report {txn_hash} for epoch {epoch}: {err_info}")
-            return None
-
-        # Try to insert the data request report in the cache
-        try:
-            # Cache older data request reports for a shorter amount of time proportional to mimic the normal expiry time
-            timeout = calculate_timeout(int(self.memcached_timeout * (self.lookback_epochs - self.last_epoch + epoch) / self.lookback_epochs))
-            self.memcached_client.set(
-                txn_hash,
-                {
+            # The same data request can be returned multiple times if it was tallied in a reverted block
+            batch = dict(data_requests[i : i + self.batch_size])
+            data_request_reports = get_data_request_reports(list(batch.keys()), self.consensus_constants, logger=self.logger, database=self.database)
+
+            items, confirmed_reports = {}, []
+            for txn_hash, data_request_report in data_request_reports.items():
+                if "error" in data_request_report:
+                    self.logger.warning(f"Could not create data request report {txn_hash} for epoch {batch[txn_hash]}: {data_request_report['error']}")
+                    continue
+
+                items[txn_hash] = {
                     "response_type": "data_request_report",
                     "data_request_report": data_request_report,
-                },
-                time=timeout,
-            )
-        except pylibmc.TooBig as e:
-            self.logger.warning(f"Built data request report {txn_hash} for epoch {epoch} in {time.perf_counter() - inner_start:.2f}s, but could not save it in the memcached instance because its size exceeded 1MB")
-            return None
+                }
+                if data_request_report["tally"] != None and data_request_report["tally"]["confirmed"] == True:
+                    confirmed_reports.append((txn_hash, data_request_report))
+
+            if len(items) == 0:
+                continue
+
+            # Cache older data request reports for a shorter amount of time proportional to mimic the normal expiry time
+            # All data request reports of a batch expire together, at the expiry time of the oldest data request
+            oldest_epoch = min(batch[txn_hash] for txn_hash in items)
+            timeout = calculate_timeout(int(self.memcached_timeout * (self.lookback_epochs - self.last_epoch + oldest_epoch) / self.lookback_epochs))
+            failed = set(self.memcached_client.set_multi(items, time=timeout))
+
+            for txn_hash in failed:
+                self.logger.warning(f"Built data request report {txn_hash} for epoch {batch[txn_hash]}, but could not save it in the memcached instance, its size probably exceeded 1MB")
 
-        return data_request_report
+            # Save the confirmed data request reports in the database table
+            self.save_data_request_reports(confirmed_reports)
+
+            confirmed_hashes = set(txn_hash for txn_hash, _ in confirmed_reports)
+            batch_cached = [(txn_hash, batch[txn_hash], txn_hash in confirmed_hashes) for txn_hash in items if txn_hash not in failed]
+            cached.extend(batch_cached)
+
+            self.logger.info(f"Built {len(items)} data request reports ({len(confirmed_reports)} confirmed) and added {len(batch_cached)} of them to the memcached cache in {time.perf_counter() - inner_start:.2f}s")
+
+        return cached
+
+    def save_data_request_reports(self, data_request_reports):
+        if len(data_request_reports) == 0:
+            return
 
-    def save_data_request_report(self, txn_hash, data_request_report):
         sql = """
             INSERT INTO data_request_reports(
                 data_request_hash,
@@ -170,7 +231,15 @@ class DataRequestReports(Client):
                 data_request_reports_pkey
             DO NOTHING
         """
-        self.database.sql_insert_one(sql, (txn_hash, json.dumps(data_request_report)))
+        self.database.sql_execute_many(sql, [(bytearray.fromhex(txn_hash), json.dumps(data_request_report)) for txn_hash, data_request_report in data_request_reports])
+
+def run(config, connections=None, force_update=False, events=None):
+    # Create data request report cache
+    report_cache = DataRequestReports(config, connections=connections)
+    if events:
+        report_cache.process_data_request_events(events)
+    else:
+        report_cache.process_data_requests(force_update)
 
 def main():
     parser = optparse.OptionParser()
@@ -185,9 +254,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create data request report cache
-    report_cache = DataRequestReports(config)
-    report_cache.process_data_requests(options.force_update)
+    run(config, force_update=options.force_update)
 
 if __name__ == "__main__":
     main()
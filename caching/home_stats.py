@@ -6,26 +6,26 @@ import time
 import toml
 
 from caching.client import Client
-from blockchain.objects.wip import WIP
 from schemas.misc.home_schema import HomeBlock, HomeNetworkStats, HomeTransaction, HomeResponse
 from schemas.network.supply_schema import NetworkSupply
+from schemas.registry import get_schema
 from util.data_transformer import re_sql
 from util.logger import configure_logger
 
 class HomeStats(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["home_stats"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["home_stats"]["level_file"]
         self.logger = configure_logger("home", log_filename, log_level)
 
-        super().__init__(config)
+        super().__init__(config, connections=connections)
 
         # Assign some of the consensus constants
         self.start_time = self.consensus_constants.checkpoint_zero_timestamp
         self.epoch_period = self.consensus_constants.checkpoints_period
 
-        wips = WIP(database_config=config["database"], node_config=config["node-pool"])
+        wips = self.get_wip(self.database)
         self.wip0027_activation_epoch = wips.get_activation_epoch("WIP0027")
 
         # Initialize previous variables
@@ -45,6 +45,11 @@ class HomeStats(Client):
 
         self.home_stats = {}
 
+        start_inner = time.perf_counter()
+        self.logger.info("Updating chain totals")
+        self.chain_totals = self.update_chain_totals()
+        self.logger.info(f"Updated chain totals up to epoch {self.chain_totals['epoch']} in {time.perf_counter() - start_inner:.2f}s")
+
         start_inner = time.perf_counter()
         self.logger.info("Collecting network statistics")
         self.home_stats["network_stats"] = self.get_network_stats()
@@ -72,53 +77,135 @@ class HomeStats(Client):
 
         self.home_stats["last_updated"] = int(time.time())
 
-        HomeResponse().load(self.home_stats)
+        get_schema(HomeResponse).load(self.home_stats)
 
         self.logger.info(f"Collected home statistics in {time.perf_counter() - start:.2f}s")
 
-    def get_network_stats(self):
-        # Count the number of confirmed blocks
+    def get_chain_totals(self):
         sql = """
             SELECT
-                COUNT(*)
-            FROM blocks
-            WHERE
-                confirmed=true
+                key,
+                amount
+            FROM
+                chain_totals
         """
-        num_blocks = self.database.sql_return_one(re_sql(sql))
-        if num_blocks:
-            num_blocks = num_blocks[0]
-        else:
-            num_blocks = 0
+        result = self.database.sql_return_all(re_sql(sql))
+
+        chain_totals = {
+            "epoch": -1,
+            "num_blocks": 0,
+            "num_data_requests": 0,
+            "num_value_transfers": 0,
+            "supply_burned_lies": 0,
+        }
+        if result:
+            for key, amount in result:
+                chain_totals[key] = amount
+        return chain_totals
+
+    # Add the blocks and lies confirmed since the last run to the running totals
+    # Only epochs up to the first block which still needs confirmation are final, later epochs are added on a next run
+    def update_chain_totals(self):
+        chain_totals = self.get_chain_totals()
+        last_epoch = chain_totals["epoch"]
 
-        # Count the total number of data requests included in all confirmed blocks
         sql = """
             SELECT
-                SUM(data_request)
-            FROM blocks
+                (
+                    SELECT
+                        MAX(epoch)
+                    FROM
+                        blocks
+                    WHERE
+                        confirmed=true
+                    AND
+                        epoch > %s
+                ),
+                (
+                    SELECT
+                        MIN(epoch)
+                    FROM
+                        blocks
+                    WHERE
+                        confirmed=false
+                    AND
+                        reverted=false
+                    AND
+                        epoch > %s
+                )
+        """ % (last_epoch, last_epoch)
+        last_confirmed_epoch, first_unconfirmed_epoch = self.database.sql_return_one(re_sql(sql))
+        if last_confirmed_epoch is None:
+            return chain_totals
+
+        epoch = last_confirmed_epoch
+        if first_unconfirmed_epoch is not None:
+            epoch = min(epoch, first_unconfirmed_epoch - 1)
+        if epoch <= last_epoch:
+            return chain_totals
+
+        # Count the blocks, data requests and value transfers in the newly confirmed blocks
+        sql = """
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(data_request), 0),
+                COALESCE(SUM(value_transfer), 0)
+            FROM
+                blocks
             WHERE
-                blocks.confirmed=true
-        """
-        num_data_requests = self.database.sql_return_one(re_sql(sql))
-        if num_data_requests:
-            num_data_requests = num_data_requests[0]
-        else:
-            num_data_requests = 0
+                confirmed=true
+            AND
+                epoch BETWEEN %s AND %s
+        """ % (last_epoch + 1, epoch)
+        num_blocks, num_data_requests, num_value_transfers = self.database.sql_return_one(re_sql(sql))
 
-        # Count the total number of value transfers included in all confirmed blocks
+        # Sum the collateral lost by liars in the newly confirmed tallies since the activation of WIP0027
         sql = """
             SELECT
-                SUM(value_transfer)
-            FROM blocks
+                COALESCE(SUM(data_request_txns.collateral * CARDINALITY(tally_txns.liar_addresses)), 0)::BIGINT
+            FROM
+                tally_txns
+            INNER JOIN
+                blocks
+            ON
+                blocks.epoch = tally_txns.epoch
+            INNER JOIN
+                data_request_txns
+            ON
+                data_request_txns.txn_hash = tally_txns.data_request
             WHERE
-                blocks.confirmed=true
+                blocks.confirmed = true
+            AND
+                tally_txns.epoch BETWEEN %s AND %s
+            AND
+                data_request_txns.epoch >= %s
+        """ % (last_epoch + 1, epoch, self.wip0027_activation_epoch)
+        supply_burned_lies = self.database.sql_return_one(re_sql(sql))[0]
+
+        chain_totals = {
+            "epoch": epoch,
+            "num_blocks": chain_totals["num_blocks"] + num_blocks,
+            "num_data_requests": chain_totals["num_data_requests"] + num_data_requests,
+            "num_value_transfers": chain_totals["num_value_transfers"] + num_value_transfers,
+            "supply_burned_lies": chain_totals["supply_burned_lies"] + supply_burned_lies,
+        }
+
+        # Save all totals in a single transaction so they always match the saved epoch
+        sql = """
+            INSERT INTO chain_totals(
+                key,
+                amount
+            ) VALUES (%s, %s)
+            ON CONFLICT ON CONSTRAINT
+                chain_totals_pkey
+            DO UPDATE SET
+                amount=EXCLUDED.amount
         """
-        num_value_transfers = self.database.sql_return_one(re_sql(sql))
-        if num_value_transfers:
-            num_value_transfers = num_value_transfers[0]
-        else:
-            num_value_transfers = 0
+        self.database.sql_execute_many(re_sql(sql), list(chain_totals.items()))
+
+        return chain_totals
 
+    def get_network_stats(self):
         # Fetch all reputation statistics from a witnet node
         # On error: use the previous active and reputed nodes
         # On success:
@@ -145,12 +232,12 @@ class HomeStats(Client):
             pending_requests = pending_requests["result"]
             num_pending_requests = len(pending_requests["data_request"]) + len(pending_requests["value_transfer"])
 
-        return HomeNetworkStats().load(
+        return get_schema(HomeNetworkStats).load(
             {
                 "epochs": self.current_epoch,
-                "num_blocks": num_blocks,
-                "num_data_requests": num_data_requests,
-                "num_value_transfers": num_value_transfers,
+                "num_blocks": self.chain_totals["num_blocks"],
+                "num_data_requests": self.chain_totals["num_data_requests"],
+                "num_value_transfers": self.chain_totals["num_value_transfers"],
                 "num_active_nodes": num_active_nodes,
                 "num_reputed_nodes": num_reputed_nodes,
                 "num_pending_requests": num_pending_requests,
@@ -171,33 +258,11 @@ class HomeStats(Client):
 
             supply_info["current_supply"] = supply_info["current_unlocked_supply"] + supply_info["current_locked_supply"]
 
-            sql = """
-                SELECT
-                    data_request_txns.collateral,
-                    tally_txns.liar_addresses
-                FROM
-                    data_request_txns
-                INNER JOIN
-                    blocks
-                ON
-                    blocks.epoch = data_request_txns.epoch
-                INNER JOIN
-                    tally_txns
-                ON
-                    data_request_txns.txn_hash = tally_txns.data_request
-                WHERE
-                    blocks.confirmed = true
-                AND
-                    blocks.epoch >= %s
-            """ % self.wip0027_activation_epoch
-            self.database.reset_cursor()
-            burn_rate_data = self.database.sql_return_all(re_sql(sql))
-
-            supply_info["supply_burned_lies"] = sum(collateral * len(liar_addresses) for collateral, liar_addresses in burn_rate_data)
+            supply_info["supply_burned_lies"] = self.chain_totals["supply_burned_lies"]
 
             supply_info["total_supply"] = supply_info["maximum_supply"] - supply_info["blocks_missing_reward"] - supply_info["supply_burned_lies"]
 
-            return NetworkSupply().load(supply_info)
+            return get_schema(NetworkSupply).load(supply_info)
 
     def get_latest_blocks(self):
         # Fetch the last 32 blocks + metadata from the database
@@ -222,7 +287,7 @@ class HomeStats(Client):
         for block_hash, data_request, value_transfer, epoch, confirmed in result:
             timestamp = self.start_time + (epoch + 1) * self.epoch_period
             blocks.append(
-                HomeBlock().load(
+                get_schema(HomeBlock).load(
                     {
                         "hash": block_hash.hex(),
                         "data_request": data_request,
@@ -261,7 +326,7 @@ class HomeStats(Client):
             for txn_hash, epoch, block_confirmed in result:
                 timestamp = self.start_time + (epoch + 1) * self.epoch_period
                 data_requests.append(
-                    HomeTransaction().load(
+                    get_schema(HomeTransaction).load(
                         {
                             "hash": txn_hash.hex(),
                             "timestamp": timestamp,
@@ -298,7 +363,7 @@ class HomeStats(Client):
             for txn_hash, epoch, block_confirmed in result:
                 timestamp = self.start_time + (epoch + 1) * self.epoch_period
                 value_transfers.append(
-                    HomeTransaction().load(
+                    get_schema(HomeTransaction).load(
                         {
                             "hash": txn_hash.hex(),
                             "timestamp": timestamp,
@@ -318,6 +383,13 @@ class HomeStats(Client):
         except pylibmc.TooBig as e:
             self.logger.warning("Could not save items in cache because the item size exceeded 1MB")
 
+# Home statistics only describe the latest state of the blockchain, so blockchain events trigger a regular refresh
+def run(config, connections=None, events=None):
+    # Create home cache
+    home_cache = HomeStats(config, connections=connections)
+    home_cache.collect_home_stats()
+    home_cache.save_home_stats()
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
@@ -330,10 +402,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create home cache
-    home_cache = HomeStats(config)
-    home_cache.collect_home_stats()
-    home_cache.save_home_stats()
+    run(config)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
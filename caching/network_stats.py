@@ -1,27 +1,30 @@
 import json
 import numpy
 import optparse
+import os
 import sys
 import time
 import toml
 
 from caching.client import Client
-from caching.network_stats_functions import aggregate_nodes, read_from_database
-from blockchain.objects.wip import WIP
+from caching.node_index import NodeIndex, get_node_index_filename
+from caching.network_stats_functions import read_from_database
 
 from util.data_transformer import re_sql
 from util.common_functions import calculate_block_reward
 from util.logger import configure_logger
 
 class NetworkStats(Client):
-    def __init__(self, config, reset):
+    def __init__(self, config, reset, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["network_stats"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["network_stats"]["level_file"]
         self.logger = configure_logger("network", log_filename, log_level)
 
         timeout = config["api"]["caching"]["scripts"]["network_stats"]["node_timeout"]
-        super().__init__(config, node_timeout=timeout, named_cursor=True)
+        super().__init__(config, node_timeout=timeout, named_cursor=True, connections=connections)
+
+        self.reset = reset
 
         # Assign some of the consensus constants
         self.start_time = self.consensus_constants.checkpoint_zero_timestamp
@@ -32,7 +35,10 @@ class NetworkStats(Client):
         # Granularity at which network statistics are aggregated
         self.aggregation_epochs = config["api"]["caching"]["scripts"]["network_stats"]["aggregation_epochs"]
 
-        self.wips = WIP(database_config=config["database"], node_config=config["node-pool"])
+        # Directory where the per-period miner and data request solver indexes are saved (optional)
+        self.index_directory = config["api"]["caching"]["scripts"]["network_stats"].get("index_directory", None)
+
+        self.wips = self.get_wip(self.database_client)
 
         self.last_update_time = int(time.time())
 
@@ -75,12 +81,12 @@ class NetworkStats(Client):
         start_inner = time.perf_counter()
         self.logger.info("Calculating miner statistics")
         self.get_miners_per_period(reset)
-        self.logger.info(f"Calculated {self.unique_miners['amount']} miners in {time.perf_counter() - start_inner:.2f}s")
+        self.logger.info(f"Calculated statistics for {len(self.unique_miners['deltas'])} active miners in {time.perf_counter() - start_inner:.2f}s")
 
         start_inner = time.perf_counter()
         self.logger.info("Calculating data request solver statistics")
         self.get_data_request_solvers_per_period(reset)
-        self.logger.info(f"Calculated {self.unique_data_request_solvers['amount']} data request solvers in {time.perf_counter() - start_inner:.2f}s")
+        self.logger.info(f"Calculated statistics for {len(self.unique_data_request_solvers['deltas'])} active data request solvers in {time.perf_counter() - start_inner:.2f}s")
 
         start_inner = time.perf_counter()
         self.logger.info("Calculating data request statistics")
@@ -117,6 +123,9 @@ class NetworkStats(Client):
             keys.append((period, period + self.aggregation_epochs))
         return keys
 
+    def get_period_key(self, period):
+        return (period * self.aggregation_epochs, (period + 1) * self.aggregation_epochs)
+
     def get_rollbacks(self, reset):
         # Fetch previous rollbacks (unless reset was set)
         self.rollbacks = []
@@ -128,67 +137,78 @@ class NetworkStats(Client):
 
         self.logger.info(f"Calculating rollbacks statistics from epoch {self.last_processed_epoch} to {self.last_confirmed_epoch}")
 
-        # Fetch all confirmed blocks
+        # Find all gaps of more than 1 epoch between two consecutive confirmed blocks, we mark them as a rollback
         sql = """
+            WITH confirmed_blocks AS (
+                SELECT
+                    epoch,
+                    LAG(epoch, 1, %s) OVER (ORDER BY epoch) AS previous_epoch
+                FROM
+                    blocks
+                WHERE
+                    confirmed = true
+                AND
+                    epoch BETWEEN %s AND %s
+            )
             SELECT
+                previous_epoch,
                 epoch
+            FROM
+                confirmed_blocks
+            WHERE
+                epoch > previous_epoch + 1
+        """ % (self.last_processed_epoch, self.last_processed_epoch, self.last_confirmed_epoch)
+        self.database.reset_cursor()
+        gaps = self.database.sql_return_all(re_sql(sql))
+
+        for previous_epoch, epoch in gaps or []:
+            # Calculate the timestamp of the rollback and its boundaries
+            timestamp = self.start_time + (previous_epoch + 1) * self.epoch_period
+            self.rollbacks.append([timestamp, previous_epoch + 1, epoch - 1, epoch - previous_epoch - 1])
+
+        # Save the last seen epoch
+        sql = """
+            SELECT
+                MAX(epoch)
             FROM
                 blocks
             WHERE
                 confirmed = true
             AND
                 epoch BETWEEN %s AND %s
-            ORDER BY
-                epoch
-            ASC
         """ % (self.last_processed_epoch, self.last_confirmed_epoch)
         self.database.reset_cursor()
-        epoch_data = self.database.sql_return_all(re_sql(sql))
-
-        previous_epoch = self.last_processed_epoch
-        for epoch in epoch_data:
-            epoch = epoch[0]
-
-            # If there is a gap of more than 1 epoch between two consecutive blocks, we mark it as a rollback
-            if epoch > previous_epoch + 1:
-                # Calculate the timestamp of the rollback and its boundaries
-                timestamp = self.start_time + (previous_epoch + 1) * self.epoch_period
-                self.rollbacks.append([timestamp, previous_epoch + 1, epoch - 1, epoch - previous_epoch - 1])
-            previous_epoch = epoch
-
-        # Save the last seen epoch
-        if epoch_data and epoch > self.last_processed_epoch:
-            self.last_processed_epoch = epoch
+        last_epoch = self.database.sql_return_one(re_sql(sql))
+        if last_epoch and last_epoch[0] is not None and last_epoch[0] > self.last_processed_epoch:
+            self.last_processed_epoch = last_epoch[0]
 
         # List rollbacks in reverse order
         self.rollbacks = sorted(self.rollbacks, reverse=True)
 
     def get_miners_per_period(self, reset):
         # Read data from database (unless reset was set)
+        # Only the periods which will be updated are required, the global statistics are kept in the network_stats_nodes table
         epoch = 0
-        self.unique_miners = {"amount": 0, "top-100": {}, "per-period": {}}
+        self.unique_miners = {"amount": 0, "top-100": {}, "per-period": {}, "deltas": {}}
         if not reset:
-            epoch, miner_data = read_from_database("miners", self.aggregation_epochs, self.database_client, all_periods=True)
+            epoch, miner_data = read_from_database("miners", self.aggregation_epochs, self.database_client)
             for md in miner_data:
-                if md[0] != None and md[1] != None:
-                    self.unique_miners["per-period"][(md[0], md[1])] = md[2]
-                else:
-                    self.unique_miners["amount"] = md[2]["amount"]
-                    self.unique_miners["top-100"] = md[2]["top-100"]
+                self.unique_miners["per-period"][(md[0], md[1])] = md[2]
 
         self.logger.info(f"Calculating miners statistics from epoch {epoch} to {self.last_confirmed_epoch}")
 
         # Add all keys upfront to make sure periods without data are initialized as empty
-        for key in self.construct_keys(0, self.last_confirmed_epoch):
+        for key in self.construct_keys(epoch, self.last_confirmed_epoch):
             if key not in self.unique_miners["per-period"]:
                 self.unique_miners["per-period"][key] = {}
 
-        # Fetch all confirmed mint transactions (as a proxy for blocks)
+        # Count the confirmed mint transactions (as a proxy for blocks) per miner and aggregation period
         sql = """
             SELECT
-                blocks.epoch,
+                blocks.epoch / %s AS period,
                 mint_txns.miner,
-                addresses.id
+                addresses.id,
+                COUNT(*)
             FROM
                 mint_txns
             LEFT JOIN
@@ -203,69 +223,63 @@ class NetworkStats(Client):
                 blocks.confirmed = true
             AND
                 blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                blocks.epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+            GROUP BY
+                period,
+                mint_txns.miner,
+                addresses.id
+        """ % (self.aggregation_epochs, epoch, self.last_confirmed_epoch)
         self.database.reset_cursor()
         miners = self.database.sql_return_all(re_sql(sql))
 
         if miners == None:
             return
 
-        updated_keys = []
-
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-        updated_keys.append(per_period_key)
+        updated_keys = set([self.get_period_key(int(epoch / self.aggregation_epochs))])
 
-        for epoch, miner, miner_id in miners:
+        for period, miner, miner_id, blocks in miners:
             if miner_id == None:
                 self.logger.warning(f"No id for address {miner}")
                 miner_id = miner
 
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-                updated_keys.append(per_period_key)
+            per_period_key = self.get_period_key(period)
+            updated_keys.add(per_period_key)
 
             # Create histogram
             if miner_id in self.unique_miners["per-period"][per_period_key]:
-                self.unique_miners["per-period"][per_period_key][miner_id] += 1
+                self.unique_miners["per-period"][per_period_key][miner_id] += blocks
             else:
-                self.unique_miners["per-period"][per_period_key][miner_id] = 1
+                self.unique_miners["per-period"][per_period_key][miner_id] = blocks
 
-        self.unique_miners["amount"], self.unique_miners["top-100"] = aggregate_nodes(self.unique_miners["per-period"].values())
+            # Track the new blocks per miner to update the running totals
+            if isinstance(miner_id, int):
+                self.unique_miners["deltas"][miner_id] = self.unique_miners["deltas"].get(miner_id, 0) + blocks
 
         self.unique_miners["per-period"] = {per_period_key: self.unique_miners["per-period"][per_period_key] for per_period_key in self.unique_miners["per-period"].keys() if per_period_key in updated_keys}
 
     def get_data_request_solvers_per_period(self, reset):
         # Read data from database (unless reset was set)
+        # Only the periods which will be updated are required, the global statistics are kept in the network_stats_nodes table
         epoch = 0
-        self.unique_data_request_solvers = {"amount": 0, "top-100": {}, "per-period": {}}
+        self.unique_data_request_solvers = {"amount": 0, "top-100": {}, "per-period": {}, "deltas": {}}
         if not reset:
-            epoch, solver_data = read_from_database("data_request_solvers", self.aggregation_epochs, self.database_client, all_periods=True)
+            epoch, solver_data = read_from_database("data_request_solvers", self.aggregation_epochs, self.database_client)
             for sd in solver_data:
-                if sd[0] != None and sd[1] != None:
-                    self.unique_data_request_solvers["per-period"][(sd[0], sd[1])] = sd[2]
-                else:
-                    self.unique_data_request_solvers["amount"] = sd[2]["amount"]
-                    self.unique_data_request_solvers["top-100"] = sd[2]["top-100"]
+                self.unique_data_request_solvers["per-period"][(sd[0], sd[1])] = sd[2]
 
         self.logger.info(f"Calculating data request solver statistics from epoch {epoch} to {self.last_confirmed_epoch}")
 
         # Add all keys upfront to make sure periods without data are initialized as empty
-        for key in self.construct_keys(0, self.last_confirmed_epoch):
+        for key in self.construct_keys(epoch, self.last_confirmed_epoch):
             if key not in self.unique_data_request_solvers["per-period"]:
                 self.unique_data_request_solvers["per-period"][key] = {}
 
-        # Fetch all confirmed commit transactions
+        # Count the confirmed commit transactions per data request solver and aggregation period
         sql = """
             SELECT
-                blocks.epoch,
+                blocks.epoch / %s AS period,
                 commit_txns.txn_address,
-                addresses.id
+                addresses.id,
+                COUNT(*)
             FROM
                 commit_txns
             LEFT JOIN
@@ -280,40 +294,36 @@ class NetworkStats(Client):
                 blocks.confirmed = true
             AND
                 blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+            GROUP BY
+                period,
+                commit_txns.txn_address,
+                addresses.id
+        """ % (self.aggregation_epochs, epoch, self.last_confirmed_epoch)
         self.database.reset_cursor()
         data_request_solvers = self.database.sql_return_all(re_sql(sql))
 
         if data_request_solvers == None:
             return
 
-        updated_keys = []
-
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-        updated_keys.append(per_period_key)
+        updated_keys = set([self.get_period_key(int(epoch / self.aggregation_epochs))])
 
-        for epoch, data_request_solver, data_request_solver_id in data_request_solvers:
+        for period, data_request_solver, data_request_solver_id, commits in data_request_solvers:
             if data_request_solver_id == None:
                 self.logger.warning(f"No id for address {data_request_solver}")
                 data_request_solver_id = data_request_solver
 
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-                updated_keys.append(per_period_key)
+            per_period_key = self.get_period_key(period)
+            updated_keys.add(per_period_key)
 
             # Create histogram
             if data_request_solver_id in self.unique_data_request_solvers["per-period"][per_period_key]:
-                self.unique_data_request_solvers["per-period"][per_period_key][data_request_solver_id] += 1
+                self.unique_data_request_solvers["per-period"][per_period_key][data_request_solver_id] += commits
             else:
-                self.unique_data_request_solvers["per-period"][per_period_key][data_request_solver_id] = 1
+                self.unique_data_request_solvers["per-period"][per_period_key][data_request_solver_id] = commits
 
-        self.unique_data_request_solvers["amount"], self.unique_data_request_solvers["top-100"] = aggregate_nodes(self.unique_data_request_solvers["per-period"].values())
+            # Track the new commits per data request solver to update the running totals
+            if isinstance(data_request_solver_id, int):
+                self.unique_data_request_solvers["deltas"][data_request_solver_id] = self.unique_data_request_solvers["deltas"].get(data_request_solver_id, 0) + commits
 
         self.unique_data_request_solvers["per-period"] = {per_period_key: self.unique_data_request_solvers["per-period"][per_period_key] for per_period_key in self.unique_data_request_solvers["per-period"].keys() if per_period_key in updated_keys}
 
@@ -340,15 +350,15 @@ class NetworkStats(Client):
                     {}, # Collateral histogram
                 ]
 
-        # Fetch all confirmed data requests and (part of) their metadata
+        # Count the confirmed data requests, their success rate and their retrieval kinds per aggregation period
         sql = """
             SELECT
-                blocks.epoch,
-                data_request_txns.witnesses,
-                data_request_txns.witness_reward,
-                data_request_txns.collateral,
-                data_request_txns.kinds,
-                tally_txns.success
+                blocks.epoch / %s AS period,
+                COUNT(*),
+                COUNT(*) FILTER (WHERE tally_txns.success = true),
+                SUM(CARDINALITY(ARRAY_POSITIONS(data_request_txns.kinds, 'HTTP-GET')))::BIGINT,
+                SUM(CARDINALITY(ARRAY_POSITIONS(data_request_txns.kinds, 'HTTP-POST')))::BIGINT,
+                SUM(CARDINALITY(ARRAY_POSITIONS(data_request_txns.kinds, 'RNG')))::BIGINT
             FROM
                 data_request_txns
             LEFT JOIN
@@ -363,50 +373,56 @@ class NetworkStats(Client):
                 blocks.confirmed = true
             AND
                 blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+            GROUP BY
+                period
+        """ % (self.aggregation_epochs, epoch, self.last_confirmed_epoch)
         self.database.reset_cursor()
         data_requests = self.database.sql_return_all(re_sql(sql))
 
         if data_requests == None:
             return
 
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-        for epoch, witnesses, witness_reward, collateral, kinds, success in data_requests:
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-            # Create data structure
-            self.data_requests_period[per_period_key][0] += 1
-
-            if success:
-                self.data_requests_period[per_period_key][1] += 1
-
-            kinds = kinds[1:-1].split(",")
-            self.data_requests_period[per_period_key][2] += sum(1 for kind in kinds if kind == "HTTP-GET")
-            self.data_requests_period[per_period_key][3] += sum(1 for kind in kinds if kind == "HTTP-POST")
-            self.data_requests_period[per_period_key][4] += sum(1 for kind in kinds if kind == "RNG")
-
-            if witnesses in self.data_requests_period[per_period_key][5]:
-                self.data_requests_period[per_period_key][5][witnesses] += 1
-            else:
-                self.data_requests_period[per_period_key][5][witnesses] = 1
-
-            if witness_reward in self.data_requests_period[per_period_key][6]:
-                self.data_requests_period[per_period_key][6][witness_reward] += 1
-            else:
-                self.data_requests_period[per_period_key][6][witness_reward] = 1
+        for period, amount, success, http_get, http_post, rng in data_requests:
+            per_period_key = self.get_period_key(period)
+            self.data_requests_period[per_period_key][0] += amount
+            self.data_requests_period[per_period_key][1] += success
+            self.data_requests_period[per_period_key][2] += http_get
+            self.data_requests_period[per_period_key][3] += http_post
+            self.data_requests_period[per_period_key][4] += rng
+
+        # Build the witness, witness reward and collateral histograms per aggregation period
+        for idx, column in ((5, "witnesses"), (6, "witness_reward"), (7, "collateral")):
+            sql = """
+                SELECT
+                    blocks.epoch / %s AS period,
+                    data_request_txns.%s,
+                    COUNT(*)
+                FROM
+                    data_request_txns
+                LEFT JOIN
+                    blocks
+                ON
+                    blocks.epoch = data_request_txns.epoch
+                WHERE
+                    blocks.confirmed = true
+                AND
+                    blocks.epoch BETWEEN %s AND %s
+                GROUP BY
+                    period,
+                    data_request_txns.%s
+            """ % (self.aggregation_epochs, column, epoch, self.last_confirmed_epoch, column)
+            self.database.reset_cursor()
+            histogram_data = self.database.sql_return_all(re_sql(sql))
+
+            if histogram_data == None:
+                continue
 
-            if collateral in self.data_requests_period[per_period_key][7]:
-                self.data_requests_period[per_period_key][7][collateral] += 1
-            else:
-                self.data_requests_period[per_period_key][7][collateral] = 1
+            for period, value, amount in histogram_data:
+                histogram = self.data_requests_period[self.get_period_key(period)][idx]
+                if value in histogram:
+                    histogram[value] += amount
+                else:
+                    histogram[value] = amount
 
     def get_lie_rates_per_period(self, reset):
         # Read data from database (unless reset was set)
@@ -427,119 +443,109 @@ class NetworkStats(Client):
                     0,  # Amount of lies (out-of-consensus values)
                 ]
 
-        # Fetch commit counts per data request
-        sql = """
-            SELECT
-                commit_txns.data_request,
-                COUNT(commit_txns.data_request) as reveal_count
-            FROM
-                commit_txns
-            LEFT JOIN
-                blocks
-            ON
-                blocks.epoch = commit_txns.epoch
-            WHERE
-                blocks.epoch BETWEEN %s AND %s
-            AND
-                blocks.confirmed=true
-            GROUP BY
-                commit_txns.data_request
-        """ % (epoch, self.last_confirmed_epoch)
-        self.database.reset_cursor()
-        commit_data = self.database.sql_return_all(re_sql(sql))
-
-        number_of_commits = {}
-        for txn_hash, commits in commit_data:
-            number_of_commits[txn_hash.hex()] = commits
-
-        # Fetch reveal counts per data request
+        # Join the commit and reveal counts of every data request with its tally and aggregate them per period
+        # Data requests without commits are still being processed or had an insufficient amount of commits, these are not counted
         sql = """
+            WITH commit_counts AS (
+                SELECT
+                    commit_txns.data_request,
+                    COUNT(*) AS commits
+                FROM
+                    commit_txns
+                LEFT JOIN
+                    blocks
+                ON
+                    blocks.epoch = commit_txns.epoch
+                WHERE
+                    blocks.epoch BETWEEN %s AND %s
+                AND
+                    blocks.confirmed=true
+                GROUP BY
+                    commit_txns.data_request
+            ), reveal_counts AS (
+                SELECT
+                    reveal_txns.data_request,
+                    COUNT(*) AS reveals
+                FROM
+                    reveal_txns
+                LEFT JOIN
+                    blocks
+                ON
+                    blocks.epoch = reveal_txns.epoch
+                WHERE
+                    blocks.epoch BETWEEN %s AND %s
+                AND
+                    blocks.confirmed=true
+                GROUP BY
+                    reveal_txns.data_request
+            ), witnessing_acts AS (
+                SELECT
+                    blocks.epoch / %s AS period,
+                    data_request_txns.witnesses,
+                    CARDINALITY(tally_txns.error_addresses) AS errors,
+                    CARDINALITY(tally_txns.liar_addresses) AS liars,
+                    commit_counts.commits,
+                    COALESCE(reveal_counts.reveals, 0) AS reveals
+                FROM
+                    tally_txns
+                INNER JOIN
+                    blocks
+                ON
+                    blocks.epoch = tally_txns.epoch
+                INNER JOIN
+                    data_request_txns
+                ON
+                    data_request_txns.txn_hash = tally_txns.data_request
+                INNER JOIN
+                    commit_counts
+                ON
+                    commit_counts.data_request = tally_txns.data_request
+                LEFT JOIN
+                    reveal_counts
+                ON
+                    reveal_counts.data_request = tally_txns.data_request
+                WHERE
+                    blocks.confirmed = true
+                AND
+                    blocks.epoch BETWEEN %s AND %s
+            )
             SELECT
-                reveal_txns.data_request,
-                COUNT(reveal_txns.data_request) as reveal_count
+                period,
+                SUM(witnesses)::BIGINT,
+                SUM(errors)::BIGINT,
+                COALESCE(SUM(commits - reveals) FILTER (WHERE commits >= reveals), 0)::BIGINT,
+                COALESCE(SUM(liars - (commits - reveals)) FILTER (WHERE commits >= reveals AND liars >= commits - reveals), 0)::BIGINT,
+                COUNT(*) FILTER (WHERE commits < reveals),
+                COUNT(*) FILTER (WHERE commits >= reveals AND liars < commits - reveals)
             FROM
-                reveal_txns
-            LEFT JOIN
-                blocks
-            ON
-                blocks.epoch = reveal_txns.epoch
-            WHERE
-                blocks.epoch BETWEEN %s AND %s
-            AND
-                blocks.confirmed=true
+                witnessing_acts
             GROUP BY
-            reveal_txns.data_request
-        """ % (epoch, self.last_confirmed_epoch)
-        self.database.reset_cursor()
-        reveal_data = self.database.sql_return_all(re_sql(sql))
-
-        number_of_reveals = {}
-        for txn_hash, reveals in reveal_data:
-            number_of_reveals[txn_hash.hex()] = reveals
-
-        # Fetch all confirmed data requests and (part of) their metadata
-        sql = """
-            SELECT
-                blocks.epoch,
-                data_request_txns.txn_hash,
-                data_request_txns.witnesses,
-                tally_txns.error_addresses,
-                tally_txns.liar_addresses
-            FROM
-                tally_txns
-            INNER JOIN
-                blocks
-            ON
-                blocks.epoch = tally_txns.epoch
-            INNER JOIN
-                data_request_txns
-            ON
-                data_request_txns.txn_hash = tally_txns.data_request
-            WHERE
-                blocks.confirmed = true
-            AND
-                blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                blocks.epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+                period
+        """ % (
+            epoch, self.last_confirmed_epoch,
+            epoch, self.last_confirmed_epoch,
+            self.aggregation_epochs,
+            epoch, self.last_confirmed_epoch,
+        )
         self.database.reset_cursor()
         lie_rate_data = self.database.sql_return_all(re_sql(sql))
 
         if lie_rate_data == None:
             return
 
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
+        for period, witnesses, errors, no_reveals, out_of_consensus, invalid_reveals, invalid_liars in lie_rate_data:
+            per_period_key = self.get_period_key(period)
 
-        for epoch, txn_hash, witnesses, error_addresses, liar_addresses in lie_rate_data:
-            txn_hash = txn_hash.hex()
-
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-            # No commits found because the data request is still being processed or it had an insufficient amount of commits
-            # Don't count this data request into the statistics
-            commits = number_of_commits.get(txn_hash, 0)
-            if commits == 0:
-                continue
+            if invalid_reveals > 0:
+                self.logger.error(f"Amount of commits is smaller than the amount of reveals for {invalid_reveals} data requests in period {per_period_key}")
+            if invalid_liars > 0:
+                self.logger.error(f"Amount of liar addresses is smaller than the amount of no-reveal-liars for {invalid_liars} data requests in period {per_period_key}")
 
             # Create data structure
             self.lie_rates_period[per_period_key][0] += witnesses
-            self.lie_rates_period[per_period_key][1] += len(error_addresses)
-
-            reveals = number_of_reveals.get(txn_hash, 0)
-            if commits - reveals < 0:
-                self.logger.error(f"Amount of commits is smaller than the amount of reveals at: ({epoch}, {txn_hash}, {commits}, {reveals}, {len(liar_addresses)}, {commits - reveals})")
-                continue
-            self.lie_rates_period[per_period_key][2] += commits - reveals
-
-            if len(liar_addresses) - (commits - reveals) < 0:
-                self.logger.error(f"Amount of liar addresses is smaller than the amount of no-reveal-liars at: ({epoch}, {txn_hash}, {commits}, {reveals}, {len(liar_addresses)}, {commits - reveals})")
-                continue
-            self.lie_rates_period[per_period_key][3] += len(liar_addresses) - (commits - reveals)
+            self.lie_rates_period[per_period_key][1] += errors
+            self.lie_rates_period[per_period_key][2] += no_reveals
+            self.lie_rates_period[per_period_key][3] += out_of_consensus
 
     def get_burn_rate_per_period(self, reset):
         # Read data from database (unless reset was set)
@@ -558,20 +564,59 @@ class NetworkStats(Client):
                     0,  # Burn rate data request lies
                 ]
 
-        # Fetch all blocks and data requests
+        # Count the reverted epochs between consecutive confirmed blocks per aggregation period
+        # The block reward is calculated based on the epoch of the confirmed block following the reverted epochs
+        sql = """
+            WITH confirmed_blocks AS (
+                SELECT
+                    epoch,
+                    LAG(epoch, 1, %s) OVER (ORDER BY epoch) AS previous_epoch
+                FROM
+                    blocks
+                WHERE
+                    confirmed = true
+                AND
+                    epoch BETWEEN %s AND %s
+            )
+            SELECT
+                reverted_epoch / %s AS period,
+                epoch,
+                COUNT(*)
+            FROM
+                confirmed_blocks,
+                GENERATE_SERIES(previous_epoch + 1, epoch - 1) AS reverted_epoch
+            WHERE
+                epoch > previous_epoch + 1
+            GROUP BY
+                period,
+                epoch
+        """ % (epoch, epoch, self.last_confirmed_epoch, self.aggregation_epochs)
+        self.database.reset_cursor()
+        reverted_data = self.database.sql_return_all(re_sql(sql))
+
+        if reverted_data == None:
+            return
+
+        for period, block_epoch, reverted_epochs in reverted_data:
+            block_reward = calculate_block_reward(block_epoch, self.halving_period, self.initial_block_reward)
+            self.burn_rate_period[self.get_period_key(period)][0] += reverted_epochs * block_reward
+
+        # Sum the collateral burned by lying nodes per aggregation period, this only happens since WIP0027
+        wip0027_epoch = self.wips.get_activation_epoch("WIP0027")
+        if wip0027_epoch is None:
+            return
+
         sql = """
             SELECT
-                blocks.epoch,
-                data_request_txns.txn_hash,
-                data_request_txns.collateral,
-                tally_txns.liar_addresses
+                blocks.epoch / %s AS period,
+                SUM(CARDINALITY(tally_txns.liar_addresses) * data_request_txns.collateral)::BIGINT
             FROM
                 blocks
-            LEFT JOIN
+            INNER JOIN
                 data_request_txns
             ON
                 blocks.epoch = data_request_txns.epoch
-            LEFT JOIN
+            INNER JOIN
                 tally_txns
             ON
                 data_request_txns.txn_hash = tally_txns.data_request
@@ -579,49 +624,17 @@ class NetworkStats(Client):
                 blocks.confirmed = true
             AND
                 blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                blocks.epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+            GROUP BY
+                period
+        """ % (self.aggregation_epochs, max(epoch, wip0027_epoch), self.last_confirmed_epoch)
         self.database.reset_cursor()
         burn_rate_data = self.database.sql_return_all(re_sql(sql))
 
         if burn_rate_data == None:
             return
 
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-        previous_epoch = epoch
-        for epoch, txn_hash, collateral, liar_addresses in burn_rate_data:
-            # First calculate burn because of the reverted blocks
-            if epoch > previous_epoch + 1:
-                for e in range(previous_epoch + 1, epoch):
-                    # Check if the next aggregation period was reached
-                    if e >= next_aggregation_period:
-                        next_aggregation_period = int(e / self.aggregation_epochs + 1) * self.aggregation_epochs
-                        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-                    block_reward = calculate_block_reward(epoch, self.halving_period, self.initial_block_reward)
-                    self.burn_rate_period[per_period_key][0] += block_reward
-
-            previous_epoch = epoch
-
-            if not self.wips.is_wip0027_active(epoch):
-                continue
-
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-            # Add liar burn rate
-            num_liar_addresses = 0
-            if liar_addresses and len(liar_addresses) > 0:
-                num_liar_addresses = len(liar_addresses)
-            if collateral is None:
-                collateral = 0
-            self.burn_rate_period[per_period_key][1] += num_liar_addresses * collateral
+        for period, burned_collateral in burn_rate_data:
+            self.burn_rate_period[self.get_period_key(period)][1] += burned_collateral
 
     def get_value_transfers_per_period(self, reset):
         # Read data from database (unless reset was set)
@@ -637,11 +650,11 @@ class NetworkStats(Client):
             if key not in self.value_transfers_period:
                 self.value_transfers_period[key] = [0]
 
-        # Fetch value transfer data
+        # Count the confirmed value transfers per aggregation period
         sql = """
             SELECT
-                blocks.epoch,
-                value_transfer_txns.txn_hash
+                blocks.epoch / %s AS period,
+                COUNT(*)
             FROM
                 value_transfer_txns
             LEFT JOIN
@@ -652,27 +665,17 @@ class NetworkStats(Client):
                 blocks.confirmed = true
             AND
                 blocks.epoch BETWEEN %s AND %s
-            ORDER BY
-                epoch
-            ASC
-        """ % (epoch, self.last_confirmed_epoch)
+            GROUP BY
+                period
+        """ % (self.aggregation_epochs, epoch, self.last_confirmed_epoch)
         self.database.reset_cursor()
         value_transfers = self.database.sql_return_all(re_sql(sql))
 
         if value_transfers == None:
             return
 
-        next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-        per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-        for epoch, value_transfer in value_transfers:
-            # Check if the next aggregation period was reached
-            if epoch >= next_aggregation_period:
-                next_aggregation_period = int(epoch / self.aggregation_epochs + 1) * self.aggregation_epochs
-                per_period_key = (next_aggregation_period - self.aggregation_epochs, next_aggregation_period)
-
-            # Create data structure
-            self.value_transfers_period[per_period_key][0] += 1
+        for period, amount in value_transfers:
+            self.value_transfers_period[self.get_period_key(period)][0] += amount
 
     def get_staking_stats(self):
         # Find active and reputed identities
@@ -714,43 +717,128 @@ class NetworkStats(Client):
             "trs": [int(value) for value in numpy.percentile(trs_balances, percentiles)],
         }
 
-    def save_network(self):
-        start = time.perf_counter()
+    def initialize_node_totals(self, cursor, stat):
+        sql = """
+            SELECT
+                1
+            FROM
+                network_stats_nodes
+            WHERE
+                stat = %s
+            LIMIT 1
+        """
+        cursor.execute(re_sql(sql), (stat,))
+        if cursor.fetchone():
+            return
 
-        self.logger.info("Saving all data in our database instance")
+        # Seed the running totals once from the previously saved per-period statistics
+        self.logger.info(f"Initializing running totals for {stat} from the per-period statistics")
+        sql = """
+            INSERT INTO network_stats_nodes(
+                stat,
+                address_id,
+                amount
+            )
+            SELECT
+                network_stats.stat,
+                nodes.key::INT,
+                SUM(nodes.value::INT)
+            FROM
+                network_stats,
+                JSONB_EACH_TEXT(network_stats.data) AS nodes
+            WHERE
+                network_stats.stat = %s
+            AND
+                network_stats.from_epoch IS NOT NULL
+            AND
+                nodes.key ~ '^[0-9]+$'
+            GROUP BY
+                network_stats.stat,
+                nodes.key::INT
+        """
+        cursor.execute(re_sql(sql), (stat,))
+
+    def update_node_totals(self, cursor, stat, deltas):
+        if self.reset:
+            sql = """
+                DELETE FROM
+                    network_stats_nodes
+                WHERE
+                    stat = %s
+            """
+            cursor.execute(re_sql(sql), (stat,))
+        else:
+            self.initialize_node_totals(cursor, stat)
 
         sql = """
-            INSERT INTO network_stats(
+            INSERT INTO network_stats_nodes(
                 stat,
-                from_epoch,
-                to_epoch,
-                data
-            ) VALUES (%s, %s, %s, %s)
+                address_id,
+                amount
+            ) VALUES (%s, %s, %s)
             ON CONFLICT ON CONSTRAINT
-                network_stats_stat_from_epoch_to_epoch_key
+                network_stats_nodes_pkey
             DO UPDATE SET
-                data = EXCLUDED.data
+                amount = network_stats_nodes.amount + EXCLUDED.amount
         """
+        cursor.executemany(
+            re_sql(sql),
+            [(stat, address_id, amount) for address_id, amount in deltas.items()]
+        )
 
-        # Save single statistics since network inception
-        stats = [
-            ["epoch", self.last_processed_epoch],
-            ["rollbacks", self.rollbacks],
-            [
-                "miners",
-                {"amount": self.unique_miners["amount"], "top-100": self.unique_miners["top-100"]}
-            ],
-            [
-                "data_request_solvers",
-                {"amount": self.unique_data_request_solvers["amount"], "top-100": self.unique_data_request_solvers["top-100"]}
-            ],
-            ["staking", self.percentile_staking_balances],
-        ]
-        for lbl, stat in stats:
-            self.database_client.sql_insert_one(
-                re_sql(sql),
-                (lbl, None, None, json.dumps(stat))
-            )
+        sql = """
+            SELECT
+                COUNT(*)
+            FROM
+                network_stats_nodes
+            WHERE
+                stat = %s
+        """
+        cursor.execute(re_sql(sql), (stat,))
+        amount = cursor.fetchone()[0]
+
+        # Sort identically to aggregate_nodes: by amount and then by address id
+        sql = """
+            SELECT
+                address_id,
+                amount
+            FROM
+                network_stats_nodes
+            WHERE
+                stat = %s
+            ORDER BY
+                amount DESC,
+                address_id DESC
+            LIMIT 100
+        """
+        cursor.execute(re_sql(sql), (stat,))
+        top_100 = cursor.fetchall()
+
+        return amount, [(str(address_id), amount) for address_id, amount in top_100]
+
+    def save_network(self):
+        start = time.perf_counter()
+
+        self.logger.info("Saving all data in our database instance")
+
+        # The running totals only contain the deltas since the saved epoch, so they have to be committed together
+        # with the statistics and that epoch, otherwise a failed run would add the same deltas again on the next run
+        connection = self.database_client.connection
+        try:
+            with connection.cursor() as cursor:
+                self.save_network_statistics(cursor)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            self.logger.error(f"Could not save network statistics, rolled back all changes: {e}")
+            raise
+
+        self.logger.info(f"Saved all data in our database instance in {time.perf_counter() - start:.2f}s")
+
+    def save_network_statistics(self, cursor):
+        # Apply the new data to the running totals per node and derive the global statistics from them
+        self.unique_miners["amount"], self.unique_miners["top-100"] = self.update_node_totals(cursor, "miners", self.unique_miners["deltas"])
+        self.unique_data_request_solvers["amount"], self.unique_data_request_solvers["top-100"] = self.update_node_totals(cursor, "data_request_solvers", self.unique_data_request_solvers["deltas"])
 
         sql = """
             INSERT INTO network_stats(
@@ -776,12 +864,88 @@ class NetworkStats(Client):
         ]
         for sn, pps in per_period_stats:
             lst = [(sn, from_epoch, to_epoch, json.dumps(value)) for (from_epoch, to_epoch), value in pps.items()]
-            self.database_client.sql_execute_many(
-                re_sql(sql),
-                lst
-            )
+            if len(lst) > 0:
+                cursor.executemany(re_sql(sql), lst)
 
-        self.logger.info(f"Saved all data in our database instance in {time.perf_counter() - start:.2f}s")
+        # Save single statistics since network inception, including the last processed epoch
+        stats = [
+            ["epoch", self.last_processed_epoch],
+            ["rollbacks", self.rollbacks],
+            [
+                "miners",
+                {"amount": self.unique_miners["amount"], "top-100": self.unique_miners["top-100"]}
+            ],
+            [
+                "data_request_solvers",
+                {"amount": self.unique_data_request_solvers["amount"], "top-100": self.unique_data_request_solvers["top-100"]}
+            ],
+            ["staking", self.percentile_staking_balances],
+        ]
+        cursor.executemany(
+            re_sql(sql),
+            [(lbl, None, None, json.dumps(stat)) for lbl, stat in stats]
+        )
+
+    def save_node_indexes(self):
+        if self.index_directory is None:
+            return
+
+        start = time.perf_counter()
+
+        for stat, nodes in (("miners", self.unique_miners), ("data_request_solvers", self.unique_data_request_solvers)):
+            filename = get_node_index_filename(self.index_directory, stat)
+
+            # Flatten the updated periods into columns, address identifiers which are not ids cannot be indexed
+            periods, address_ids, amounts = [], [], []
+            for (from_epoch, to_epoch), histogram in nodes["per-period"].items():
+                for address_id, amount in histogram.items():
+                    if isinstance(address_id, str) and not address_id.isdigit():
+                        continue
+                    periods.append(int(from_epoch / self.aggregation_epochs))
+                    address_ids.append(int(address_id))
+                    amounts.append(amount)
+
+            if self.reset:
+                node_index = NodeIndex.build(periods, address_ids, amounts)
+            elif not os.path.exists(filename):
+                node_index = self.build_node_index_from_database(stat)
+            else:
+                from_period = min(int(from_epoch / self.aggregation_epochs) for from_epoch, _ in nodes["per-period"].keys()) if nodes["per-period"] else numpy.iinfo(numpy.int64).max
+                node_index = NodeIndex.load(filename).update(from_period, periods, address_ids, amounts)
+
+            node_index.save(filename)
+
+        self.logger.info(f"Saved miner and data request solver indexes in {time.perf_counter() - start:.2f}s")
+
+    def build_node_index_from_database(self, stat):
+        self.logger.info(f"Building {stat} index from the per-period statistics")
+        sql = """
+            SELECT
+                network_stats.from_epoch / %s,
+                nodes.key::INT,
+                nodes.value::INT
+            FROM
+                network_stats,
+                JSONB_EACH_TEXT(network_stats.data) AS nodes
+            WHERE
+                network_stats.stat = '%s'
+            AND
+                network_stats.from_epoch IS NOT NULL
+            AND
+                nodes.key ~ '^[0-9]+$'
+        """ % (self.aggregation_epochs, stat)
+        data = self.database_client.sql_return_all(re_sql(sql))
+        if not data:
+            return NodeIndex.build([], [], [])
+        periods, address_ids, amounts = zip(*data)
+        return NodeIndex.build(periods, address_ids, amounts)
+
+def run(config, connections=None, reset=False):
+    # Create network cache
+    network_cache = NetworkStats(config, reset, connections=connections)
+    network_cache.build_network_stats(reset)
+    network_cache.save_network()
+    network_cache.save_node_indexes()
 
 def main():
     parser = optparse.OptionParser()
@@ -796,10 +960,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create network cache
-    network_cache = NetworkStats(config, options.reset)
-    network_cache.build_network_stats(options.reset)
-    network_cache.save_network()
+    run(config, reset=options.reset)
 
 if __name__ == "__main__":
     main()
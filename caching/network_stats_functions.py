@@ -1,12 +1,6 @@
 from util.data_transformer import re_sql
 
-def read_from_database(
-    stat,
-    aggregation_epochs,
-    database,
-    period=None,
-    all_periods=False,
-):
+def read_last_epoch(database):
     sql = """
         SELECT
             data
@@ -17,9 +11,18 @@ def read_from_database(
     """
     last_epoch = database.sql_return_one(re_sql(sql))
     if not last_epoch:
-        last_epoch = 0
+        return 0
     else:
-        last_epoch = last_epoch[0]
+        return last_epoch[0]
+
+def read_from_database(
+    stat,
+    aggregation_epochs,
+    database,
+    period=None,
+    all_periods=False,
+):
+    last_epoch = read_last_epoch(database)
 
     sql = """
         SELECT
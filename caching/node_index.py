@@ -0,0 +1,102 @@
+import os
+
+import numpy
+
+# Maximum number of aggregation periods which can be indexed, used to combine an address id and a period in a single key
+MAX_PERIODS = 1 << 24
+
+# Loaded indexes per file, reloaded when the file on disk was replaced
+_node_indexes = {}
+
+
+class NodeIndex(object):
+    def __init__(self, keys, cumulative_amounts):
+        # Sorted keys (address_id * MAX_PERIODS + period) and the cumulative amount over all preceding keys
+        self.keys = keys
+        self.cumulative_amounts = cumulative_amounts
+        self.address_ids = numpy.unique(keys // MAX_PERIODS)
+
+    @classmethod
+    def build(cls, periods, address_ids, amounts):
+        periods = numpy.asarray(periods, dtype=numpy.int64)
+        address_ids = numpy.asarray(address_ids, dtype=numpy.int64)
+        amounts = numpy.asarray(amounts, dtype=numpy.int64)
+
+        # Sum duplicate entries for the same address and period
+        keys, indices = numpy.unique(
+            address_ids * MAX_PERIODS + periods, return_inverse=True
+        )
+        summed_amounts = numpy.zeros(len(keys), dtype=numpy.int64)
+        numpy.add.at(summed_amounts, indices, amounts)
+
+        return cls(keys, numpy.cumsum(summed_amounts))
+
+    # Replace all entries starting from the given period with new entries
+    def update(self, from_period, periods, address_ids, amounts):
+        keep = self.keys % MAX_PERIODS < from_period
+        kept_amounts = numpy.diff(self.cumulative_amounts, prepend=0)[keep]
+        return NodeIndex.build(
+            numpy.concatenate((self.keys[keep] % MAX_PERIODS, periods)),
+            numpy.concatenate((self.keys[keep] // MAX_PERIODS, address_ids)),
+            numpy.concatenate((kept_amounts, amounts)),
+        )
+
+    # Sum the amounts of all addresses for the periods in [from_period, to_period)
+    def range_amounts(self, from_period, to_period):
+        start = numpy.searchsorted(
+            self.keys, self.address_ids * MAX_PERIODS + from_period, side="left"
+        )
+        stop = numpy.searchsorted(
+            self.keys, self.address_ids * MAX_PERIODS + to_period, side="left"
+        )
+        return self.cumulative_before(stop) - self.cumulative_before(start)
+
+    def cumulative_before(self, indices):
+        if len(self.cumulative_amounts) == 0:
+            return numpy.zeros(len(indices), dtype=numpy.int64)
+        return numpy.where(indices > 0, self.cumulative_amounts[indices - 1], 0)
+
+    # Return the amount of unique addresses and the top-N addresses, sorted identically to aggregate_nodes
+    def aggregate(self, from_period, to_period, top_n=100):
+        amounts = self.range_amounts(from_period, to_period)
+        active = amounts > 0
+        address_ids, amounts = self.address_ids[active], amounts[active]
+
+        order = numpy.lexsort((address_ids, amounts))[::-1][:top_n]
+        top_nodes = [
+            (str(address_id), amount)
+            for address_id, amount in zip(
+                address_ids[order].tolist(), amounts[order].tolist()
+            )
+        ]
+
+        return len(address_ids), top_nodes
+
+    def save(self, filename):
+        # Write to a temporary file first so readers never observe a partially written index
+        temporary_filename = f"{filename}.tmp"
+        with open(temporary_filename, "wb") as index_file:
+            numpy.save(index_file, numpy.stack((self.keys, self.cumulative_amounts)))
+        os.replace(temporary_filename, filename)
+
+    @classmethod
+    def load(cls, filename):
+        data = numpy.load(filename, mmap_mode="r")
+        return cls(data[0], data[1])
+
+
+def get_node_index_filename(directory, stat):
+    return os.path.join(directory, f"{stat}_index.npy")
+
+
+def load_node_index(directory, stat):
+    filename = get_node_index_filename(directory, stat)
+    try:
+        modified = os.path.getmtime(filename)
+    except OSError:
+        return None
+
+    if filename not in _node_indexes or _node_indexes[filename][0] != modified:
+        _node_indexes[filename] = (modified, NodeIndex.load(filename))
+
+    return _node_indexes[filename][1]
@@ -6,10 +6,11 @@ import toml
 
 from caching.client import Client
 from schemas.network.reputation_schema import NetworkReputationResponse
+from schemas.registry import get_schema
 from util.logger import configure_logger
 
 class ReputationList(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         # Setup logger
         log_filename = config["api"]["caching"]["scripts"]["reputation_list"]["log_file"]
         log_level = config["api"]["caching"]["scripts"]["reputation_list"]["level_file"]
@@ -18,7 +19,7 @@ class ReputationList(Client):
         # Read some Witnet node parameters
         self.node_retries = config["api"]["caching"]["node_retries"]
 
-        super().__init__(config)
+        super().__init__(config, connections=connections)
 
     def get_reputation(self):
         start = time.perf_counter()
@@ -58,7 +59,7 @@ class ReputationList(Client):
         ]
         reputation = sorted(reputation, key=lambda l: l["reputation"], reverse=True)
 
-        self.reputation = NetworkReputationResponse().load({
+        self.reputation = get_schema(NetworkReputationResponse).load({
             "reputation": reputation,
             "total_reputation": result["result"]["total_reputation"],
             "last_updated": int(time.time())
@@ -72,9 +73,18 @@ class ReputationList(Client):
         self.logger.info("Saving all data in our memcached instance")
         try:
             self.memcached_client.set("reputation", self.reputation)
+            # The API marks a value it refreshed itself as stale after the saved expiry time, this one is fresh
+            self.memcached_client.delete("reputation_expiry")
         except pylibmc.TooBig as e:
             self.logger.warning("Could not save items in cache because the item size exceeded 1MB")
 
+def run(config, connections=None):
+    # Create reputation cache
+    reputation_cache = ReputationList(config, connections=connections)
+    # Only save reputation to the memcached instance on fetch and process success
+    if reputation_cache.get_reputation():
+        reputation_cache.save_reputation()
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
@@ -87,11 +97,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # Create reputation cache
-    reputation_cache = ReputationList(config)
-    # Only save reputation to the memcached instance on fetch and process success
-    if reputation_cache.get_reputation():
-        reputation_cache.save_reputation()
+    run(config)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,343 @@
+import importlib
+import math
+import multiprocessing
+import multiprocessing.connection
+import optparse
+import signal
+import sys
+import time
+import toml
+import traceback
+
+from caching.client import ClientConnections
+from util.blockchain_events import EventListener
+from util.logger import configure_rotating_logger
+
+# Caching jobs which can be hosted by the scheduler, every job module exposes a run(config, connections) function
+# Jobs which subscribe to blockchain events also accept an events argument mapping every event to a set of epochs
+JOBS = [
+    "blocks",
+    "home_stats",
+    "network_stats",
+    "balance_list",
+    "reputation_list",
+    "tapi_list",
+    "data_request_reports",
+]
+EVENT_JOBS = ["blocks", "home_stats", "data_request_reports"]
+
+# Align runs to multiples of the interval, mirroring the crontab configurations the jobs used to be launched with
+# Jobs without an interval are only triggered by blockchain events
+def get_next_run(timestamp, interval):
+    if interval is None:
+        return math.inf
+    return (int(timestamp) // interval + 1) * interval
+
+# Long-running worker process executing a single job whenever the scheduler requests a run
+# The job module is imported and its connections are opened once, subsequent runs reuse both
+def run_worker(name, config, pipe):
+    # Shutdown is coordinated by the scheduler
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    job = importlib.import_module(f"caching.{name}")
+    connections = ClientConnections()
+
+    while True:
+        try:
+            events = pipe.recv()
+        except EOFError:
+            break
+        if events is None:
+            break
+
+        start = time.perf_counter()
+        error = None
+        try:
+            if events:
+                job.run(config, connections=connections, events=events)
+            else:
+                job.run(config, connections=connections)
+            connections.release()
+        # The clients call sys.exit when they cannot connect to a backend
+        except (Exception, SystemExit):
+            error = traceback.format_exc()
+            # Reconnect on the next run since the connections may have caused the error
+            try:
+                connections.close()
+            except Exception:
+                connections = ClientConnections()
+        pipe.send((error, time.perf_counter() - start))
+
+    connections.close()
+
+class JobMetrics(object):
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_duration = 0
+        self.max_duration = 0
+        self.total_duration = 0
+        self.last_success = None
+
+    def add_run(self, duration, success):
+        self.runs += 1
+        if not success:
+            self.failures += 1
+        else:
+            self.last_success = int(time.time())
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+    def add_timeout(self, duration):
+        self.timeouts += 1
+        self.add_run(duration, False)
+
+    def summary(self):
+        average_duration = self.total_duration / self.runs if self.runs > 0 else 0
+        return f"{self.runs} runs, {self.failures} failed, {self.timeouts} timed out, {self.skipped} skipped, last {self.last_duration:.2f}s, average {average_duration:.2f}s, max {self.max_duration:.2f}s"
+
+class Job(object):
+    def __init__(self, name, config, interval, run_timeout, events=()):
+        self.name = name
+        self.config = config
+        self.interval = interval
+        self.run_timeout = run_timeout
+
+        # Blockchain events this job subscribes to and the epochs of the events received since its last run
+        self.events = events
+        self.pending_events = {}
+
+        self.process = None
+        self.pipe = None
+
+        # Start time of the current run, None when the job is idle
+        self.started = None
+        self.next_run = get_next_run(time.time(), interval)
+
+        self.metrics = JobMetrics()
+
+    def running(self):
+        return self.started is not None
+
+    def start_worker(self):
+        self.pipe, worker_pipe = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=run_worker, args=(self.name, self.config, worker_pipe), name=f"caching-{self.name}")
+        self.process.start()
+        worker_pipe.close()
+
+    def stop_worker(self, wait=0):
+        if self.process is None:
+            return
+        if wait > 0 and self.process.is_alive():
+            try:
+                self.pipe.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(wait)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.pipe.close()
+        self.process = None
+        self.pipe = None
+        self.started = None
+
+    def start_run(self, timestamp, events=None):
+        if self.process is None or not self.process.is_alive():
+            self.start_worker()
+        self.pipe.send(events or {})
+        self.started = timestamp
+
+    def add_event(self, event, epoch):
+        if event not in self.events:
+            return
+        if event not in self.pending_events:
+            self.pending_events[event] = set()
+        self.pending_events[event].add(epoch)
+
+    # Collect the result of a finished run, returns the error message if the run failed
+    def finish_run(self):
+        try:
+            error, duration = self.pipe.recv()
+        except EOFError:
+            error, duration = f"Worker process exited with code {self.process.exitcode}", time.time() - self.started
+            self.stop_worker()
+        self.started = None
+        self.metrics.add_run(duration, error is None)
+        return error, duration
+
+    def timed_out(self, timestamp):
+        return self.running() and timestamp - self.started > self.run_timeout
+
+class Scheduler(object):
+    def __init__(self, config):
+        scheduler_config = config["api"]["caching"]["scheduler"]
+        self.logger = configure_rotating_logger("scheduler", scheduler_config["log_file"], scheduler_config["level_file"])
+
+        # Host every job which has a run interval or blockchain event subscriptions configured
+        self.jobs = {}
+        for name in JOBS:
+            script_config = config["api"]["caching"]["scripts"][name]
+            if "interval" not in script_config and "events" not in script_config:
+                continue
+            interval = script_config.get("interval", None)
+            run_timeout = script_config["run_timeout"] if interval is None else script_config.get("run_timeout", interval)
+            events = tuple(script_config.get("events", []))
+            if events and name not in EVENT_JOBS:
+                self.logger.warning(f"{name} cannot subscribe to blockchain events, ignoring them")
+                events = ()
+            self.jobs[name] = Job(name, config, interval, run_timeout, events=events)
+            if interval:
+                self.logger.info(f"Scheduling {name} every {interval} seconds with a timeout of {run_timeout} seconds")
+            if events:
+                self.logger.info(f"Scheduling {name} on {', '.join(events)} events with a timeout of {run_timeout} seconds")
+
+        # Listen for the blockchain events the jobs subscribed to
+        self.listener = None
+        subscribed_events = sorted(set(event for job in self.jobs.values() for event in job.events))
+        if len(subscribed_events) > 0:
+            self.listener = EventListener(config["database"], events=subscribed_events, logger=self.logger)
+
+        self.stop_timeout = scheduler_config.get("stop_timeout", 60)
+
+        self.metrics_port = scheduler_config.get("metrics_port", None)
+        if self.metrics_port:
+            self.start_metrics_server()
+
+        self.stopped = False
+
+    def start_metrics_server(self):
+        # Only required when exporting metrics
+        import prometheus_client
+
+        self.metric_runs = prometheus_client.Gauge("caching_job_runs", "Number of runs of a caching job", ["job"])
+        self.metric_failures = prometheus_client.Gauge("caching_job_failures", "Number of failed runs of a caching job", ["job"])
+        self.metric_timeouts = prometheus_client.Gauge("caching_job_timeouts", "Number of runs of a caching job which were stopped after timing out", ["job"])
+        self.metric_skipped = prometheus_client.Gauge("caching_job_skipped", "Number of runs of a caching job skipped because the previous run was still busy", ["job"])
+        self.metric_duration = prometheus_client.Gauge("caching_job_duration_seconds", "Duration of the last run of a caching job", ["job"])
+        self.metric_last_success = prometheus_client.Gauge("caching_job_last_success", "Timestamp of the last successful run of a caching job", ["job"])
+
+        prometheus_client.start_http_server(self.metrics_port)
+        self.logger.info(f"Exporting caching job metrics on port {self.metrics_port}")
+
+    def export_metrics(self, job):
+        if not self.metrics_port:
+            return
+        self.metric_runs.labels(job.name).set(job.metrics.runs)
+        self.metric_failures.labels(job.name).set(job.metrics.failures)
+        self.metric_timeouts.labels(job.name).set(job.metrics.timeouts)
+        self.metric_skipped.labels(job.name).set(job.metrics.skipped)
+        self.metric_duration.labels(job.name).set(job.metrics.last_duration)
+        if job.metrics.last_success:
+            self.metric_last_success.labels(job.name).set(job.metrics.last_success)
+
+    def stop(self, *args):
+        self.stopped = True
+
+    def start(self):
+        if len(self.jobs) == 0:
+            self.logger.warning("No caching jobs have an interval or blockchain events configured")
+            return
+
+        while not self.stopped:
+            self.schedule_jobs(time.time())
+            self.wait_for_jobs()
+
+        self.logger.info("Stopping caching jobs")
+        for job in self.jobs.values():
+            job.stop_worker(wait=self.stop_timeout)
+        if self.listener:
+            self.listener.close()
+
+    def schedule_jobs(self, timestamp):
+        for job in self.jobs.values():
+            # A run cannot be interrupted from within the worker, stop the worker and start a fresh one for the next run
+            if job.timed_out(timestamp):
+                duration = timestamp - job.started
+                job.stop_worker()
+                job.metrics.add_timeout(duration)
+                self.logger.error(f"Stopped {job.name} after {duration:.2f}s, the run exceeded the {job.run_timeout}s timeout ({job.metrics.summary()})")
+                self.export_metrics(job)
+
+            # Never start a new run while the previous one is still busy
+            # Events keep accumulating and are processed in a single run once the job is idle again
+            if job.running():
+                if timestamp >= job.next_run:
+                    job.metrics.skipped += 1
+                    self.logger.warning(f"Skipping run of {job.name}, the previous run started {timestamp - job.started:.2f}s ago is still busy")
+                    self.export_metrics(job)
+                    job.next_run = get_next_run(timestamp, job.interval)
+            elif timestamp >= job.next_run:
+                self.logger.info(f"Starting run of {job.name}")
+                job.start_run(timestamp)
+                job.next_run = get_next_run(timestamp, job.interval)
+            elif job.pending_events:
+                events_str = ", ".join(f"{len(epochs)} {event}" for event, epochs in sorted(job.pending_events.items()))
+                self.logger.info(f"Starting run of {job.name} for {events_str} events")
+                job.start_run(timestamp, events=job.pending_events)
+                job.pending_events = {}
+
+    def dispatch_events(self, events):
+        for event, epoch in events:
+            self.logger.debug(f"Received {event} event for epoch {epoch}")
+            for job in self.jobs.values():
+                job.add_event(event, epoch)
+
+    def wait_for_jobs(self):
+        # Wake up when a job finishes, when the next run is due, when a running job times out or when a blockchain event arrives
+        wake_up = min(job.next_run for job in self.jobs.values())
+        running = [job for job in self.jobs.values() if job.running()]
+        for job in running:
+            wake_up = min(wake_up, job.started + job.run_timeout)
+        timeout = min(max(0, wake_up - time.time()), 1)
+
+        wait_for = [job.pipe for job in running]
+        if self.listener:
+            if self.listener.fileno() is None:
+                # Try to reconnect, events published in the meantime are picked up by the periodic runs
+                self.listener.reconnect()
+            if self.listener.fileno() is not None:
+                wait_for.append(self.listener)
+
+        if len(wait_for) == 0:
+            time.sleep(timeout)
+            return
+
+        ready = multiprocessing.connection.wait(wait_for, timeout=timeout)
+        if self.listener in ready:
+            self.dispatch_events(self.listener.receive(0))
+        for job in running:
+            if job.pipe not in ready:
+                continue
+            error, duration = job.finish_run()
+            if error is None:
+                self.logger.info(f"Finished run of {job.name} in {duration:.2f}s ({job.metrics.summary()})")
+            else:
+                self.logger.error(f"Run of {job.name} failed after {duration:.2f}s ({job.metrics.summary()}): {error}")
+            self.export_metrics(job)
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
+    options, args = parser.parse_args()
+
+    if options.config_file == None:
+        sys.stderr.write("Need to specify a configuration file!\n")
+        sys.exit(1)
+
+    # Load config file
+    config = toml.load(options.config_file)
+
+    scheduler = Scheduler(config)
+
+    # Finish the running jobs on ctrl+c or when the service is stopped
+    signal.signal(signal.SIGINT, scheduler.stop)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+
+    scheduler.start()
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,13 @@ import matplotlib.pyplot as plt
 import matplotlib.colors
 from caching.client import Client
 from schemas.network.tapi_schema import NetworkTapiResponse
+from schemas.registry import get_schema
 from util.data_transformer import re_sql
 from util.logger import configure_logger
 from util.common_sql import sql_last_block
 
 class TapiList(Client):
-    def __init__(self, config):
+    def __init__(self, config, connections=None):
         self.plot_dir = config["api"]["caching"]["plot_directory"]
         if not os.path.exists(self.plot_dir):
             os.makedirs(self.plot_dir)
@@ -25,7 +26,7 @@ class TapiList(Client):
         log_level = config["api"]["caching"]["scripts"]["tapi_list"]["level_file"]
         self.logger = configure_logger("tapi", log_filename, log_level)
 
-        super().__init__(config)
+        super().__init__(config, connections=connections)
 
         # Assign some of the consensus constants
         self.start_time = self.consensus_constants.checkpoint_zero_timestamp
@@ -263,7 +264,7 @@ class TapiList(Client):
         for tapi_id, tapi in self.tapi_data.items():
             # First save the TAPI in the memcached instance
             try:
-                self.memcached_client.set(f"tapi-{tapi_id}", NetworkTapiResponse().load(tapi))
+                self.memcached_client.set(f"tapi-{tapi_id}", get_schema(NetworkTapiResponse).load(tapi))
             except ValidationError as err_info:
                 self.logger.error(f"Could not validate tapi data for tapi {tapi_id}: {err_info}")
             except pylibmc.TooBig:
@@ -290,6 +291,12 @@ class TapiList(Client):
                     """
                     self.database.sql_update_table(sql, parameters=[json.dumps(tapi), tapi_id])
 
+def run(config, connections=None):
+    # create TAPI cache
+    tapi_cache = TapiList(config, connections=connections)
+    tapi_cache.collect_tapi_data()
+    tapi_cache.save_tapi()
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option("--config-file", type="string", default="explorer.toml", dest="config_file", help="Specify a configuration file")
@@ -298,10 +305,7 @@ def main():
     # Load config file
     config = toml.load(options.config_file)
 
-    # create TAPI cache
-    tapi_cache = TapiList(config)
-    tapi_cache.collect_tapi_data()
-    tapi_cache.save_tapi()
+    run(config)
 
 if __name__ == "__main__":
     main()
@@ -218,7 +218,8 @@ def create_tables(connection, cursor):
             output_values BIGINT ARRAY NOT NULL,
             timelocks BIGINT ARRAY NOT NULL,
             weight INT NOT NULL,
-            epoch INT NOT NULL
+            epoch INT NOT NULL,
+            block_position SMALLINT
         );""",
 
         """CREATE TABLE IF NOT EXISTS data_request_txns (
@@ -245,7 +246,8 @@ def create_tables(connection, cursor):
             tally_reducer INT ARRAY NOT NULL,
             RAD_bytes_hash BYTEA NOT NULL,
             DRO_bytes_hash BYTEA NOT NULL,
-            epoch INT NOT NULL
+            epoch INT NOT NULL,
+            block_position SMALLINT
         );""",
 
         """CREATE TABLE IF NOT EXISTS commit_txns (
@@ -255,7 +257,8 @@ def create_tables(connection, cursor):
             input_utxos utxo ARRAY NOT NULL,
             output_value BIGINT,
             data_request BYTEA NOT NULL,
-            epoch INT NOT NULL
+            epoch INT NOT NULL,
+            block_position SMALLINT
         );""",
 
         """CREATE TABLE IF NOT EXISTS reveal_txns (
@@ -264,7 +267,8 @@ def create_tables(connection, cursor):
             data_request BYTEA NOT NULL,
             result BYTEA NOT NULL,
             success BOOL NOT NULL,
-            epoch INT NOT NULL
+            epoch INT NOT NULL,
+            block_position SMALLINT
         );""",
 
         """CREATE TABLE IF NOT EXISTS tally_txns (
@@ -276,19 +280,24 @@ def create_tables(connection, cursor):
             liar_addresses CHAR(42) ARRAY NOT NULL,
             result BYTEA NOT NULL,
             success BOOL NOT NULL,
-            epoch INT NOT NULL
+            epoch INT NOT NULL,
+            block_position SMALLINT
         );""",
 
         """CREATE TABLE IF NOT EXISTS data_request_mempool (
             timestamp INT NOT NULL,
             fee BIGINT ARRAY NOT NULL,
-            weight INT ARRAY NOT NULL
+            weight INT ARRAY NOT NULL,
+            priority INT ARRAY NOT NULL,
+            amount INT ARRAY NOT NULL
         );""",
 
         """CREATE TABLE IF NOT EXISTS value_transfer_mempool (
             timestamp INT NOT NULL,
             fee BIGINT ARRAY NOT NULL,
-            weight INT ARRAY NOT NULL
+            weight INT ARRAY NOT NULL,
+            priority INT ARRAY NOT NULL,
+            amount INT ARRAY NOT NULL
         );""",
 
         """CREATE TABLE IF NOT EXISTS wips (
@@ -311,6 +320,13 @@ def create_tables(connection, cursor):
             UNIQUE NULLS NOT DISTINCT (stat, from_epoch, to_epoch)
         );""",
 
+        """CREATE TABLE IF NOT EXISTS network_stats_nodes (
+            stat network_stat NOT NULL,
+            address_id INT NOT NULL,
+            amount INT NOT NULL,
+            PRIMARY KEY (stat, address_id)
+        );""",
+
         """CREATE TABLE IF NOT EXISTS data_request_reports (
             data_request_hash BYTEA PRIMARY KEY,
             report JSONB NOT NULL
@@ -321,6 +337,11 @@ def create_tables(connection, cursor):
             data INT NOT NULL
         );""",
 
+        """CREATE TABLE IF NOT EXISTS chain_totals (
+            key VARCHAR PRIMARY KEY,
+            amount BIGINT NOT NULL
+        );""",
+
         """CREATE TABLE IF NOT EXISTS consensus_constants (
             key VARCHAR PRIMARY KEY,
             int_val BIGINT,
@@ -348,6 +369,7 @@ def create_indexes(connection, cursor):
         "CREATE INDEX IF NOT EXISTS idx_reveal_txn_epoch ON reveal_txns (epoch);",
         "CREATE INDEX IF NOT EXISTS idx_tally_txn_epoch ON tally_txns (epoch);",
         "CREATE INDEX IF NOT EXISTS idx_value_transfer_txn_epoch ON value_transfer_txns (epoch);",
+        "CREATE INDEX IF NOT EXISTS idx_network_stats_nodes_amount ON network_stats_nodes (stat, amount DESC, address_id DESC);",
     ]
 
     for index in indexes:
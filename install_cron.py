@@ -23,8 +23,12 @@ def main():
     caching_scripts = config["api"]["caching"]["scripts"]
 
     cron_config = {}
+    scheduled = False
     for script in caching_scripts:
-        if "cron" in config["api"]["caching"]["scripts"][script]:
+        # Scripts with an interval or event subscriptions are hosted by the caching scheduler
+        if "interval" in config["api"]["caching"]["scripts"][script] or "events" in config["api"]["caching"]["scripts"][script]:
+            scheduled = True
+        elif "cron" in config["api"]["caching"]["scripts"][script]:
             cron_config[script] = config["api"]["caching"]["scripts"][script]["cron"]
 
     p = subprocess.Popen(["crontab", "-l"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -47,6 +51,15 @@ def main():
             f"{cron} cd {backend} && flock -n {backend}/caching/.{cache_process}.lock {explorer}/env/bin/python3 -m caching.{cache_process} --config-file {backend}/explorer.toml\n"
         )
 
+    # Start the scheduler hosting the other caching processes after a reboot
+    if scheduled:
+        cron_lines.append(
+            "# Start the caching scheduler after a reboot. Use flock to prevent concurrent execution."
+        )
+        cron_lines.append(
+            f"@reboot cd {backend} && flock -n {backend}/caching/.scheduler.lock {explorer}/env/bin/python3 -m caching.scheduler --config-file {backend}/explorer.toml\n"
+        )
+
     f = open("crontabs.txt", "w+")
     f.write("\n".join(cron_lines))
     f.close()
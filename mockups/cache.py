@@ -12,6 +12,12 @@ class MockCache(object):
 
         self.cache["transaction_mempool"] = json.load(open("mockups/data/mempool.json"))
 
+        mempool = json.load(open("mockups/data/mempool.json"))
+        self.cache["pending_hashes"] = {
+            "data_request": set(mempool["data_request"]),
+            "value_transfer": set(mempool["value_transfer"]),
+        }
+
         self.cache["priority"] = json.load(open("mockups/data/priority.json"))
 
         reputation = json.load(open("mockups/data/reputation.json"))
@@ -62,3 +68,14 @@ class MockCache(object):
     def delete(self, key):
         del self.cache[key]
         return True
+
+    def get_or_compute(self, key, compute, timeout=0, logger=None):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value, timeout=timeout)
+        return value
+
+    def get_local_cache_counters(self):
+        return None
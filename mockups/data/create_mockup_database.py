@@ -1,9 +1,11 @@
 import argparse
 import json
+import os
 import sqlite3
 
 import toml
 
+from util.common_functions import build_priority_histogram
 from util.database_manager import DatabaseManager
 
 
@@ -69,7 +71,8 @@ def create_tables(database):
                 output_values TEXT NOT NULL,
                 timelocks TEXT NOT NULL,
                 weight INT NOT NULL,
-                epoch INT NOT NULL
+                epoch INT NOT NULL,
+                block_position INT
             )
         """,
         """
@@ -97,7 +100,8 @@ def create_tables(database):
                 tally_reducer TEXT NOT NULL,
                 RAD_bytes_hash TEXT NOT NULL,
                 DRO_bytes_hash TEXT NOT NULL,
-                epoch INT NOT NULL
+                epoch INT NOT NULL,
+                block_position INT
             )
         """,
         """
@@ -108,7 +112,8 @@ def create_tables(database):
                 input_utxos TEXT NOT NULL,
                 output_value INT,
                 data_request TEXT NOT NULL,
-                epoch INT NOT NULL
+                epoch INT NOT NULL,
+                block_position INT
             )
         """,
         """
@@ -118,7 +123,8 @@ def create_tables(database):
                 data_request TEXT NOT NULL,
                 result TEXT NOT NULL,
                 success TEXT NOT NULL,
-                epoch INT NOT NULL
+                epoch INT NOT NULL,
+                block_position INT
             )
         """,
         """
@@ -131,21 +137,26 @@ def create_tables(database):
                 liar_addresses TEXT NOT NULL,
                 result TEXT NOT NULL,
                 success TEXT NOT NULL,
-                epoch INT NOT NULL
+                epoch INT NOT NULL,
+                block_position INT
             )
         """,
         """
             CREATE TABLE IF NOT EXISTS data_request_mempool (
                 timestamp INT NOT NULL,
                 fee TEXT NOT NULL,
-                weight TEXT NOT NULL
+                weight TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                amount TEXT NOT NULL
             )
         """,
         """
             CREATE TABLE IF NOT EXISTS value_transfer_mempool (
                 timestamp INT NOT NULL,
                 fee TEXT NOT NULL,
-                weight TEXT NOT NULL
+                weight TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                amount TEXT NOT NULL
             )
         """,
         """
@@ -176,6 +187,12 @@ def create_tables(database):
                 data TEXT NOT NULL
             )
         """,
+        """
+            CREATE TABLE IF NOT EXISTS data_request_reports (
+                data_request_hash TEXT PRIMARY KEY,
+                report TEXT NOT NULL
+            )
+        """,
     ]
     for sql in tables:
         cursor.execute(sql)
@@ -1185,15 +1202,21 @@ def insert_pending_transaction(database):
         INSERT INTO
             data_request_mempool
         VALUES
-            (?, ?, ?)
+            (?, ?, ?, ?, ?)
     """
-    cursor.executemany(
-        sql,
-        [
-            [pdr[0], json.dumps(pdr[1]), json.dumps(pdr[2])]
-            for pdr in pending_data_requests
-        ],
-    )
+    data = []
+    for pdr in pending_data_requests:
+        priorities, amounts = build_priority_histogram(pdr[1], pdr[2])
+        data.append(
+            [
+                pdr[0],
+                json.dumps(pdr[1]),
+                json.dumps(pdr[2]),
+                json.dumps(priorities.tolist()),
+                json.dumps(amounts.tolist()),
+            ]
+        )
+    cursor.executemany(sql, data)
 
     pending_value_transfers = [
         [1696016160, [96, 120, 240, 240, 360, 360, 360], [1, 1, 2, 2, 3, 3, 3]],
@@ -1210,16 +1233,46 @@ def insert_pending_transaction(database):
         INSERT INTO
             value_transfer_mempool
         VALUES
-            (?, ?, ?)
+            (?, ?, ?, ?, ?)
     """
-    cursor.executemany(
-        sql,
-        [
-            [pvt[0], json.dumps(pvt[1]), json.dumps(pvt[2])]
-            for pvt in pending_value_transfers
-        ],
+    data = []
+    for pvt in pending_value_transfers:
+        priorities, amounts = build_priority_histogram(pvt[1], pvt[2])
+        data.append(
+            [
+                pvt[0],
+                json.dumps(pvt[1]),
+                json.dumps(pvt[2]),
+                json.dumps(priorities.tolist()),
+                json.dumps(amounts.tolist()),
+            ]
+        )
+    cursor.executemany(sql, data)
+
+    connection.commit()
+
+
+def insert_data_request_reports(database):
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+
+    # Save the confirmed data request report like the data request reports caching process does
+    data_request_reports = json.load(
+        open(os.path.join(os.path.dirname(__file__), "data_request_reports.json"))
     )
 
+    sql = """
+        INSERT INTO
+            data_request_reports
+        VALUES
+            (?, ?)
+    """
+    data = [
+        [f"\\x{data_request_hash}", json.dumps(response["data_request_report"])]
+        for data_request_hash, response in data_request_reports.items()
+    ]
+    cursor.executemany(sql, data)
+
     connection.commit()
 
 
@@ -1868,7 +1921,8 @@ def get_epoch_data(config, epochs):
             output_values,
             timelocks,
             weight,
-            epoch
+            epoch,
+            block_position
         FROM
             value_transfer_txns
          WHERE
@@ -1888,6 +1942,7 @@ def get_epoch_data(config, epochs):
             str(d[6]),
             d[7],
             d[8],
+            d[9],
         ]
         for d in data
     ]
@@ -1917,7 +1972,8 @@ def get_epoch_data(config, epochs):
             tally_reducer,
             RAD_bytes_hash,
             DRO_bytes_hash,
-            epoch
+            epoch,
+            block_position
         FROM
             data_request_txns
         WHERE
@@ -1962,6 +2018,7 @@ def get_epoch_data(config, epochs):
             f"\\x{d[21].hex()}",
             f"\\x{d[22].hex()}",
             d[23],
+            d[24],
         ]
         for d in data
     ]
@@ -1987,7 +2044,8 @@ def get_epoch_data(config, epochs):
             input_utxos,
             output_value,
             data_request,
-            epoch
+            epoch,
+            block_position
         FROM
             commit_txns
         WHERE
@@ -2005,6 +2063,7 @@ def get_epoch_data(config, epochs):
             d[4],
             f"\\x{d[5].hex()}",
             d[6],
+            d[7],
         ]
         for d in data
     ]
@@ -2016,7 +2075,8 @@ def get_epoch_data(config, epochs):
             data_request,
             result,
             success,
-            epoch
+            epoch,
+            block_position
         FROM
             reveal_txns
         WHERE
@@ -2031,6 +2091,7 @@ def get_epoch_data(config, epochs):
             f"\\x{d[3].hex()}",
             str(d[4]),
             d[5],
+            d[6],
         ]
         for d in data
     ]
@@ -2045,7 +2106,8 @@ def get_epoch_data(config, epochs):
             liar_addresses,
             result,
             success,
-            epoch
+            epoch,
+            block_position
         FROM
             tally_txns
         WHERE
@@ -2063,6 +2125,7 @@ def get_epoch_data(config, epochs):
             f"\\x{d[6].hex()}",
             str(d[7]),
             d[8],
+            d[9],
         ]
         for d in data
     ]
@@ -2102,7 +2165,7 @@ def insert_epoch_data(database, epoch_data):
         INSERT INTO
             value_transfer_txns
         VALUES
-            (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     cursor.executemany(sql, epoch_data["value_transfer_data"])
 
@@ -2110,7 +2173,7 @@ def insert_epoch_data(database, epoch_data):
         INSERT INTO
             data_request_txns
         VALUES
-            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     cursor.executemany(sql, epoch_data["data_request_data"])
 
@@ -2118,7 +2181,7 @@ def insert_epoch_data(database, epoch_data):
         INSERT INTO
             commit_txns
         VALUES
-            (?, ?, ?, ?, ?, ?, ?)
+            (?, ?, ?, ?, ?, ?, ?, ?)
     """
     cursor.executemany(sql, epoch_data["commit_data"])
 
@@ -2126,7 +2189,7 @@ def insert_epoch_data(database, epoch_data):
         INSERT INTO
             reveal_txns
         VALUES
-            (?, ?, ?, ?, ?, ?)
+            (?, ?, ?, ?, ?, ?, ?)
     """
     cursor.executemany(sql, epoch_data["reveal_data"])
 
@@ -2134,7 +2197,7 @@ def insert_epoch_data(database, epoch_data):
         INSERT INTO
             tally_txns
         VALUES
-            (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     cursor.executemany(sql, epoch_data["tally_data"])
 
@@ -2191,6 +2254,8 @@ def main():
 
     insert_pending_transaction(args.database)
 
+    insert_data_request_reports(args.database)
+
     insert_wips(args.database)
 
 
@@ -5,6 +5,8 @@ import sys
 
 import psycopg
 
+from util.prepared_statements import statements
+
 
 class MockDatabase(object):
     def __init__(self):
@@ -92,8 +94,10 @@ class MockDatabase(object):
             data[row] = [d for d in data[row]]
             for column in range(len(data[row])):
                 value = data[row][column]
-                if "network_stats" in sql or (
-                    "tapi_json" in sql and "tapi_bit" not in sql
+                if (
+                    "network_stats" in sql
+                    or "data_request_reports" in sql
+                    or ("tapi_json" in sql and "tapi_bit" not in sql)
                 ):
                     if value is None:
                         continue
@@ -206,3 +210,11 @@ class MockDatabase(object):
         else:
             data = cursor.execute(sql, parameters).fetchall()
         return self.transform_data(sql, data, multi_row=True)
+
+    def statement_return_one(self, name, parameters=None, custom_types=None):
+        # Prepared statements are not supported by sqlite, execute the catalogued query
+        return self.sql_return_one(statements[name], parameters=parameters)
+
+    def statement_return_all(self, name, parameters=None, custom_types=None):
+        # Prepared statements are not supported by sqlite, execute the catalogued query
+        return self.sql_return_all(statements[name], parameters=parameters)
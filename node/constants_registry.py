@@ -0,0 +1,82 @@
+import threading
+import time
+
+from blockchain.objects.wip import WIP
+from node.consensus_constants import ConsensusConstants
+
+# Memcached key bumped by the scripts which update the consensus constants or WIPs
+CONSTANTS_VERSION_KEY = "constants_version"
+
+
+def publish_constants_version(memcached_client):
+    # Make every process using a registry reload the consensus constants and WIPs
+    memcached_client.set(CONSTANTS_VERSION_KEY, time.time_ns())
+
+
+class ConstantsRegistry(object):
+    # Process-wide cache of the consensus constants and WIPs which only change on a node upgrade
+    # Both are loaded on first use and reloaded on the next use after calling invalidate, which
+    # happens automatically when the version published in memcached changed
+    def __init__(self, database=None, witnet_node=None, error_retry=0, check_interval=60):
+        self.database = database
+        self.witnet_node = witnet_node
+        self.error_retry = error_retry
+
+        self.lock = threading.Lock()
+
+        self.consensus_constants = None
+        self.wip = None
+
+        # Seconds between two lookups of the published version, only checked once a cache is set
+        self.cache = None
+        self.check_interval = check_interval
+        self.next_check = 0
+        self.version = None
+
+    def init_app(self, app):
+        app.extensions = getattr(app, "extensions", {})
+        if "constants" not in app.extensions:
+            app.extensions["constants"] = self
+
+    def set_cache(self, cache):
+        self.cache = cache
+
+    def check_version(self):
+        if self.cache is None or time.time() < self.next_check:
+            return
+        self.next_check = time.time() + self.check_interval
+
+        version = self.cache.get(CONSTANTS_VERSION_KEY)
+        if version != self.version:
+            self.version = version
+            self.invalidate()
+
+    def get_consensus_constants(self):
+        self.check_version()
+        with self.lock:
+            if self.consensus_constants is None:
+                self.consensus_constants = ConsensusConstants(
+                    database=self.database,
+                    witnet_node=self.witnet_node,
+                    error_retry=self.error_retry,
+                )
+            return self.consensus_constants
+
+    def get_network_times(self):
+        consensus_constants = self.get_consensus_constants()
+        return (
+            consensus_constants.checkpoint_zero_timestamp,
+            consensus_constants.checkpoints_period,
+        )
+
+    def get_wip(self):
+        self.check_version()
+        with self.lock:
+            if self.wip is None:
+                self.wip = WIP(database=self.database)
+            return self.wip
+
+    def invalidate(self):
+        with self.lock:
+            self.consensus_constants = None
+            self.wip = None
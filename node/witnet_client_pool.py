@@ -1,8 +1,18 @@
+import time
 from contextlib import contextmanager
-from queue import Queue
+from queue import Empty, Queue
 
 from node.witnet_node import WitnetNode
 
+# Upper bounds (in seconds) of the buckets of the client wait time histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10)
+
+class NodePoolBusy(Exception):
+    # Raised when no client became available within the acquire timeout
+    def __init__(self, retry_after):
+        super().__init__(f"No node client available, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
 class WitnetClientPool(Queue):
     def __init__(self, config):
         clients = config["nodes"]["number"]
@@ -10,86 +20,136 @@ class WitnetClientPool(Queue):
         for i in range(clients):
             self.put(WitnetNode(config))
 
+        # Seconds to wait for a free client before failing fast, waits indefinitely if not configured
+        self.acquire_timeout = config.get("acquire_timeout", None)
+        # Seconds callers are advised to wait before retrying when failing fast
+        self.retry_after = config.get("retry_after", 5)
+        # Socket timeouts which override the default timeout for slow RPC methods
+        self.method_timeouts = config.get("timeouts", {})
+
+        self.metrics = None
+
     def init_app(self, app):
         app.extensions = getattr(app, "extensions", {})
         if "witnet_node" not in app.extensions:
             app.extensions["witnet_node"] = self
 
+    def start_metrics_server(self, port):
+        # Only required when exporting metrics
+        import prometheus_client
+
+        self.metrics = {
+            "in_use": prometheus_client.Gauge("witnet_client_pool_in_use", "Number of node clients in use"),
+            "wait": prometheus_client.Histogram("witnet_client_pool_wait_seconds", "Time spent waiting for a free node client", buckets=WAIT_BUCKETS),
+            "busy": prometheus_client.Counter("witnet_client_pool_busy", "Number of requests which failed because no node client became available"),
+            "latency": prometheus_client.Histogram("witnet_client_rpc_seconds", "Latency of an RPC call to the node pool", ["method"]),
+            "errors": prometheus_client.Counter("witnet_client_rpc_errors", "Number of RPC calls to the node pool which returned an error", ["method"]),
+        }
+        self.metrics["in_use"].set_function(lambda: self.maxsize - self.qsize())
+
+        prometheus_client.start_http_server(port)
+
     # Yield a node to use in a with statement
-    # If block is True, wait until one is free
-    # Otherwise raise a queue Full exception
+    # If block is True, wait until one is free or the timeout expired
+    # Raise a NodePoolBusy exception if no node became available
     @contextmanager
-    def reserve(self, block=True):
-        node = self.get(block)
+    def reserve(self, block=True, timeout=None):
+        start = time.perf_counter()
+        try:
+            node = self.get(block, timeout)
+        except Empty:
+            if self.metrics:
+                self.metrics["busy"].inc()
+            raise NodePoolBusy(self.retry_after)
+        if self.metrics:
+            self.metrics["wait"].observe(time.perf_counter() - start)
+
         try:
             yield node
         finally:
             self.put(node)
 
+    # Execute an RPC method on a free node, applying the acquire timeout and a method-specific socket timeout
+    # The method-specific timeout is also passed to the node as the deadline of the request
+    def execute(self, method, *args, **kwargs):
+        with self.reserve(timeout=self.acquire_timeout) as witnet_node:
+            timeout = self.method_timeouts.get(method, None)
+            request_timeout = witnet_node.request_timeout
+            if timeout is not None:
+                witnet_node.socket_mngr.set_timeout(timeout)
+                witnet_node.request_timeout = timeout
+
+            start = time.perf_counter()
+            try:
+                response = getattr(witnet_node, method)(*args, **kwargs)
+            finally:
+                if timeout is not None:
+                    witnet_node.socket_mngr.reset_timeout()
+                    witnet_node.request_timeout = request_timeout
+
+            if self.metrics:
+                self.metrics["latency"].labels(method).observe(time.perf_counter() - start)
+                if type(response) is dict and "error" in response:
+                    self.metrics["errors"].labels(method).inc()
+
+            # The late response of a timed out request would be read by the next request on this socket
+            if type(response) is dict and str(response.get("reason", "")).startswith("Timed out"):
+                try:
+                    witnet_node.socket_mngr.recreate_socket()
+                except OSError as e:
+                    if witnet_node.logger:
+                        witnet_node.logger.warning(f"Could not recreate the node socket after a timeout: {e}")
+
+            return response
+
     ############################################
     # RPC functions with a connection resource #
     ############################################
 
     def get_consensus_constants(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_consensus_constants()
+        return self.execute("get_consensus_constants")
 
     def get_block(self, block_hash):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_block(block_hash)
+        return self.execute("get_block", block_hash)
 
     def get_blockchain(self, epoch=0, num_blocks=0):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_blockchain(epoch=epoch, num_blocks=num_blocks)
+        return self.execute("get_blockchain", epoch=epoch, num_blocks=num_blocks)
 
     def get_balance(self, node_address, simple=True):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_balance(node_address, simple=simple)
+        return self.execute("get_balance", node_address, simple=simple)
 
     def get_balance_all(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_balance_all()
+        return self.execute("get_balance_all")
 
     def get_reputation(self, node_address):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_reputation(node_address)
+        return self.execute("get_reputation", node_address)
 
     def get_reputation_all(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_reputation_all()
+        return self.execute("get_reputation_all")
 
     def get_transaction(self, txn_hash):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_transaction(txn_hash)
+        return self.execute("get_transaction", txn_hash)
 
     def get_sync_status(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_sync_status()
+        return self.execute("get_sync_status")
 
     def get_known_peers(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_known_peers()
+        return self.execute("get_known_peers")
 
     def get_mempool(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_mempool()
+        return self.execute("get_mempool")
 
     def get_supply_info(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_supply_info()
+        return self.execute("get_supply_info")
 
     def get_utxos(self, address):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_utxos(address)
+        return self.execute("get_utxos", address)
 
     def send_vtt(self, vtt):
-        with self.reserve() as witnet_node:
-            return witnet_node.send_vtt(vtt)
+        return self.execute("send_vtt", vtt)
 
     def get_priority(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_priority()
+        return self.execute("get_priority")
 
     def get_current_epoch(self):
-        with self.reserve() as witnet_node:
-            return witnet_node.get_current_epoch()
+        return self.execute("get_current_epoch")
@@ -0,0 +1,25 @@
+import threading
+
+# Marshmallow schemas are safe to share between threads as long as they are not mutated after
+# construction, so keep a single instance per (schema, many) pair instead of building new ones
+# for every request
+_schema_instances = {}
+_schema_lock = threading.Lock()
+
+
+def get_schema(schema_class, many=False):
+    key = (schema_class, many)
+    schema = _schema_instances.get(key)
+    if schema is None:
+        with _schema_lock:
+            schema = _schema_instances.get(key)
+            if schema is None:
+                schema = schema_class(many=many)
+                _schema_instances[key] = schema
+    return schema
+
+
+# Validate (and deserialize) data exactly once with a shared schema instance
+# The returned data can be used both to populate the cache and as the response body
+def load_response(schema_class, data, many=False):
+    return get_schema(schema_class, many=many).load(data)
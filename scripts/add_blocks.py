@@ -58,16 +58,20 @@ def add_block(
     witnet_database = WitnetDatabase(config["database"])
     witnet_database.insert_block(block_json)
     witnet_database.insert_mint_txn(block_json["transactions"]["mint"], epoch)
-    for txn_details in block_json["transactions"]["value_transfer"]:
-        witnet_database.insert_value_transfer_txn(txn_details, epoch)
-    for txn_details in block_json["transactions"]["data_request"]:
-        witnet_database.insert_data_request_txn(txn_details, epoch)
-    for txn_details in block_json["transactions"]["commit"]:
-        witnet_database.insert_commit_txn(txn_details, epoch)
-    for txn_details in block_json["transactions"]["reveal"]:
-        witnet_database.insert_reveal_txn(txn_details, epoch)
-    for txn_details in block_json["transactions"]["tally"]:
-        witnet_database.insert_tally_txn(txn_details, epoch)
+    for block_position, txn_details in enumerate(
+        block_json["transactions"]["value_transfer"]
+    ):
+        witnet_database.insert_value_transfer_txn(txn_details, epoch, block_position)
+    for block_position, txn_details in enumerate(
+        block_json["transactions"]["data_request"]
+    ):
+        witnet_database.insert_data_request_txn(txn_details, epoch, block_position)
+    for block_position, txn_details in enumerate(block_json["transactions"]["commit"]):
+        witnet_database.insert_commit_txn(txn_details, epoch, block_position)
+    for block_position, txn_details in enumerate(block_json["transactions"]["reveal"]):
+        witnet_database.insert_reveal_txn(txn_details, epoch, block_position)
+    for block_position, txn_details in enumerate(block_json["transactions"]["tally"]):
+        witnet_database.insert_tally_txn(txn_details, epoch, block_position)
     witnet_database.insert_addresses(addresses)
     witnet_database.finalize(epoch)
 
@@ -0,0 +1,92 @@
+import optparse
+
+import toml
+from psycopg.sql import SQL, Identifier
+
+from node.witnet_node import WitnetNode
+from util.database_manager import DatabaseManager
+
+# Transaction tables and the key of their hashes in a block fetched from a node
+TABLES = {
+    "value_transfer_txns": "value_transfer",
+    "data_request_txns": "data_request",
+    "commit_txns": "commit",
+    "reveal_txns": "reveal",
+    "tally_txns": "tally",
+}
+
+
+def add_position_columns(db_mngr):
+    for table in TABLES:
+        sql_statement = (
+            "ALTER TABLE {table} ADD COLUMN IF NOT EXISTS block_position SMALLINT"
+        )
+        sql_statement = SQL(sql_statement).format(table=Identifier(table))
+        db_mngr.sql_update_table(sql_statement)
+
+
+def backfill_positions(db_mngr, witnet_node, start_epoch, stop_epoch):
+    sql_statement = """
+        SELECT
+            block_hash,
+            epoch
+        FROM
+            blocks
+        WHERE
+            epoch BETWEEN %s AND %s
+        AND
+            reverted=false
+        ORDER BY
+            epoch
+    """
+    blocks = db_mngr.sql_return_all(sql_statement, parameters=[start_epoch, stop_epoch])
+
+    for block_hash, epoch in blocks or []:
+        block = witnet_node.get_block(block_hash.hex())
+        if "error" in block:
+            print(f"Could not fetch block {block_hash.hex()}: {block['error']}")
+            continue
+
+        txns_hashes = block["result"]["txns_hashes"]
+        for table, key in TABLES.items():
+            data = [
+                [block_position, bytearray.fromhex(txn_hash)]
+                for block_position, txn_hash in enumerate(txns_hashes[key])
+            ]
+            if len(data) == 0:
+                continue
+            sql_statement = "UPDATE {table} SET block_position=%s WHERE txn_hash=%s"
+            sql_statement = SQL(sql_statement).format(table=Identifier(table))
+            db_mngr.sql_execute_many(sql_statement, data)
+
+        print(f"Stored transaction positions for block {block_hash.hex()} ({epoch})")
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("--start-epoch", type="int", default=0, dest="start_epoch")
+    parser.add_option("--stop-epoch", type="int", default=-1, dest="stop_epoch")
+    parser.add_option(
+        "--config-file",
+        type="string",
+        default="explorer.toml",
+        dest="config_file",
+        help="Specify a configuration file",
+    )
+    options, args = parser.parse_args()
+
+    config = toml.load(options.config_file)
+    db_mngr = DatabaseManager(config["database"])
+
+    add_position_columns(db_mngr)
+
+    # Blocks inserted before the positions were stored are fetched from a node by the API until backfilled
+    if options.stop_epoch >= options.start_epoch:
+        witnet_node = WitnetNode(config["node-pool"], timeout=300)
+        backfill_positions(
+            db_mngr, witnet_node, options.start_epoch, options.stop_epoch
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import optparse
+
+import toml
+from psycopg.sql import SQL, Identifier
+
+from util.common_functions import build_priority_histogram
+from util.database_manager import DatabaseManager
+
+
+def add_histogram_columns(db_mngr, table):
+    for column in ("priority", "amount"):
+        sql_statement = (
+            "ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} INT ARRAY"
+        )
+        sql_statement = SQL(sql_statement).format(
+            table=Identifier(table), column=Identifier(column)
+        )
+        db_mngr.sql_update_table(sql_statement)
+
+
+def backfill_histograms(db_mngr, table, batch_size):
+    total = 0
+    while True:
+        sql_statement = """
+            SELECT
+                timestamp,
+                fee,
+                weight
+            FROM
+                {table}
+            WHERE
+                priority IS NULL
+            ORDER BY
+                timestamp
+            LIMIT %s
+        """
+        sql_statement = SQL(sql_statement).format(table=Identifier(table))
+        snapshots = db_mngr.sql_return_all(sql_statement, parameters=[batch_size])
+        if not snapshots:
+            break
+
+        data = []
+        for timestamp, fees, weights in snapshots:
+            priorities, amounts = build_priority_histogram(fees, weights)
+            data.append([priorities.tolist(), amounts.tolist(), timestamp])
+
+        sql_statement = "UPDATE {table} SET priority=%s, amount=%s WHERE timestamp=%s"
+        sql_statement = SQL(sql_statement).format(table=Identifier(table))
+        db_mngr.sql_execute_many(sql_statement, data)
+
+        total += len(snapshots)
+        print(f"Built {total} priority histograms for {table}")
+
+
+def set_histogram_columns_not_null(db_mngr, table):
+    for column in ("priority", "amount"):
+        sql_statement = "ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"
+        sql_statement = SQL(sql_statement).format(
+            table=Identifier(table), column=Identifier(column)
+        )
+        db_mngr.sql_update_table(sql_statement)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--batch-size",
+        type="int",
+        default=10000,
+        dest="batch_size",
+        help="Number of mempool snapshots to process per batch",
+    )
+    parser.add_option(
+        "--config-file",
+        type="string",
+        default="explorer.toml",
+        dest="config_file",
+        help="Specify a configuration file",
+    )
+    options, args = parser.parse_args()
+
+    config = toml.load(options.config_file)
+    db_mngr = DatabaseManager(config["database"])
+
+    for table in ("data_request_mempool", "value_transfer_mempool"):
+        add_histogram_columns(db_mngr, table)
+        backfill_histograms(db_mngr, table, options.batch_size)
+        set_histogram_columns_not_null(db_mngr, table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import glob
+import json
+import optparse
+import os
+import pickle
+import statistics
+import time
+
+from util.memcached_codec import CodecClient
+
+
+def load_payloads(directory):
+    # Every top-level entry of the mockup files is a value which is saved in memcached
+    payloads = {}
+    for filename in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        label = os.path.splitext(os.path.basename(filename))[0]
+        data = json.load(open(filename))
+        if isinstance(data, dict):
+            for key, value in data.items():
+                payloads[f"{label}/{key}"] = value
+        else:
+            payloads[label] = data
+    return payloads
+
+
+def time_decode(function, data, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--directory", type="string", default="mockups/data", dest="directory"
+    )
+    parser.add_option("--repeats", type="int", default=20, dest="repeats")
+    options, args = parser.parse_args()
+
+    payloads = load_payloads(options.directory)
+    # Serializing does not connect to the server
+    memcached_client = CodecClient(["127.0.0.1"])
+
+    totals = {"pickle": [0, 0], "codec": [0, 0]}
+    print(
+        f"{'payload':>60} {'pickle size':>12} {'codec size':>12} {'pickle decode':>14} {'codec decode':>14}"
+    )
+    for label, value in payloads.items():
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        encoded, flags = memcached_client.serialize(value)
+
+        pickle_time = time_decode(pickle.loads, pickled, options.repeats)
+        codec_time = time_decode(
+            lambda data: memcached_client.deserialize(data, flags),
+            encoded,
+            options.repeats,
+        )
+
+        totals["pickle"][0] += len(pickled)
+        totals["pickle"][1] += pickle_time
+        totals["codec"][0] += len(encoded)
+        totals["codec"][1] += codec_time
+
+        print(
+            f"{label[-60:]:>60} {len(pickled):>12} {len(encoded):>12} {pickle_time * 1e6:>12.1f}us {codec_time * 1e6:>12.1f}us"
+        )
+
+    print(
+        f"{'total':>60} {totals['pickle'][0]:>12} {totals['codec'][0]:>12} {totals['pickle'][1] * 1e6:>12.1f}us {totals['codec'][1] * 1e6:>12.1f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
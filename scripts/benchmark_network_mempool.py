@@ -0,0 +1,100 @@
+import optparse
+import random
+import time
+
+from api.blueprints.network.mempool_blueprint import interpolate_and_transform
+from util.common_functions import calculate_priority
+
+
+# Loop-based implementation of interpolate_and_transform used as the reference for the vectorized version
+def interpolate_and_transform_reference(
+    start_timestamp, stop_timestamp, raw_data, sample_rate, granularity
+):
+    histogram_data = [
+        {"timestamp": timestamp, "fee": [], "amount": []}
+        for timestamp in range(start_timestamp, stop_timestamp, granularity)
+    ]
+
+    counter = 0
+    for hd in range(0, len(histogram_data)):
+        aggregated_histogram = {}
+        for rd in range(counter, len(raw_data)):
+            if raw_data[rd][0] <= histogram_data[hd]["timestamp"]:
+                for priority, amount in zip(raw_data[rd][1], raw_data[rd][2]):
+                    if priority not in aggregated_histogram:
+                        aggregated_histogram[priority] = 0
+                    aggregated_histogram[priority] += amount
+            else:
+                break
+            counter += 1
+        if len(aggregated_histogram) > 0:
+            histogram_data[hd]["fee"] = [
+                priority for priority, _ in sorted(aggregated_histogram.items())
+            ]
+            histogram_data[hd]["amount"] = [
+                calculate_priority(amount, sample_rate, round_priority=True)
+                for _, amount in sorted(aggregated_histogram.items())
+            ]
+
+    return histogram_data
+
+
+def generate_snapshots(start_timestamp, stop_timestamp, interval, max_priorities):
+    snapshots = []
+    for timestamp in range(start_timestamp, stop_timestamp, interval):
+        # Simulate periods where the mempool is empty
+        if random.random() < 0.1:
+            continue
+        priorities = sorted(
+            random.sample(range(0, 10000), random.randint(1, max_priorities))
+        )
+        amounts = [random.randint(1, 500) for _ in priorities]
+        snapshots.append([timestamp, priorities, amounts])
+    return snapshots
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("--days", type="int", default=7, dest="days")
+    parser.add_option("--interval", type="int", default=60, dest="interval")
+    parser.add_option("--max-priorities", type="int", default=50, dest="max_priorities")
+    parser.add_option("--iterations", type="int", default=5, dest="iterations")
+    options, args = parser.parse_args()
+
+    random.seed(0)
+
+    stop_timestamp = int(time.time() / 60) * 60
+    start_timestamp = stop_timestamp - options.days * 24 * 60 * 60
+    snapshots = generate_snapshots(
+        start_timestamp, stop_timestamp, options.interval, options.max_priorities
+    )
+    print(f"Generated {len(snapshots)} mempool snapshots over {options.days} days")
+
+    for granularity in (60, 3600, 86400):
+        sample_rate = max(1, int(granularity / options.interval))
+
+        timings = {}
+        for function in (
+            interpolate_and_transform_reference,
+            interpolate_and_transform,
+        ):
+            start = time.perf_counter()
+            for _ in range(options.iterations):
+                result = function(
+                    start_timestamp, stop_timestamp, snapshots, sample_rate, granularity
+                )
+            timings[function.__name__] = (
+                time.perf_counter() - start
+            ) / options.iterations
+            if function is interpolate_and_transform_reference:
+                reference = result
+
+        assert result == reference, "Vectorized output differs from the reference"
+
+        print(
+            f"Granularity {granularity:>5}s: reference {timings['interpolate_and_transform_reference'] * 1000:.1f}ms, vectorized {timings['interpolate_and_transform'] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
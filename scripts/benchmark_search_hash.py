@@ -0,0 +1,101 @@
+import optparse
+import statistics
+import time
+
+import toml
+
+from blockchain.transactions.commit import Commit
+from blockchain.transactions.data_request import DataRequest
+from blockchain.transactions.value_transfer import ValueTransfer
+from node.consensus_constants import ConsensusConstants
+from util.database_pool import DatabasePool
+
+# Transaction types for which search/hash passes custom types to the database lookup
+TRANSACTIONS = {
+    "value_transfer_txn": ValueTransfer,
+    "data_request_txn": DataRequest,
+    "commit_txn": Commit,
+}
+
+
+def sample_hashes(database, hash_type, samples):
+    sql = """
+        SELECT
+            hash
+        FROM
+            hashes
+        WHERE
+            type=%s
+        ORDER BY
+            epoch
+        DESC
+        LIMIT %s
+    """
+    hashes = database.sql_return_all(sql, parameters=[hash_type, samples])
+    return [hash_value.hex() for (hash_value,) in hashes or []]
+
+
+def search_hash(database, consensus_constants, hash_type, hash_value):
+    # Same database lookups as the search/hash endpoint on a memcached miss
+    sql = """
+        SELECT
+            type
+        FROM
+            hashes
+        WHERE
+            hash=%s
+    """
+    database.sql_return_one(sql, parameters=[bytearray.fromhex(hash_value)])
+    transaction = TRANSACTIONS[hash_type](consensus_constants, database=database)
+    return transaction.get_transaction_from_database(hash_value)
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--config-file", type="string", default="explorer.toml", dest="config_file"
+    )
+    parser.add_option("--samples", type="int", default=100, dest="samples")
+    options, args = parser.parse_args()
+
+    config = toml.load(options.config_file)
+
+    # Registering the custom types per call is the behavior before they were registered once per pooled connection
+    pools = {
+        "per call": DatabasePool(config["database"], custom_types=[]),
+        "per connection": DatabasePool(config["database"]),
+    }
+
+    consensus_constants = ConsensusConstants(database=pools["per connection"])
+
+    for hash_type in TRANSACTIONS:
+        hashes = sample_hashes(pools["per connection"], hash_type, options.samples)
+        if len(hashes) == 0:
+            continue
+
+        timings = {}
+        for label, database in pools.items():
+            # Warm up the pool and the database caches
+            search_hash(database, consensus_constants, hash_type, hashes[0])
+
+            latencies = []
+            for hash_value in hashes:
+                start = time.perf_counter()
+                search_hash(database, consensus_constants, hash_type, hash_value)
+                latencies.append(time.perf_counter() - start)
+            timings[label] = latencies
+
+        print(
+            f"{hash_type:>18} ({len(hashes)} hashes): "
+            + ", ".join(
+                f"{label} median {statistics.median(latencies) * 1000:.2f}ms, p95 {sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000:.2f}ms"
+                for label, latencies in timings.items()
+            )
+        )
+
+    for database in pools.values():
+        database.terminate(verbose=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,16 @@
 import optparse
 import sys
 
-import pylibmc
 import toml
 
+from util.memcached_codec import CodecClient
 from util.socket_manager import SocketManager
 
 
 def create_memcached_client(config):
     cache_config = config["api"]["caching"]
     servers = cache_config["server"].split(",")
-    memcached_client = pylibmc.Client(
+    memcached_client = CodecClient(
         servers,
         binary=True,
         username=cache_config["user"],
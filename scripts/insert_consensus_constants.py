@@ -1,10 +1,14 @@
 import argparse
+import sys
 import time
 
+import pylibmc
 import toml
 
+from node.constants_registry import publish_constants_version
 from node.witnet_node import WitnetNode
 from util.database_manager import DatabaseManager
+from util.memcached_codec import CodecClient
 
 
 def get_consensus_constants(config):
@@ -51,6 +55,22 @@ def insert_consensus_constants(config, consensus_constants):
         db_mngr.sql_insert_one(sql, (key, value))
 
 
+def publish_version(config):
+    # API workers reload the consensus constants and WIPs when this version changes
+    cache_config = config["api"]["caching"]
+    memcached_client = CodecClient(
+        cache_config["server"].split(","),
+        binary=True,
+        username=cache_config["user"],
+        password=cache_config["password"],
+        behaviors={"tcp_nodelay": True, "ketama": True},
+    )
+    try:
+        publish_constants_version(memcached_client)
+    except pylibmc.Error as e:
+        sys.stderr.write(f"Could not publish the new constants version: {e}\n")
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="Insert consensus constants",
@@ -70,6 +90,8 @@ def main():
 
     insert_consensus_constants(config, consensus_constants)
 
+    publish_version(config)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,122 @@
+import concurrent.futures
+import optparse
+import random
+import statistics
+import time
+import urllib.request
+
+# Endpoints which are answered from the cache, the mempool is fetched from the node by at most one worker per
+# cache timeout through get_or_compute, so it mostly measures the cache as well
+CACHED_ENDPOINTS = [
+    "/api/home?key=full",
+    "/api/network/reputation",
+    "/api/status",
+    "/api/transaction/mempool?type=all",
+]
+# Endpoints which query the node on every request: the UTXOs of addresses are only read from the cache when the
+# addresses caching process saved them, so pass addresses which it does not track
+NODE_ENDPOINTS = [
+    "/api/address/utxos?addresses={address}",
+]
+
+
+def request(url, timeout):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            success = response.status == 200
+    except OSError:
+        success = False
+    return success, time.perf_counter() - start
+
+
+def worker(options, deadline):
+    timings = {}
+    while time.time() < deadline:
+        if random.random() < options.node_ratio:
+            endpoint = random.choice(NODE_ENDPOINTS)
+        else:
+            endpoint = random.choice(CACHED_ENDPOINTS)
+        endpoint = endpoint.format(address=random.choice(options.addresses))
+
+        success, duration = request(options.url + endpoint, options.timeout)
+
+        label = endpoint.split("?")[0]
+        if label not in timings:
+            timings[label] = {"durations": [], "errors": 0}
+        if success:
+            timings[label]["durations"].append(duration)
+        else:
+            timings[label]["errors"] += 1
+    return timings
+
+
+def percentile(durations, fraction):
+    if len(durations) == 0:
+        return 0
+    durations = sorted(durations)
+    return durations[min(int(len(durations) * fraction), len(durations) - 1)]
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--url", type="string", default="http://127.0.0.1:5000", dest="url"
+    )
+    parser.add_option("--concurrency", type="int", default=32, dest="concurrency")
+    parser.add_option("--duration", type="int", default=60, dest="duration")
+    parser.add_option("--node-ratio", type="float", default=0.2, dest="node_ratio")
+    parser.add_option("--timeout", type="int", default=30, dest="timeout")
+    parser.add_option(
+        "--addresses",
+        type="string",
+        default="",
+        dest="addresses",
+        help="Comma-separated list of addresses, not tracked by the addresses caching process, to request UTXOs for",
+    )
+    options, args = parser.parse_args()
+
+    options.addresses = [a for a in options.addresses.split(",") if a]
+    if len(options.addresses) == 0 and options.node_ratio > 0:
+        parser.error("--addresses is required to request endpoints querying the node")
+    if len(options.addresses) == 0:
+        options.addresses = [""]
+
+    deadline = time.time() + options.duration
+    with concurrent.futures.ThreadPoolExecutor(options.concurrency) as executor:
+        futures = [
+            executor.submit(worker, options, deadline)
+            for _ in range(options.concurrency)
+        ]
+        results = [future.result() for future in futures]
+
+    # Merge the timings of all workers
+    timings = {}
+    for result in results:
+        for label, timing in result.items():
+            if label not in timings:
+                timings[label] = {"durations": [], "errors": 0}
+            timings[label]["durations"].extend(timing["durations"])
+            timings[label]["errors"] += timing["errors"]
+
+    print(
+        f"{'endpoint':>40} {'requests':>10} {'errors':>8} {'median':>10} {'p95':>10} {'p99':>10}"
+    )
+    total_requests, total_errors = 0, 0
+    for label, timing in sorted(timings.items()):
+        durations = timing["durations"]
+        total_requests += len(durations)
+        total_errors += timing["errors"]
+        median = statistics.median(durations) if durations else 0
+        print(
+            f"{label:>40} {len(durations):>10} {timing['errors']:>8} {median * 1e3:>8.1f}ms {percentile(durations, 0.95) * 1e3:>8.1f}ms {percentile(durations, 0.99) * 1e3:>8.1f}ms"
+        )
+
+    print(
+        f"{total_requests} requests ({total_errors} errors) in {options.duration}s: {total_requests / options.duration:.1f} requests/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,28 @@
 import optparse
+import sys
 
+import pylibmc
 import toml
-from objects.wip import WIP
+
+from blockchain.objects.wip import WIP
+from node.constants_registry import publish_constants_version
+from util.memcached_codec import CodecClient
+
+
+def publish_version(config):
+    # API workers reload the consensus constants and WIPs when this version changes
+    cache_config = config["api"]["caching"]
+    memcached_client = CodecClient(
+        cache_config["server"].split(","),
+        binary=True,
+        username=cache_config["user"],
+        password=cache_config["password"],
+        behaviors={"tcp_nodelay": True, "ketama": True},
+    )
+    try:
+        publish_constants_version(memcached_client)
+    except pylibmc.Error as e:
+        sys.stderr.write(f"Could not publish the new constants version: {e}\n")
 
 
 def main():
@@ -42,12 +63,13 @@ def main():
 
     config = toml.load(options.config_file)
 
-    wip = WIP(config["database"], config["node-pool"])
+    wip = WIP(database_config=config["database"], node_config=config["node-pool"])
 
     if options.print:
         wip.print_wips()
     elif options.add:
         wip.add_wip()
+        publish_version(config)
     elif options.process:
         wip.process_tapi()
 
@@ -1,3 +1,4 @@
+import gzip
 import json
 
 
@@ -63,3 +64,21 @@ def test_home_not_cached(client):
         json.loads(response.data)["message"]
         == "Could not find homepage data in the cache."
     )
+
+
+def test_home_gzip_etag(client, home):
+    response = client.get("/api/home", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data)) == home
+    gzip_etag = response.headers["etag"]
+
+    response = client.get("/api/home")
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] != gzip_etag
+
+    # The ETag of the uncompressed body does not validate the compressed body
+    headers = {"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    response = client.get("/api/home", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["etag"] == gzip_etag
@@ -1,9 +1,7 @@
 import json
 
-from api.blueprints.network.mempool_blueprint import (
-    build_priority_histogram,
-    interpolate_and_transform,
-)
+from api.blueprints.network.mempool_blueprint import interpolate_and_transform
+from util.common_functions import build_priority_histogram
 
 
 def test_mempool_data_requests_cached(client, network_mempool):
@@ -61,38 +59,28 @@ def test_mempool_value_transfers_not_cached(client, network_mempool):
 def test_mempool_histogram():
     fees = [0, 100, 200, 300, 300, 400]
     weights = [100, 200, 50, 40, 70, 100]
-    expected_histogram = {0: 1, 1: 1, 4: 3, 8: 1}
-    histogram = build_priority_histogram(fees, weights)
-    assert histogram == expected_histogram
+    priorities, amounts = build_priority_histogram(fees, weights)
+    assert priorities.tolist() == [0, 1, 4, 8]
+    assert amounts.tolist() == [1, 1, 3, 1]
+
+
+def test_mempool_histogram_empty():
+    priorities, amounts = build_priority_histogram([], [])
+    assert priorities.tolist() == []
+    assert amounts.tolist() == []
 
 
 def test_mempool_interpolation():
     start_timestamp = 120
     stop_timestamp = 540
     data = [
-        [
-            210,
-            [0, 100, 200, 300, 300, 400],
-            [100, 200, 50, 40, 70, 100],
-        ],  # {0: 1, 1: 1, 4: 3, 8: 1}
-        [
-            225,
-            [0, 100, 200, 300],
-            [100, 200, 50, 70],
-        ],  # {0: 1, 1: 1, 4: 2}
+        [210, [0, 1, 4, 8], [1, 1, 3, 1]],
+        [225, [0, 1, 4], [1, 1, 2]],
         [240, [], []],
         [300, [], []],
         [315, [], []],
-        [
-            435,
-            [0, 100, 200, 300, 300, 400],
-            [100, 200, 50, 40, 70, 100],
-        ],  # {0: 1, 1: 1, 4: 3, 8: 1}
-        [
-            450,
-            [0, 100, 200, 300, 300, 400],
-            [100, 200, 50, 40, 70, 100],
-        ],  # {0: 1, 1: 1, 4: 3, 8: 1}
+        [435, [0, 1, 4, 8], [1, 1, 3, 1]],
+        [450, [0, 1, 4, 8], [1, 1, 3, 1]],
     ]
 
     sample_rate_60 = 4
@@ -129,3 +117,30 @@ def test_mempool_interpolation():
         120,
     )
     assert expected_interpolation_120 == interpolated_histogram_120
+
+
+def test_mempool_interpolation_out_of_range():
+    start_timestamp = 120
+    stop_timestamp = 300
+    data = [
+        [60, [2, 5], [3, 1]],
+        [120, [2], [1]],
+        [130, [], []],
+        [200, [-1, 5], [2, 2]],
+        [240, [5, 7], [4, 1]],
+        [250, [1], [9]],
+    ]
+
+    expected_interpolation = [
+        {"timestamp": 120, "fee": [2, 5], "amount": [2, 1]},
+        {"timestamp": 180, "fee": [], "amount": []},
+        {"timestamp": 240, "fee": [-1, 5, 7], "amount": [1, 3, 1]},
+    ]
+    interpolated_histogram = interpolate_and_transform(
+        start_timestamp,
+        stop_timestamp,
+        data,
+        2,
+        60,
+    )
+    assert expected_interpolation == interpolated_histogram
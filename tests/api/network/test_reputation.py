@@ -1,5 +1,7 @@
 import json
 
+from node.witnet_client_pool import NodePoolBusy
+
 
 def test_reputation_cached(client, reputation):
     response = client.get("/api/network/reputation")
@@ -19,3 +21,30 @@ def test_reputation_not_cached(client, reputation):
         json.loads(response.data)["total_reputation"] == reputation["total_reputation"]
     )
     assert client.application.extensions["cache"].get("reputation") is not None
+
+
+def test_reputation_not_modified(client, reputation):
+    response = client.get("/api/network/reputation")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    response = client.get("/api/network/reputation", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["x-version"] == "1.0.0"
+    assert response.data == b""
+
+
+def test_reputation_node_pool_busy(client, monkeypatch):
+    def get_reputation_all():
+        raise NodePoolBusy(5)
+
+    client.application.extensions["cache"].delete("reputation")
+    witnet_node = client.application.extensions["witnet_node"]
+    monkeypatch.setattr(witnet_node, "get_reputation_all", get_reputation_all)
+    response = client.get("/api/network/reputation")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert response.headers["x-version"] == "1.0.0"
+    assert json.loads(response.data) == {
+        "message": "All node connections are busy, retry later."
+    }
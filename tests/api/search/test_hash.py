@@ -1,5 +1,7 @@
 import json
 
+from blockchain.objects.data_request_report import DataRequestReport
+
 
 def test_search_hash_data_request_pending(client):
     hash_value = "1bcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdef0123456789"
@@ -23,6 +25,21 @@ def test_search_hash_value_transfer_pending(client):
     }
 
 
+def test_search_hash_pending_not_cached(client):
+    cache = client.application.extensions["cache"]
+    cache.delete("pending_hashes")
+    assert cache.get("pending_hashes") is None
+    hash_value = "1bcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdefabcdef0123456789"
+    response = client.get(f"/api/search/hash?value={hash_value}")
+    assert response.status_code == 200
+    assert response.headers["x-version"] == "1.0.0"
+    assert json.loads(response.data) == {
+        "response_type": "pending",
+        "pending": "Data request is pending.",
+    }
+    assert hash_value in cache.get("pending_hashes")["data_request"]
+
+
 def test_search_block_cached(client, blocks):
     cache = client.application.extensions["cache"]
     hash_value = "6bf0bbafb380cced8134684c31028af6701905c223f4513f0c8d871c1beb8923"
@@ -185,6 +202,39 @@ def test_search_data_request_report_not_cached(client, data_request_reports):
     assert cache.get(hash_value) is not None
 
 
+def test_search_data_request_report_saved(client, data_request_reports, monkeypatch):
+    # A memcached miss is served from the saved report without building the report
+    def get_report(self):
+        raise AssertionError("the saved data request report was not used")
+
+    monkeypatch.setattr(DataRequestReport, "get_report", get_report)
+    cache = client.application.extensions["cache"]
+    hash_value = "713973d2f0b4fef783bc2c31b0efa1f931e12add19cad72870d09a2517e711b6"
+    cache.delete(hash_value)
+    response = client.get(f"/api/search/hash?value={hash_value}")
+    assert response.status_code == 200
+    assert response.headers["x-version"] == "1.0.0"
+    assert json.loads(response.data) == data_request_reports[hash_value]
+    assert cache.get(hash_value) == data_request_reports[hash_value]
+
+
+def test_search_data_request_report_not_saved(
+    client, data_request_reports, monkeypatch
+):
+    # Build the report from the transactions if it was not saved
+    monkeypatch.setattr(
+        DataRequestReport, "get_saved_report", lambda self, data_request_hash: None
+    )
+    cache = client.application.extensions["cache"]
+    hash_value = "713973d2f0b4fef783bc2c31b0efa1f931e12add19cad72870d09a2517e711b6"
+    cache.delete(hash_value)
+    response = client.get(f"/api/search/hash?value={hash_value}")
+    assert response.status_code == 200
+    assert response.headers["x-version"] == "1.0.0"
+    assert json.loads(response.data) == data_request_reports[hash_value]
+    assert cache.get(hash_value) is not None
+
+
 def test_search_data_request_report_from_commit_cached(client, data_request_reports):
     cache = client.application.extensions["cache"]
     dr_hash = "713973d2f0b4fef783bc2c31b0efa1f931e12add19cad72870d09a2517e711b6"
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from mockups.database import MockDatabase
@@ -18,3 +20,8 @@ def witnet_node():
 @pytest.fixture
 def consensus_constants(database):
     return ConsensusConstants(database=database)
+
+
+@pytest.fixture
+def blocks():
+    return json.load(open("mockups/data/blocks.json"))
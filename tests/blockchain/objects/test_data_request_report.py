@@ -0,0 +1,71 @@
+import logging
+
+from marshmallow import ValidationError
+
+from blockchain.objects.data_request_report import (
+    DataRequestReport,
+    get_data_request_reports,
+)
+from blockchain.transactions.commit import Commit
+
+
+def test_get_data_request_reports(consensus_constants, database):
+    logger = logging.getLogger("test")
+    txn_hash = "713973d2f0b4fef783bc2c31b0efa1f931e12add19cad72870d09a2517e711b6"
+
+    data_request_report = DataRequestReport(
+        "data_request",
+        txn_hash,
+        consensus_constants,
+        logger=logger,
+        database=database,
+    )
+    report = data_request_report.get_report()
+
+    reports = get_data_request_reports(
+        [txn_hash],
+        consensus_constants,
+        logger=logger,
+        database=database,
+    )
+
+    assert reports == {txn_hash: report}
+
+
+def test_get_data_request_reports_not_found(consensus_constants, database):
+    txn_hash = "0000000000000000000000000000000000000000000000000000000000000000"
+    reports = get_data_request_reports(
+        [txn_hash],
+        consensus_constants,
+        database=database,
+    )
+    assert reports == {txn_hash: {"error": "transaction not found"}}
+
+
+def test_get_data_request_reports_invalid_commit(
+    consensus_constants, database, monkeypatch
+):
+    txn_hash = "713973d2f0b4fef783bc2c31b0efa1f931e12add19cad72870d09a2517e711b6"
+    not_found_hash = "0000000000000000000000000000000000000000000000000000000000000000"
+
+    # Fail validating the commits of the first data request only
+    process_commits = Commit.process_commits
+    calls = []
+
+    def process_commits_once_invalid(self, results):
+        calls.append(results)
+        if len(calls) == 1:
+            raise ValidationError("invalid commit")
+        return process_commits(self, results)
+
+    monkeypatch.setattr(Commit, "process_commits", process_commits_once_invalid)
+
+    reports = get_data_request_reports(
+        [txn_hash, not_found_hash],
+        consensus_constants,
+        database=database,
+    )
+    assert reports == {
+        txn_hash: {"error": "could not validate transaction"},
+        not_found_hash: {"error": "transaction not found"},
+    }
@@ -0,0 +1,21 @@
+from blockchain.objects.database_block import DatabaseBlock
+
+
+def test_database_block_hash(consensus_constants, database, blocks):
+    hash_value = "6bf0bbafb380cced8134684c31028af6701905c223f4513f0c8d871c1beb8923"
+    database_block = DatabaseBlock(consensus_constants, database=database)
+    block_json = database_block.get_block(block_hash=hash_value)
+    assert block_json == blocks[hash_value]["cache"]["block"]
+
+
+def test_database_block_epoch(consensus_constants, database, blocks):
+    hash_value = "6bf0bbafb380cced8134684c31028af6701905c223f4513f0c8d871c1beb8923"
+    database_block = DatabaseBlock(consensus_constants, database=database)
+    block_json = database_block.get_block(block_epoch=2002561)
+    assert block_json == blocks[hash_value]["cache"]["block"]
+
+
+def test_database_block_not_found(consensus_constants, database):
+    hash_value = "0000000000000000000000000000000000000000000000000000000000000000"
+    database_block = DatabaseBlock(consensus_constants, database=database)
+    assert database_block.get_block(block_hash=hash_value) is None
@@ -0,0 +1,70 @@
+import time
+
+from blockchain.objects.mempool import MempoolFees, MempoolTracker, calculate_fee
+
+
+def test_calculate_fee_data_request(witnet_node, data_requests):
+    txn_hash = "c3fb68882075e755aa62777b5ad5986067ec024fc4007fb75a1d855771119c73"
+    json_txn = witnet_node.get_transaction(txn_hash)["result"]
+    explorer_txn = data_requests[txn_hash]["api"]["explorer"]
+
+    fee = calculate_fee(json_txn, explorer_txn["input_values"])
+
+    assert fee == explorer_txn["miner_fee"]
+
+
+def test_process_transactions_cached_inputs(witnet_node, data_requests):
+    txn_hash = "c3fb68882075e755aa62777b5ad5986067ec024fc4007fb75a1d855771119c73"
+    explorer_txn = data_requests[txn_hash]["api"]["explorer"]
+
+    mempool_fees = MempoolFees(witnet_node, None)
+    # The input of this data request was already seen, so no database or node lookup is required
+    mempool_fees.cache_outputs(
+        "4eaac9ecdb2a95c8241f50f63f1f23828e57dd4f503e2479740dd73578b9e7a6",
+        [0, explorer_txn["input_values"][0]],
+    )
+
+    fees = mempool_fees.process_transactions([txn_hash], time.time() + 60)
+    mempool_fees.terminate()
+
+    assert fees == {txn_hash: (explorer_txn["miner_fee"], explorer_txn["weight"])}
+    # The outputs of the processed transaction can be used as inputs for other pending transactions
+    assert mempool_fees.output_cache[txn_hash] == [explorer_txn["output_value"]]
+
+
+def test_output_cache_is_bounded(witnet_node):
+    mempool_fees = MempoolFees(witnet_node, None, output_cache_size=2)
+    mempool_fees.cache_outputs("a", [1])
+    mempool_fees.cache_outputs("b", [2])
+    mempool_fees.cache_outputs("c", [3])
+    mempool_fees.terminate()
+
+    assert list(mempool_fees.output_cache.keys()) == ["b", "c"]
+
+
+def test_mempool_tracker_update():
+    tracker = MempoolTracker(initial_size=2)
+    tracker.add_many({"a": (10, 1), "b": (20, 2), "c": (30, 3)})
+
+    new, removed = tracker.update(["b", "c", "d"])
+
+    assert new == ["d"]
+    assert removed == 1
+    assert "a" not in tracker
+    assert len(tracker) == 2
+
+
+def test_mempool_tracker_columns():
+    tracker = MempoolTracker(initial_size=2)
+    tracker.add_many({"a": (10, 1), "b": (20, 2), "c": (30, 3)})
+    tracker.remove("a")
+    tracker.add("d", 40, 4)
+
+    fees, weights = tracker.get_columns()
+    columns = {
+        txn_hash: (fees[index], weights[index])
+        for txn_hash, index in tracker.slots.items()
+    }
+
+    assert columns == {"b": (20, 2), "c": (30, 3), "d": (40, 4)}
+    assert sorted(fees.tolist()) == [20, 30, 40]
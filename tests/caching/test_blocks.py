@@ -0,0 +1,24 @@
+import time
+
+from caching.blocks import RateLimiter
+
+
+def test_rate_limiter():
+    rate_limiter = RateLimiter(50)
+
+    start = time.monotonic()
+    for _ in range(11):
+        rate_limiter.acquire()
+
+    # The first call passes immediately, the next ten calls are spaced 20ms apart
+    assert time.monotonic() - start >= 0.2
+
+
+def test_rate_limiter_disabled():
+    rate_limiter = RateLimiter(0)
+
+    start = time.monotonic()
+    for _ in range(1000):
+        rate_limiter.acquire()
+
+    assert time.monotonic() - start < 0.1
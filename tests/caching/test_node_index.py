@@ -0,0 +1,59 @@
+import random
+
+from caching.network_stats_functions import aggregate_nodes
+from caching.node_index import NodeIndex, load_node_index
+
+
+def generate_periods(num_periods, num_addresses):
+    random.seed(0)
+    return [
+        {
+            str(address_id): random.randint(1, 20)
+            for address_id in random.sample(range(num_addresses), num_addresses // 3)
+        }
+        for _ in range(num_periods)
+    ]
+
+
+def flatten_periods(per_period, first_period=0):
+    periods, address_ids, amounts = [], [], []
+    for period, histogram in enumerate(per_period, start=first_period):
+        for address_id, amount in histogram.items():
+            periods.append(period)
+            address_ids.append(int(address_id))
+            amounts.append(amount)
+    return periods, address_ids, amounts
+
+
+def test_node_index_aggregate():
+    per_period = generate_periods(50, 300)
+    node_index = NodeIndex.build(*flatten_periods(per_period))
+
+    for from_period, to_period in ((0, 50), (10, 11), (7, 33), (49, 50)):
+        expected = aggregate_nodes(per_period[from_period:to_period])
+        assert node_index.aggregate(from_period, to_period) == expected
+
+
+def test_node_index_empty_range():
+    node_index = NodeIndex.build(*flatten_periods(generate_periods(5, 30)))
+    assert node_index.aggregate(10, 20) == (0, [])
+
+
+def test_node_index_update():
+    per_period = generate_periods(20, 100)
+    node_index = NodeIndex.build(*flatten_periods(per_period[:15]))
+
+    # Period 14 was only partially processed before and is now replaced
+    node_index = node_index.update(14, *flatten_periods(per_period[14:], 14))
+
+    expected = aggregate_nodes(per_period)
+    assert node_index.aggregate(0, 20) == expected
+
+
+def test_node_index_save_load(tmp_path):
+    per_period = generate_periods(10, 50)
+    NodeIndex.build(*flatten_periods(per_period)).save(tmp_path / "miners_index.npy")
+
+    node_index = load_node_index(tmp_path, "miners")
+    assert node_index.aggregate(2, 8) == aggregate_nodes(per_period[2:8])
+    assert load_node_index(tmp_path, "data_request_solvers") is None
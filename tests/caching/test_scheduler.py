@@ -0,0 +1,135 @@
+from caching.scheduler import JobMetrics, Scheduler, get_next_run
+
+
+def create_scheduler(tmp_path, monkeypatch):
+    config = {
+        "database": {"user": "explorer", "name": "explorer", "password": ""},
+        "api": {
+            "caching": {
+                "scheduler": {
+                    "log_file": str(tmp_path / "scheduler.log"),
+                    "level_file": "info",
+                },
+                "scripts": {
+                    "blocks": {"interval": 60, "run_timeout": 50},
+                    "home_stats": {"interval": 60},
+                    "network_stats": {"cron": "0 * * * *"},
+                    "balance_list": {},
+                    "reputation_list": {},
+                    "tapi_list": {},
+                    "data_request_reports": {
+                        "events": ["block_inserted", "block_reverted"],
+                        "run_timeout": 30,
+                    },
+                },
+            },
+        },
+    }
+    scheduler = Scheduler(config)
+
+    # Do not start worker processes, only track which runs were started
+    started = []
+
+    def start_run(job, timestamp, events=None):
+        started.append((job.name, events) if events else job.name)
+        job.started = timestamp
+
+    for job in scheduler.jobs.values():
+        monkeypatch.setattr(
+            job,
+            "start_run",
+            lambda timestamp, events=None, job=job: start_run(job, timestamp, events),
+        )
+        monkeypatch.setattr(
+            job, "stop_worker", lambda job=job: setattr(job, "started", None)
+        )
+
+    return scheduler, started
+
+
+def test_get_next_run():
+    assert get_next_run(0, 60) == 60
+    assert get_next_run(59.9, 60) == 60
+    assert get_next_run(60, 60) == 120
+    assert get_next_run(7199, 3600) == 7200
+
+
+def test_job_metrics():
+    metrics = JobMetrics()
+    metrics.add_run(2, True)
+    metrics.add_run(4, False)
+    metrics.add_timeout(6)
+
+    assert metrics.runs == 3
+    assert metrics.failures == 2
+    assert metrics.timeouts == 1
+    assert metrics.last_duration == 6
+    assert metrics.max_duration == 6
+    assert metrics.total_duration == 12
+
+
+def test_scheduler_configured_jobs(tmp_path, monkeypatch):
+    scheduler, _ = create_scheduler(tmp_path, monkeypatch)
+
+    assert list(scheduler.jobs.keys()) == [
+        "blocks",
+        "home_stats",
+        "data_request_reports",
+    ]
+    assert scheduler.jobs["blocks"].run_timeout == 50
+    # Without a configured timeout, a run can take up to its interval
+    assert scheduler.jobs["home_stats"].run_timeout == 60
+
+
+def test_scheduler_overlap_and_timeout(tmp_path, monkeypatch):
+    scheduler, started = create_scheduler(tmp_path, monkeypatch)
+    scheduler.jobs["blocks"].next_run = 600
+    scheduler.jobs["home_stats"].next_run = 600
+    scheduler.jobs["blocks"].run_timeout = 90
+
+    # Nothing is due yet
+    scheduler.schedule_jobs(599)
+    assert started == []
+
+    scheduler.schedule_jobs(600)
+    assert started == ["blocks", "home_stats"]
+    assert scheduler.jobs["blocks"].next_run == 660
+
+    # The home stats run finishes, the blocks run is still busy when the next run is due
+    scheduler.jobs["home_stats"].started = None
+    scheduler.schedule_jobs(660)
+    assert started == ["blocks", "home_stats", "home_stats"]
+    assert scheduler.jobs["blocks"].metrics.skipped == 1
+
+    # The busy blocks run exceeded its timeout, so it is stopped and a new run is started
+    scheduler.schedule_jobs(720)
+    assert scheduler.jobs["blocks"].metrics.timeouts == 1
+    assert scheduler.jobs["home_stats"].metrics.skipped == 1
+    assert started[-1] == "blocks"
+
+
+def test_scheduler_events(tmp_path, monkeypatch):
+    scheduler, started = create_scheduler(tmp_path, monkeypatch)
+    job = scheduler.jobs["data_request_reports"]
+
+    # Jobs without an interval only run when they received events they subscribed to
+    scheduler.schedule_jobs(600)
+    assert ("data_request_reports", {"block_inserted": {10}}) not in started
+
+    scheduler.dispatch_events([("block_inserted", 10), ("block_confirmed", 5)])
+    scheduler.schedule_jobs(601)
+    assert started[-1] == ("data_request_reports", {"block_inserted": {10}})
+    assert job.pending_events == {}
+
+    # Events received while the job is busy are processed together in the next run
+    scheduler.dispatch_events([("block_inserted", 11), ("block_reverted", 10)])
+    scheduler.dispatch_events([("block_inserted", 12)])
+    scheduler.schedule_jobs(602)
+    assert job.metrics.skipped == 0
+
+    job.started = None
+    scheduler.schedule_jobs(603)
+    assert started[-1] == (
+        "data_request_reports",
+        {"block_inserted": {11, 12}, "block_reverted": {10}},
+    )
@@ -0,0 +1,106 @@
+import pytest
+
+import node.constants_registry
+from node.constants_registry import (
+    CONSTANTS_VERSION_KEY,
+    ConstantsRegistry,
+    publish_constants_version,
+)
+
+
+class FakeConsensusConstants(object):
+    loaded = 0
+
+    def __init__(self, database=None, witnet_node=None, error_retry=0):
+        FakeConsensusConstants.loaded += 1
+        self.checkpoint_zero_timestamp = 1000
+        self.checkpoints_period = 45
+
+
+class FakeWIP(object):
+    loaded = 0
+
+    def __init__(self, database=None):
+        FakeWIP.loaded += 1
+
+
+class FakeCache(object):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    FakeConsensusConstants.loaded = 0
+    FakeWIP.loaded = 0
+    monkeypatch.setattr(
+        node.constants_registry, "ConsensusConstants", FakeConsensusConstants
+    )
+    monkeypatch.setattr(node.constants_registry, "WIP", FakeWIP)
+    return ConstantsRegistry(check_interval=0)
+
+
+def test_constants_registry_lazy(registry):
+    assert FakeConsensusConstants.loaded == 0
+    assert FakeWIP.loaded == 0
+
+    consensus_constants = registry.get_consensus_constants()
+    assert registry.get_consensus_constants() is consensus_constants
+    assert registry.get_network_times() == (1000, 45)
+    assert FakeConsensusConstants.loaded == 1
+    assert FakeWIP.loaded == 0
+
+    wip = registry.get_wip()
+    assert registry.get_wip() is wip
+    assert FakeWIP.loaded == 1
+
+
+def test_constants_registry_invalidate(registry):
+    consensus_constants = registry.get_consensus_constants()
+    registry.get_wip()
+
+    registry.invalidate()
+    assert FakeConsensusConstants.loaded == 1
+
+    assert registry.get_consensus_constants() is not consensus_constants
+    registry.get_wip()
+    assert FakeConsensusConstants.loaded == 2
+    assert FakeWIP.loaded == 2
+
+
+def test_constants_registry_version(registry):
+    cache = FakeCache()
+    registry.set_cache(cache)
+
+    registry.get_consensus_constants()
+    registry.get_consensus_constants()
+    assert FakeConsensusConstants.loaded == 1
+
+    # A script updated the consensus constants
+    publish_constants_version(cache)
+    assert cache.get(CONSTANTS_VERSION_KEY) is not None
+    registry.get_consensus_constants()
+    registry.get_consensus_constants()
+    assert FakeConsensusConstants.loaded == 2
+
+
+def test_constants_registry_check_interval(registry):
+    cache = FakeCache()
+    registry.set_cache(cache)
+    registry.check_interval = 60
+
+    registry.get_consensus_constants()
+    publish_constants_version(cache)
+    # The version is only checked again after the check interval
+    registry.get_consensus_constants()
+    assert FakeConsensusConstants.loaded == 1
+
+    registry.next_check = 0
+    registry.get_consensus_constants()
+    assert FakeConsensusConstants.loaded == 2
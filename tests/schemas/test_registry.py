@@ -0,0 +1,32 @@
+import pytest
+from marshmallow import ValidationError
+
+from schemas.misc.ping_schema import PingResponse
+from schemas.registry import get_schema, load_response
+
+
+def test_get_schema_reuses_instance():
+    assert get_schema(PingResponse) is get_schema(PingResponse)
+
+
+def test_get_schema_many():
+    schema = get_schema(PingResponse, many=True)
+    assert schema.many
+    assert schema is not get_schema(PingResponse)
+
+
+def test_load_response_success():
+    data = {"response": "pong"}
+    assert load_response(PingResponse, data) == data
+
+
+def test_load_response_many_success():
+    data = [{"response": "pong"}, {"response": "pong"}]
+    assert load_response(PingResponse, data, many=True) == data
+
+
+def test_load_response_failure():
+    data = {"response": "pon"}
+    with pytest.raises(ValidationError) as err_info:
+        load_response(PingResponse, data)
+    assert err_info.value.messages["response"][0] == "Must be equal to pong."
@@ -0,0 +1,100 @@
+import psycopg
+import pytest
+from psycopg.adapt import AdaptersMap
+from psycopg.types.composite import CompositeInfo
+
+import util.database_pool
+from util.database_pool import DatabasePool
+
+CONFIG = {
+    "user": "user",
+    "name": "database",
+    "password": "password",
+    "fetch_rows": 100,
+    "min_connections": 1,
+}
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.adapters = AdaptersMap(psycopg.adapters)
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    # Composite types which exist in the database and the number of times they were fetched
+    catalog = {
+        "types": {
+            "utxo": CompositeInfo(
+                "utxo",
+                100000,
+                100001,
+                field_names=["transaction", "idx"],
+                field_types=[17, 23],
+            ),
+            "filter": CompositeInfo(
+                "filter",
+                100002,
+                100003,
+                field_names=["op", "args"],
+                field_types=[23, 17],
+            ),
+        },
+        "fetches": [],
+    }
+
+    def fetch(conn, type_name):
+        catalog["fetches"].append(type_name)
+        return catalog["types"].get(type_name)
+
+    monkeypatch.setattr(util.database_pool.CompositeInfo, "fetch", fetch)
+    return catalog
+
+
+@pytest.fixture
+def database_pool(monkeypatch):
+    # Do not connect to a database
+    monkeypatch.setattr(DatabasePool, "connect", lambda self: None)
+    return DatabasePool(CONFIG)
+
+
+def test_configure_connection(database_pool, catalog):
+    for _ in range(3):
+        conn = FakeConnection()
+        database_pool.configure_connection(conn)
+        assert conn.adapters.types.get("utxo") is catalog["types"]["utxo"]
+        assert conn.adapters.types.get("filter") is catalog["types"]["filter"]
+
+    # The type information is only fetched for the first connection
+    assert catalog["fetches"] == ["utxo", "filter"]
+
+
+def test_configure_connection_missing_type(database_pool, catalog):
+    utxo = catalog["types"].pop("utxo")
+
+    conn = FakeConnection()
+    database_pool.configure_connection(conn)
+    assert conn.adapters.types.get("utxo") is None
+    assert conn.adapters.types.get("filter") is not None
+    assert conn.rollbacks == 2
+
+    # A missing type is not cached and fetched again once it exists
+    catalog["types"]["utxo"] = utxo
+    database_pool.register_custom_types(conn, ["utxo", "filter"])
+    assert conn.adapters.types.get("utxo") is utxo
+
+    conn = FakeConnection()
+    database_pool.configure_connection(conn)
+    assert conn.adapters.types.get("utxo") is utxo
+    assert catalog["fetches"] == ["utxo", "filter", "utxo"]
+
+
+def test_register_custom_types(database_pool, catalog):
+    conn = FakeConnection()
+    database_pool.configure_connection(conn)
+    database_pool.register_custom_types(conn, ["utxo", "filter"])
+    assert catalog["fetches"] == ["utxo", "filter"]
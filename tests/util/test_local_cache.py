@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from tests.util.test_memcached import FakeClient, FakeClientPool
+from util.local_cache import LocalCache
+from util.memcached import MemcachedPool
+
+MAX_AGES = {"home": 30, "tapi-": 60}
+
+
+class FakeConstants(object):
+    # Epochs of 45 seconds starting at timestamp 1000
+    def get_network_times(self):
+        return 1000, 45
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {"time": 1010.0}
+    monkeypatch.setattr(time, "time", lambda: clock["time"])
+    return clock
+
+
+def test_local_cache_max_age(now):
+    local_cache = LocalCache(max_ages=MAX_AGES)
+    local_cache.set("home", "home")
+    local_cache.set("tapi-7", "tapi")
+
+    now["time"] += 29
+    assert local_cache.get("home") == "home"
+    assert local_cache.get("tapi-7") == "tapi"
+
+    now["time"] += 1
+    assert local_cache.get("home") is None
+    assert local_cache.get("tapi-7") == "tapi"
+
+    now["time"] += 30
+    assert local_cache.get("tapi-7") is None
+
+
+def test_local_cache_other_keys(now):
+    # Keys without a configured prefix are never kept
+    local_cache = LocalCache(max_ages=MAX_AGES)
+    local_cache.set("status", "status")
+    assert local_cache.get("status") is None
+    assert local_cache.get_counters() == {"hits": 0, "misses": 0, "items": 0}
+
+
+def test_local_cache_epoch_end(now):
+    local_cache = LocalCache(max_ages=MAX_AGES, constants=FakeConstants())
+    # The current epoch started at 1000 and ends at 1045
+    assert local_cache.get_epoch_end() == 1045
+
+    # Values are not kept past the end of the epoch, even if their max age is longer
+    local_cache.set("tapi-7", "tapi")
+    now["time"] = 1044.9
+    assert local_cache.get("tapi-7") == "tapi"
+    now["time"] = 1045
+    assert local_cache.get("tapi-7") is None
+
+
+def test_local_cache_lru(now):
+    local_cache = LocalCache(max_items=2, max_ages=MAX_AGES)
+    local_cache.set("tapi-1", 1)
+    local_cache.set("tapi-2", 2)
+    assert local_cache.get("tapi-1") == 1
+
+    # The least recently used value is evicted
+    local_cache.set("tapi-3", 3)
+    assert local_cache.get("tapi-1") == 1
+    assert local_cache.get("tapi-2") is None
+    assert local_cache.get("tapi-3") == 3
+
+
+def test_local_cache_counters(now):
+    local_cache = LocalCache(max_ages=MAX_AGES)
+    local_cache.set("home", "home")
+    local_cache.get("home")
+    local_cache.get("home")
+    local_cache.get("tapi-7")
+    assert local_cache.get_counters() == {"hits": 2, "misses": 1, "items": 1}
+
+
+def test_local_cache_memcached_pool(now):
+    local_cache = LocalCache(max_ages=MAX_AGES)
+    # Creating the pool does not connect to the server
+    memcached_pool = MemcachedPool(
+        ["127.0.0.1"], None, None, 1, True, local_cache=local_cache
+    )
+    client = FakeClient()
+    memcached_pool.cache = FakeClientPool(client)
+
+    client.values["home"] = "home"
+    assert memcached_pool.get("home") == "home"
+    client.values["home"] = "updated"
+    assert memcached_pool.get("home") == "home"
+
+    # Setting or deleting a value through the pool evicts it
+    memcached_pool.set("home", "saved")
+    assert local_cache.get("home") is None
+    assert memcached_pool.get("home") == "saved"
+
+    memcached_pool.delete("home")
+    assert local_cache.get("home") is None
+    assert memcached_pool.get("home") is None
+    assert memcached_pool.get_local_cache_counters()["items"] == 0
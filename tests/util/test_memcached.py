@@ -0,0 +1,140 @@
+import logging
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from util.memcached import MemcachedPool
+
+
+class FakeClient(object):
+    # In-memory stand-in for a pylibmc client, expiry times are ignored
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def get_multi(self, keys):
+        return {key: self.values[key] for key in keys if key in self.values}
+
+    def set(self, key, value, timeout=0):
+        self.values[key] = value
+        return True
+
+    def add(self, key, value, timeout=0):
+        if key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+
+class FakeClientPool(object):
+    def __init__(self, client):
+        self.client = client
+
+    @contextmanager
+    def reserve(self, block=False):
+        yield self.client
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+@pytest.fixture
+def memcached_pool(client):
+    # Creating the pool does not connect to the server
+    memcached_pool = MemcachedPool(["127.0.0.1"], None, None, 1, True, lease_timeout=1)
+    memcached_pool.cache = FakeClientPool(client)
+    return memcached_pool
+
+
+def fail():
+    raise ValueError("node unavailable")
+
+
+def test_get_or_compute_fresh(memcached_pool, client):
+    client.values = {"status": "cached", "status_expiry": time.time() + 60}
+    assert memcached_pool.get_or_compute("status", fail, timeout=60) == "cached"
+
+
+def test_get_or_compute_without_expiry(memcached_pool, client):
+    # Values saved by a caching process are always fresh
+    client.values = {"reputation": "cached"}
+    assert memcached_pool.get_or_compute("reputation", fail) == "cached"
+
+
+def test_get_or_compute_miss(memcached_pool, client):
+    value = memcached_pool.get_or_compute("status", lambda: "computed", timeout=60)
+    assert value == "computed"
+    assert client.values["status"] == "computed"
+    assert client.values["status_expiry"] > time.time()
+    assert "status_lease" not in client.values
+
+
+def test_get_or_compute_stale(memcached_pool, client):
+    client.values = {"status": "stale", "status_expiry": time.time() - 1}
+    value = memcached_pool.get_or_compute("status", lambda: "computed", timeout=60)
+    assert value == "computed"
+    assert client.values["status"] == "computed"
+
+
+def test_get_or_compute_stale_leased(memcached_pool, client):
+    # Another worker holds the lease and refreshes the value
+    client.values = {
+        "status": "stale",
+        "status_expiry": time.time() - 1,
+        "status_lease": True,
+    }
+    assert memcached_pool.get_or_compute("status", fail, timeout=60) == "stale"
+    assert client.values["status_lease"] is True
+
+
+def test_get_or_compute_stale_refresh_fails(memcached_pool, client):
+    client.values = {"status": "stale", "status_expiry": time.time() - 1}
+    value = memcached_pool.get_or_compute(
+        "status", fail, timeout=60, logger=logging.getLogger("test")
+    )
+    assert value == "stale"
+    assert "status_lease" not in client.values
+
+
+def test_get_or_compute_wait_for_leader(memcached_pool, client):
+    client.values = {"status_lease": True}
+
+    # The leader saves the value while this worker is waiting for it
+    get = client.get
+
+    def get_after_leader(key):
+        client.values["status"] = "computed"
+        return get(key)
+
+    client.get = get_after_leader
+
+    assert memcached_pool.get_or_compute("status", fail, timeout=60) == "computed"
+
+
+def test_get_or_compute_wait_for_leader_timeout(memcached_pool, client):
+    # The leader did not save a value within the lease timeout
+    client.values = {"status_lease": True}
+    value = memcached_pool.get_or_compute("status", lambda: "computed", timeout=60)
+    assert value == "computed"
+
+
+def test_get_or_compute_lease_released(memcached_pool, client):
+    with pytest.raises(ValueError):
+        memcached_pool.get_or_compute("status", fail, timeout=60)
+    assert "status_lease" not in client.values
+    assert "status" not in client.values
+
+
+def test_get_or_compute_without_timeout(memcached_pool, client):
+    # An expiry time of an earlier refresh does not mark a value without timeout as stale
+    client.values = {"reputation": "stale", "reputation_expiry": time.time() - 1}
+    assert memcached_pool.get_or_compute("reputation", lambda: "computed") == "computed"
+    assert client.values == {"reputation": "computed"}
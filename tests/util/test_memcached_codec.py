@@ -0,0 +1,69 @@
+import cbor2
+import pylibmc
+import pytest
+
+from util.memcached_codec import (
+    COMPRESS_THRESHOLD,
+    FLAG_CODEC,
+    FORMAT_CBOR,
+    FORMAT_ZLIB,
+    CodecClient,
+)
+
+# Serializing does not connect to the server
+SERVERS = ["127.0.0.1"]
+
+
+@pytest.fixture
+def memcached_client():
+    return CodecClient(SERVERS)
+
+
+def test_small_value_native(memcached_client):
+    value = {"epoch": 1000, "hashes": ["ab" * 32] * 10}
+    data, flags = memcached_client.serialize(value)
+    assert (data, flags) == pylibmc.Client(SERVERS).serialize(value)
+    assert not flags & FLAG_CODEC
+    assert memcached_client.deserialize(data, flags) == value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"hashes": [f"{i:064x}" for i in range(1000)]},
+        "ab" * COMPRESS_THRESHOLD,
+        b"\x00" * COMPRESS_THRESHOLD,
+    ],
+)
+def test_large_value_zlib(memcached_client, value):
+    data, flags = memcached_client.serialize(value)
+    assert flags & FLAG_CODEC
+    assert data[0] == FORMAT_ZLIB
+    assert len(data) < COMPRESS_THRESHOLD
+    assert memcached_client.deserialize(data, flags) == value
+
+
+def test_compress_threshold():
+    value = {"hashes": ["ab" * 32] * 10}
+    data, flags = CodecClient(SERVERS, compress_threshold=100).serialize(value)
+    assert data[0] == FORMAT_ZLIB
+    assert flags & FLAG_CODEC
+
+
+def test_read_pickled_value(memcached_client):
+    # Values written before the codec have no codec flag and are unpickled
+    value = {"hashes": [f"{i:064x}" for i in range(1000)]}
+    data, flags = pylibmc.Client(SERVERS).serialize(value)
+    assert not flags & FLAG_CODEC
+    assert memcached_client.deserialize(data, flags) == value
+
+
+def test_read_cbor_value(memcached_client):
+    value = {"epoch": 1000, "confirmed": True}
+    data = bytes([FORMAT_CBOR]) + cbor2.dumps(value)
+    assert memcached_client.deserialize(data, FLAG_CODEC) == value
+
+
+def test_unknown_format(memcached_client):
+    with pytest.raises(ValueError):
+        memcached_client.deserialize(b"\xff", FLAG_CODEC)
@@ -0,0 +1,84 @@
+import psycopg
+import sys
+import time
+
+from psycopg.sql import SQL, Identifier
+
+# Events published by the explorer whenever the state of a block in the database changes, the payload is the epoch of the block
+BLOCK_INSERTED = "block_inserted"
+BLOCK_CONFIRMED = "block_confirmed"
+BLOCK_REVERTED = "block_reverted"
+BLOCK_EVENTS = (BLOCK_INSERTED, BLOCK_CONFIRMED, BLOCK_REVERTED)
+
+def publish_event(db_mngr, event, epoch):
+    # Postgres only delivers the notification to listeners once the statement is committed
+    db_mngr.sql_update_table("SELECT pg_notify(%s, %s)", parameters=[event, str(epoch)])
+
+class EventListener(object):
+    def __init__(self, db_config, events=BLOCK_EVENTS, logger=None, reconnect_interval=10):
+        self.db_config = db_config
+        self.events = events
+
+        self.logger = logger
+
+        self.reconnect_interval = reconnect_interval
+        self.last_connect = 0
+
+        self.connection = None
+        self.connect()
+
+    def connect(self):
+        self.last_connect = time.time()
+        try:
+            # Notifications are only received outside of a transaction, so the connection has to be in autocommit mode
+            if self.db_config["password"]:
+                self.connection = psycopg.connect(user=self.db_config["user"], dbname=self.db_config["name"], password=self.db_config["password"], autocommit=True)
+            else:
+                self.connection = psycopg.connect(user=self.db_config["user"], dbname=self.db_config["name"], autocommit=True)
+
+            for event in self.events:
+                self.connection.execute(SQL("LISTEN {event}").format(event=Identifier(event)))
+        except psycopg.OperationalError as e:
+            self.connection = None
+            str_error = str(e).replace("\n", "").replace("\t", " ")
+            if self.logger:
+                self.logger.error(f"Could not listen for blockchain events, error message: {str_error}")
+            else:
+                sys.stderr.write(f"Could not listen for blockchain events, error message: {str_error}\n")
+
+    # Limit reconnection attempts so an unavailable database does not flood the logs
+    def reconnect(self):
+        if time.time() - self.last_connect < self.reconnect_interval:
+            return
+        self.close()
+        self.connect()
+
+    def fileno(self):
+        if self.connection is None:
+            return None
+        return self.connection.fileno()
+
+    # Return all notifications which arrived within timeout seconds as a list of (event, epoch) tuples
+    # Returns as soon as the first notification is received, including all notifications which arrived alongside it
+    def receive(self, timeout):
+        if self.connection is None:
+            return []
+
+        events = []
+        try:
+            for notify in self.connection.notifies(timeout=timeout, stop_after=1):
+                events.append((notify.channel, int(notify.payload)))
+            if len(events) > 0:
+                for notify in self.connection.notifies(timeout=0):
+                    events.append((notify.channel, int(notify.payload)))
+        except psycopg.OperationalError as e:
+            if self.logger:
+                self.logger.warning(f"Lost the connection listening for blockchain events: {e}")
+            self.close()
+
+        return events
+
+    def close(self):
+        if self.connection is not None and not self.connection.closed:
+            self.connection.close()
+        self.connection = None
@@ -1,5 +1,7 @@
 import time
 
+import numpy
+
 from util.common_sql import sql_epoch_times
 
 def calculate_block_reward(epoch, halving_period, initial_block_reward):
@@ -21,6 +23,22 @@ def calculate_priority(fee, weight, round_priority=False):
     else:
         return fee / weight
 
+# Vectorized version of calculate_priority with round_priority set to True
+def calculate_priorities(fees, weights):
+    fees = numpy.asarray(fees, dtype=numpy.int64)
+    weights = numpy.asarray(weights, dtype=numpy.int64)
+    # numpy.rint rounds half to even, just like the builtin round function
+    priorities = numpy.rint(fees / weights).astype(numpy.int64)
+    priorities[priorities == 0] = 1
+    priorities[fees == 0] = 0
+    return priorities
+
+# Bucket transactions per rounded priority, returns two sorted arrays with the priorities and their transaction count
+def build_priority_histogram(fees, weights):
+    if len(fees) == 0:
+        return numpy.array([], dtype=numpy.int64), numpy.array([], dtype=numpy.int64)
+    return numpy.unique(calculate_priorities(fees, weights), return_counts=True)
+
 def calculate_current_epoch(start_time, epoch_period):
     return int((time.time() - start_time) / epoch_period)
 
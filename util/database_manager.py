@@ -1,6 +1,9 @@
 import psycopg
 from psycopg.types.composite import CompositeInfo, register_composite
 import sys
+import time
+
+from util.prepared_statements import StatementTimings, statements
 
 class DatabaseManager(object):
     def __init__(self, db_config, named_cursor=False, logger=None, custom_types=[]):
@@ -13,6 +16,9 @@ class DatabaseManager(object):
 
         self.logger = logger
 
+        # Number of calls and execution times of the prepared statements
+        self.statement_timings = StatementTimings()
+
         self.connect(custom_types)
 
     def connect(self, custom_types):
@@ -109,6 +115,47 @@ class DatabaseManager(object):
                 sys.stderr.write("Could not execute SQL statement '" + str(sql) + "', error: " + str(e) + "\n")
             return None
 
+    # Execute a statement from the prepared statement catalogue, it is prepared server-side on its first execution
+    # Note: named cursors are server-side cursors which do not support prepared statements
+    # Note: custom types is unused here, but the option exists to have the same calling convention as when using a database pool connection
+    def statement_return_one(self, name, parameters=None, custom_types=[]):
+        start = time.perf_counter()
+        try:
+            if self.named_cursor:
+                self.cursor.execute(statements[name], parameters)
+            else:
+                self.cursor.execute(statements[name], parameters, prepare=True)
+            return self.cursor.fetchone()
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Could not execute SQL statement '" + name + "', error: " + str(e))
+            else:
+                sys.stderr.write("Could not execute SQL statement '" + name + "', error: " + str(e) + "\n")
+            return None
+        finally:
+            self.statement_timings.add(name, time.perf_counter() - start)
+
+    def statement_return_all(self, name, parameters=None, custom_types=[]):
+        start = time.perf_counter()
+        try:
+            if self.named_cursor:
+                self.cursor.execute(statements[name], parameters)
+                return self.cursor
+            else:
+                self.cursor.execute(statements[name], parameters, prepare=True)
+                return self.cursor.fetchall()
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Could not execute SQL statement '" + name + "', error: " + str(e))
+            else:
+                sys.stderr.write("Could not execute SQL statement '" + name + "', error: " + str(e) + "\n")
+            return None
+        finally:
+            self.statement_timings.add(name, time.perf_counter() - start)
+
+    def get_statement_timings(self):
+        return self.statement_timings.get()
+
     def sql_update_table(self, sql, parameters=None):
         try:
             self.cursor.execute(sql, parameters)
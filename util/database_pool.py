@@ -1,11 +1,17 @@
 import sys
+import time
 
 import psycopg
 import psycopg_pool
 from psycopg.types.composite import CompositeInfo, register_composite
 
+from util.prepared_statements import StatementTimings, statements
+
+# Composite types used by the transaction tables
+CUSTOM_TYPES = ["utxo", "filter"]
+
 class DatabasePool(object):
-    def __init__(self, config, logger=None):
+    def __init__(self, config, logger=None, custom_types=CUSTOM_TYPES):
         self.user = config["user"]
         self.database = config["name"]
         self.password = config["password"]
@@ -14,6 +20,14 @@ class DatabasePool(object):
 
         self.logger = logger
 
+        # Composite types registered once on every new pooled connection
+        # The type information is only fetched from the catalog for the first connection
+        self.custom_types = list(custom_types)
+        self.composite_infos = {}
+
+        # Number of calls and execution times of the prepared statements
+        self.statement_timings = StatementTimings()
+
         self.connect()
 
     def init_app(self, app):
@@ -29,6 +43,7 @@ class DatabasePool(object):
             self.connection_pool = psycopg_pool.ConnectionPool(
                 conninfo=self.connection_str,
                 min_size=self.min_connections,
+                configure=self.configure_connection,
                 open=True,
             )
         except psycopg.OperationalError as e:
@@ -38,6 +53,34 @@ class DatabasePool(object):
                 sys.stderr.write(f"Could not connect to database:\n{e}\n")
             raise psycopg.OperationalError(e)
 
+    def configure_connection(self, conn):
+        for type_name in self.custom_types:
+            info = self.composite_infos.get(type_name)
+            if info is None:
+                info = CompositeInfo.fetch(conn, type_name)
+                # Fetching the type information opens a transaction, the pool requires an idle connection
+                conn.rollback()
+                if info is None:
+                    # Not cached so it is fetched again for the next connection or when a query requires it
+                    if self.logger:
+                        self.logger.warning(f"Could not find composite type {type_name}")
+                    else:
+                        sys.stderr.write(f"Could not find composite type {type_name}\n")
+                    continue
+                self.composite_infos[type_name] = info
+            register_composite(info, conn)
+
+    def register_custom_types(self, conn, custom_types):
+        # Types configured for the pool are already registered on every connection unless they were not found
+        for type_name in custom_types:
+            if conn.adapters.types.get(type_name) is None:
+                info = self.composite_infos.get(type_name)
+                if info is None:
+                    info = CompositeInfo.fetch(conn, type_name)
+                    if info is not None:
+                        self.composite_infos[type_name] = info
+                register_composite(info, conn)
+
     def register_type(self, type_name):
         with self.connection_pool.connection() as conn:
             info = CompositeInfo.fetch(conn, type_name)
@@ -49,14 +92,18 @@ class DatabasePool(object):
                 self.logger.info("Terminating database pool")
             else:
                 sys.stdout.write("Terminating database pool\n")
+            for name, timing in sorted(self.get_statement_timings().items()):
+                message = f"Statement {name}: {timing['calls']} calls, {timing['total_time']:.3f}s total, {timing['max_time']:.3f}s max"
+                if self.logger:
+                    self.logger.info(message)
+                else:
+                    sys.stdout.write(f"{message}\n")
         self.connection_pool.close()
 
     def sql_return_one(self, sql, parameters=None, custom_types=[]):
         try:
             with self.connection_pool.connection() as conn:
-                for type_name in custom_types:
-                    info = CompositeInfo.fetch(conn, type_name)
-                    register_composite(info, conn)
+                self.register_custom_types(conn, custom_types)
                 with conn.cursor() as cursor:
                     cursor.execute(sql, parameters)
                     return cursor.fetchone()
@@ -72,9 +119,7 @@ class DatabasePool(object):
     def sql_return_all(self, sql, parameters=None, custom_types=[]):
         try:
             with self.connection_pool.connection() as conn:
-                for type_name in custom_types:
-                    info = CompositeInfo.fetch(conn, type_name)
-                    register_composite(info, conn)
+                self.register_custom_types(conn, custom_types)
                 with conn.cursor() as cursor:
                     cursor.execute(sql, parameters)
                     return cursor.fetchall()
@@ -87,6 +132,47 @@ class DatabasePool(object):
                 sys.stderr.write(f"Error:\n{e}\n")
             return None
 
+    def statement_return_one(self, name, parameters=None, custom_types=[]):
+        start = time.perf_counter()
+        try:
+            with self.connection_pool.connection() as conn:
+                self.register_custom_types(conn, custom_types)
+                with conn.cursor() as cursor:
+                    cursor.execute(statements[name], parameters, prepare=True)
+                    return cursor.fetchone()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Could not execute SQL statement {name}")
+                self.logger.error(f"Error:\n{e}")
+            else:
+                sys.stderr.write(f"Could not execute SQL statement {name}\n")
+                sys.stderr.write(f"Error:\n{e}\n")
+            return None
+        finally:
+            self.statement_timings.add(name, time.perf_counter() - start)
+
+    def statement_return_all(self, name, parameters=None, custom_types=[]):
+        start = time.perf_counter()
+        try:
+            with self.connection_pool.connection() as conn:
+                self.register_custom_types(conn, custom_types)
+                with conn.cursor() as cursor:
+                    cursor.execute(statements[name], parameters, prepare=True)
+                    return cursor.fetchall()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Could not execute SQL statement {name}")
+                self.logger.error(f"Error:\n{e}")
+            else:
+                sys.stderr.write(f"Could not execute SQL statement {name}\n")
+                sys.stderr.write(f"Error:\n{e}\n")
+            return None
+        finally:
+            self.statement_timings.add(name, time.perf_counter() - start)
+
+    def get_statement_timings(self):
+        return self.statement_timings.get()
+
     def sql_update_table(self, sql, parameters, update=False):
         try:
             with self.connection_pool.connection() as conn:
@@ -106,9 +192,7 @@ class DatabasePool(object):
     def sql_execute_many(self, sql, data, custom_types=[]):
         try:
             with self.connection_pool.connection() as conn:
-                for type_name in custom_types:
-                    info = CompositeInfo.fetch(conn, type_name)
-                    register_composite(info, conn)
+                self.register_custom_types(conn, custom_types)
                 with conn.cursor() as cursor:
                     cursor.executemany(sql, data)
                     conn.commit()
@@ -0,0 +1,87 @@
+import collections
+import threading
+import time
+
+from util.common_functions import calculate_current_epoch
+
+# Keys (or key prefixes) of small and frequently requested memcached values which are kept in-process
+# and the maximum number of seconds they are kept, they are also never kept past the end of an epoch
+LOCAL_CACHE_KEYS = {
+    "home": 30,
+    "status": 30,
+    "priority": 30,
+    "pending_hashes": 10,
+    "reputation": 60,
+    "tapi-": 60,
+    "balance-list_": 60,
+}
+
+
+class LocalCache(object):
+    # Bounded LRU cache of deserialized memcached values shared by the threads of a single API worker
+    def __init__(self, max_items=256, max_ages=LOCAL_CACHE_KEYS, constants=None):
+        self.max_items = max_items
+        self.max_ages = max_ages
+        self.constants = constants
+
+        self.lock = threading.Lock()
+        self.items = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_max_age(self, key):
+        for prefix, max_age in self.max_ages.items():
+            if key.startswith(prefix):
+                return max_age
+        return None
+
+    def get_epoch_end(self):
+        if self.constants is None:
+            return None
+        start_time, epoch_period = self.constants.get_network_times()
+        current_epoch = calculate_current_epoch(start_time, epoch_period)
+        return start_time + (current_epoch + 1) * epoch_period
+
+    def get(self, key):
+        if self.get_max_age(key) is None:
+            return None
+
+        with self.lock:
+            item = self.items.get(key)
+            if item is None or item[1] <= time.time():
+                if item is not None:
+                    del self.items[key]
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value):
+        max_age = self.get_max_age(key)
+        if max_age is None:
+            return
+
+        expiry = time.time() + max_age
+        epoch_end = self.get_epoch_end()
+        if epoch_end is not None:
+            expiry = min(expiry, epoch_end)
+
+        with self.lock:
+            self.items[key] = (value, expiry)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.items.pop(key, None)
+
+    def get_counters(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "items": len(self.items),
+            }
@@ -27,6 +27,15 @@ def configure_logger(log_tag, log_filename, log_level):
     # Add date timestamp in log filename
     today = datetime.date.today()
     log_filename = os.path.join(dirname, f"{filename}.{today.strftime('%Y%m%d')}{extension}")
+
+    # Processes hosted by the caching scheduler configure their logger on every run
+    # Keep the existing file handler unless the date changed, otherwise every log line would be written multiple times
+    for handler in logger.handlers[:]:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(log_filename):
+            return logger
+        logger.removeHandler(handler)
+        handler.close()
+
     # Setup file handler logging
     file_handler = logging.FileHandler(log_filename)
 
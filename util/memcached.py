@@ -1,9 +1,11 @@
 import time
 import pylibmc
 
+from util.memcached_codec import CodecClient
+
 class MemcachedPool(object):
-    def __init__(self, servers, username, password, threads, blocking):
-        self.memcached_client = pylibmc.Client(
+    def __init__(self, servers, username, password, threads, blocking, stale_timeout=60, lease_timeout=10, local_cache=None):
+        self.memcached_client = CodecClient(
             servers,
             username=username,
             password=password,
@@ -25,24 +27,128 @@ class MemcachedPool(object):
         self.cache.fill(self.memcached_client, threads)
         self.blocking = blocking
 
+        # Time a value is still served after it expired while a single worker refreshes it
+        self.stale_timeout = stale_timeout
+        # Time after which the refresh lease of a worker expires, e.g., because it crashed
+        self.lease_timeout = lease_timeout
+
+        # Optional in-process cache which serves small and hot values without a network round trip and unpickling
+        self.local_cache = local_cache
+
     def init_app(self, app):
         app.extensions = getattr(app, "extensions", {})
         if "cache" not in app.extensions:
             app.extensions["cache"] = self
 
     def get(self, key):
+        if self.local_cache is not None:
+            value = self.local_cache.get(key)
+            if value is not None:
+                return value
+
         with self.cache.reserve(block=self.blocking) as client:
-            return client.get(key)
+            value = client.get(key)
+
+        if value is not None and self.local_cache is not None:
+            self.local_cache.set(key, value)
+        return value
 
     def set(self, key, value, timeout=0):
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
         timeout = calculate_timeout(timeout)
         with self.cache.reserve(block=self.blocking) as client:
             return bool(client.set(key, value, timeout))
 
     def delete(self, key):
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
         with self.cache.reserve(block=self.blocking) as client:
             return bool(client.delete(key))
 
+    def add(self, key, value, timeout=0):
+        timeout = calculate_timeout(timeout)
+        with self.cache.reserve(block=self.blocking) as client:
+            return bool(client.add(key, value, timeout))
+
+    def get_or_compute(self, key, compute, timeout=0, logger=None):
+        # Return the cached value or compute and cache it, making sure only one worker computes it at a time
+        # The time at which a value expires is saved next to it and values are kept for an additional stale_timeout
+        # seconds, serving the stale value while the worker holding the lease refreshes it
+        # Values without an expiry time are always fresh, e.g., when they were saved by a caching process
+        expiry_key, lease_key = f"{key}_expiry", f"{key}_lease"
+
+        if self.local_cache is not None:
+            value = self.local_cache.get(key)
+            if value is not None:
+                return value
+
+        with self.cache.reserve(block=self.blocking) as client:
+            cached = client.get_multi([key, expiry_key])
+
+        expiry = cached.get(expiry_key)
+        if key in cached and (expiry is None or expiry > time.time()):
+            if self.local_cache is not None:
+                self.local_cache.set(key, cached[key])
+            return cached[key]
+
+        leased = self.add(lease_key, True, timeout=self.lease_timeout)
+        if not leased:
+            # Another worker is refreshing the value, serve the stale one
+            if key in cached:
+                return cached[key]
+            # Another worker is computing the value, wait for it instead of computing it concurrently
+            value = self.wait_for(key)
+            if value is not None:
+                return value
+
+        try:
+            try:
+                value = compute()
+            except Exception as e:
+                # Keep serving the stale value if it cannot be refreshed, e.g., because the node is down
+                if key not in cached:
+                    raise
+                if logger:
+                    logger.warning(f"Could not refresh {key}, serving the stale value: {e}")
+                return cached[key]
+            if value is not None:
+                self.set_with_expiry(key, value, timeout, logger)
+            return value
+        finally:
+            if leased:
+                self.delete(lease_key)
+
+    def wait_for(self, key):
+        deadline = time.time() + self.lease_timeout
+        while time.time() < deadline:
+            time.sleep(0.1)
+            with self.cache.reserve(block=self.blocking) as client:
+                value = client.get(key)
+            if value is not None:
+                return value
+        return None
+
+    def set_with_expiry(self, key, value, timeout, logger):
+        try:
+            if timeout == 0:
+                self.set(key, value)
+                # An expiry time left by an earlier refresh would mark this value as stale
+                self.delete(f"{key}_expiry")
+            else:
+                self.set(key, value, timeout=timeout + self.stale_timeout)
+                self.set(f"{key}_expiry", time.time() + timeout, timeout=timeout + self.stale_timeout)
+            if self.local_cache is not None:
+                self.local_cache.set(key, value)
+        except pylibmc.TooBig:
+            if logger:
+                logger.warning(f"Could not save {key} in our memcached instance because its size exceeded 1MB")
+
+    def get_local_cache_counters(self):
+        if self.local_cache is None:
+            return None
+        return self.local_cache.get_counters()
+
 def calculate_timeout(timeout):
     # Memcached timeouts bigger than 30 days needs to be specified as a unix timestamp
     if timeout > 60*60*24*30:
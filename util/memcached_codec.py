@@ -0,0 +1,55 @@
+import zlib
+
+import cbor2
+import pylibmc
+
+# Flag marking values encoded by this codec, pylibmc uses the lower flag bits for its own encodings
+FLAG_CODEC = 1 << 8
+
+# Format byte prefixed to every encoded value so the encoding can change without flushing memcached
+# The CBOR formats were written by an earlier version of this codec and are only decoded
+FORMAT_CBOR = 1
+FORMAT_CBOR_ZLIB = 2
+FORMAT_ZLIB = 3
+
+# Values which are bigger than this (in bytes) once serialized by pylibmc are compressed
+COMPRESS_THRESHOLD = 16 * 1024
+
+
+def encode(data, flags, compress_threshold=COMPRESS_THRESHOLD):
+    # Compress a value serialized by pylibmc, smaller values are stored unchanged
+    if len(data) < compress_threshold:
+        return data, flags
+    return bytes([FORMAT_ZLIB]) + zlib.compress(data), flags | FLAG_CODEC
+
+
+def decode(data):
+    # Return the data as serialized by pylibmc, values in a CBOR format are returned decoded
+    if data[0] == FORMAT_ZLIB:
+        return zlib.decompress(data[1:])
+    elif data[0] == FORMAT_CBOR:
+        return cbor2.loads(data[1:])
+    elif data[0] == FORMAT_CBOR_ZLIB:
+        return cbor2.loads(zlib.decompress(data[1:]))
+    raise ValueError(f"Unknown memcached value format {data[0]}")
+
+
+class CodecClient(pylibmc.Client):
+    # Memcached client which compresses big values with zlib
+    # Values keep the native pylibmc encoding (pickle for objects) because unpickling is faster than
+    # decoding any of the alternatives, so compression only pays off for values above the threshold
+    # Values written before this codec do not have its flag and are deserialized by pylibmc
+    def __init__(self, *args, compress_threshold=COMPRESS_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compress_threshold = compress_threshold
+
+    def serialize(self, value):
+        data, flags = super().serialize(value)
+        return encode(data, flags, self.compress_threshold)
+
+    def deserialize(self, data, flags):
+        if flags & FLAG_CODEC:
+            if data[0] != FORMAT_ZLIB:
+                return decode(data)
+            return super().deserialize(decode(data), flags & ~FLAG_CODEC)
+        return super().deserialize(data, flags)
@@ -0,0 +1,227 @@
+import threading
+
+from util.data_transformer import re_sql
+
+# Catalogue of the queries on the hot paths of the API, invoked by name
+# Every statement is prepared server-side the first time it is executed on a connection
+statements = {
+    "hash_type": """
+        SELECT
+            type
+        FROM
+            hashes
+        WHERE
+            hash=%s
+    """,
+    "block_hash_for_epoch": """
+        SELECT
+            block_hash,
+            epoch
+        FROM
+            blocks
+        WHERE
+            epoch=%s
+    """,
+    "block_details_for_hash": """
+        SELECT
+            block_hash,
+            value_transfer,
+            data_request,
+            commit,
+            reveal,
+            tally,
+            dr_weight,
+            vt_weight,
+            block_weight,
+            epoch,
+            confirmed,
+            reverted
+        FROM
+            blocks
+        WHERE
+            block_hash=%s
+        LIMIT 1
+    """,
+    "block_details_for_epoch": """
+        SELECT
+            block_hash,
+            value_transfer,
+            data_request,
+            commit,
+            reveal,
+            tally,
+            dr_weight,
+            vt_weight,
+            block_weight,
+            epoch,
+            confirmed,
+            reverted
+        FROM
+            blocks
+        WHERE
+            epoch=%s
+        LIMIT 1
+    """,
+    "block_mint": """
+        SELECT
+            txn_hash,
+            miner,
+            output_addresses,
+            output_values
+        FROM
+            mint_txns
+        WHERE
+            epoch=%s
+        LIMIT 1
+    """,
+    "block_value_transfers": """
+        SELECT
+            txn_hash,
+            input_addresses,
+            input_values,
+            output_addresses,
+            output_values,
+            weight,
+            block_position
+        FROM
+            value_transfer_txns
+        WHERE
+            epoch=%s
+        ORDER BY
+            block_position
+    """,
+    "block_data_requests": """
+        SELECT
+            txn_hash,
+            input_addresses,
+            input_values,
+            output_value,
+            witnesses,
+            witness_reward,
+            collateral,
+            consensus_percentage,
+            commit_and_reveal_fee,
+            weight,
+            kinds,
+            urls,
+            headers,
+            bodies,
+            scripts,
+            aggregate_filters,
+            aggregate_reducer,
+            tally_filters,
+            tally_reducer,
+            RAD_bytes_hash,
+            DRO_bytes_hash,
+            block_position
+        FROM
+            data_request_txns
+        WHERE
+            epoch=%s
+        ORDER BY
+            block_position
+    """,
+    "block_commits": """
+        SELECT
+            txn_hash,
+            txn_address,
+            input_values,
+            output_value,
+            data_request,
+            block_position
+        FROM
+            commit_txns
+        WHERE
+            epoch=%s
+        ORDER BY
+            block_position
+    """,
+    "block_reveals": """
+        SELECT
+            txn_hash,
+            txn_address,
+            data_request,
+            result,
+            success,
+            block_position
+        FROM
+            reveal_txns
+        WHERE
+            epoch=%s
+        ORDER BY
+            block_position
+    """,
+    "block_tallies": """
+        SELECT
+            txn_hash,
+            output_addresses,
+            output_values,
+            data_request,
+            error_addresses,
+            liar_addresses,
+            result,
+            success,
+            block_position
+        FROM
+            tally_txns
+        WHERE
+            epoch=%s
+        ORDER BY
+            block_position
+    """,
+    "saved_data_request_report": """
+        SELECT
+            report
+        FROM
+            data_request_reports
+        WHERE
+            data_request_hash=%s
+        LIMIT 1
+    """,
+    "address_label": """
+        SELECT
+            label
+        FROM
+            addresses
+        WHERE
+            address=%s
+    """,
+    "address_info": """
+        SELECT
+            address,
+            label,
+            active,
+            block,
+            mint,
+            value_transfer,
+            data_request,
+            commit,
+            reveal,
+            tally
+        FROM
+            addresses
+        WHERE
+            address = ANY(%s)
+    """,
+}
+statements = {name: re_sql(sql) for name, sql in statements.items()}
+
+
+class StatementTimings(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {}
+
+    def add(self, name, duration):
+        with self.lock:
+            if name not in self.timings:
+                self.timings[name] = {"calls": 0, "total_time": 0.0, "max_time": 0.0}
+            timing = self.timings[name]
+            timing["calls"] += 1
+            timing["total_time"] += duration
+            timing["max_time"] = max(timing["max_time"], duration)
+
+    def get(self):
+        with self.lock:
+            return {name: dict(timing) for name, timing in self.timings.items()}
+